@@ -0,0 +1,52 @@
+"""Create relatorios_ia_chamadas table (instrumentação das chamadas à OpenAI)
+
+Revision ID: 0006_relatorios_ia_chamadas
+Revises: 0005_pontuacao_float
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_relatorios_ia_chamadas'
+down_revision = '0005_pontuacao_float'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'relatorios_ia_chamadas' in inspector.get_table_names():
+        return
+
+    op.create_table('relatorios_ia_chamadas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tipo_relatorio', sa.String(), nullable=False),
+        sa.Column('alvo_id', sa.Integer(), nullable=True),
+        sa.Column('modelo', sa.String(), nullable=False),
+        sa.Column('status_http', sa.Integer(), nullable=True),
+        sa.Column('latencia_ms', sa.Float(), nullable=False),
+        sa.Column('tentativas', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('tamanho_prompt', sa.Integer(), nullable=False),
+        sa.Column('tokens_prompt', sa.Integer(), nullable=True),
+        sa.Column('tokens_resposta', sa.Integer(), nullable=True),
+        sa.Column('tokens_total', sa.Integer(), nullable=True),
+        sa.Column('custo_estimado_usd', sa.Float(), nullable=True),
+        sa.Column('erro', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_relatorios_ia_chamadas_id'), 'relatorios_ia_chamadas', ['id'], unique=False)
+    op.create_index('ix_relatorios_ia_chamadas_created_at', 'relatorios_ia_chamadas', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'relatorios_ia_chamadas' in inspector.get_table_names():
+        op.drop_index('ix_relatorios_ia_chamadas_created_at', table_name='relatorios_ia_chamadas')
+        op.drop_index(op.f('ix_relatorios_ia_chamadas_id'), table_name='relatorios_ia_chamadas')
+        op.drop_table('relatorios_ia_chamadas')
@@ -0,0 +1,67 @@
+"""Create progresso_resumo (agregados do painel da turma)
+
+PostgreSQL: materialized view com índice único (necessário para
+REFRESH ... CONCURRENTLY). Demais bancos (SQLite): tabela comum, mantida
+incrementalmente pela aplicação (app/services/painel.py).
+
+Revision ID: 0007_progresso_resumo
+Revises: 0006_relatorios_ia_chamadas
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_progresso_resumo'
+down_revision = '0006_relatorios_ia_chamadas'
+branch_labels = None
+depends_on = None
+
+
+AGREGADOS_SQL = """
+    SELECT p.crianca_id AS crianca_id,
+           a.categoria AS categoria,
+           avg(p.pontuacao) AS media_pontuacao,
+           count(p.id) AS total,
+           min(p.tempo_segundos) AS melhor_tempo_segundos,
+           max(p.created_at) AS ultima_atividade
+    FROM progresso p
+    JOIN atividades a ON a.id = p.atividade_id
+    GROUP BY p.crianca_id, a.categoria
+"""
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute(f"CREATE MATERIALIZED VIEW IF NOT EXISTS progresso_resumo AS {AGREGADOS_SQL} WITH DATA")
+        op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_progresso_resumo_crianca_categoria ON progresso_resumo (crianca_id, categoria)")
+        return
+
+    inspector = sa.inspect(conn)
+    if 'progresso_resumo' in inspector.get_table_names():
+        return
+
+    op.create_table('progresso_resumo',
+        sa.Column('crianca_id', sa.Integer(), nullable=False),
+        sa.Column('categoria', sa.String(), nullable=False),
+        sa.Column('media_pontuacao', sa.Float(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('melhor_tempo_segundos', sa.Integer(), nullable=True),
+        sa.Column('ultima_atividade', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('crianca_id', 'categoria')
+    )
+    op.execute(f"INSERT INTO progresso_resumo {AGREGADOS_SQL}")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute("DROP MATERIALIZED VIEW IF EXISTS progresso_resumo")
+        return
+
+    inspector = sa.inspect(conn)
+    if 'progresso_resumo' in inspector.get_table_names():
+        op.drop_table('progresso_resumo')
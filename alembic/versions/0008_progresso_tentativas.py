@@ -0,0 +1,117 @@
+"""Create progresso_tentativas (histórico append-only) and backfill from progresso
+
+PostgreSQL: tabela particionada por mês em created_at (PK (id, created_at),
+exigência do particionamento), com partição default e partições do mês do
+registro mais antigo até 3 meses à frente. Outros bancos: tabela comum.
+Nos dois casos cada linha atual de `progresso` vira a primeira tentativa.
+
+Revision ID: 0008_progresso_tentativas
+Revises: 0007_progresso_resumo
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_progresso_tentativas'
+down_revision = '0007_progresso_resumo'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_SQL = """
+    INSERT INTO progresso_tentativas
+        (crianca_id, atividade_id, responsavel_id, pontuacao, tempo_segundos, concluida, observacoes, created_at)
+    SELECT crianca_id, atividade_id, responsavel_id, pontuacao, tempo_segundos,
+           COALESCE(concluida, TRUE), observacoes, created_at
+    FROM progresso
+"""
+
+
+def _proximo_mes(mes: date) -> date:
+    return date(mes.year + (mes.month // 12), mes.month % 12 + 1, 1)
+
+
+def _upgrade_postgresql(conn) -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS progresso_tentativas (
+            id BIGSERIAL NOT NULL,
+            crianca_id INTEGER NOT NULL REFERENCES criancas (id),
+            atividade_id INTEGER NOT NULL REFERENCES atividades (id),
+            responsavel_id INTEGER REFERENCES responsaveis (id),
+            pontuacao DOUBLE PRECISION NOT NULL,
+            pontuacao_bruta DOUBLE PRECISION,
+            movimentos INTEGER,
+            tempo_segundos INTEGER,
+            concluida BOOLEAN NOT NULL DEFAULT TRUE,
+            observacoes TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE IF NOT EXISTS progresso_tentativas_default PARTITION OF progresso_tentativas DEFAULT")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_progresso_tentativas_crianca_created_at "
+        "ON progresso_tentativas (crianca_id, created_at)"
+    )
+
+    mais_antigo = conn.execute(text("SELECT min(created_at) FROM progresso")).scalar()
+    mes = (mais_antigo.date() if mais_antigo else date.today()).replace(day=1)
+    limite = date.today().replace(day=1)
+    for _ in range(3):
+        limite = _proximo_mes(limite)
+    while mes <= limite:
+        proximo = _proximo_mes(mes)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS progresso_tentativas_{mes.year:04d}_{mes.month:02d} "
+            f"PARTITION OF progresso_tentativas FOR VALUES FROM ('{mes.isoformat()}') TO ('{proximo.isoformat()}')"
+        )
+        mes = proximo
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'progresso_tentativas' in inspector.get_table_names():
+        return
+
+    if conn.dialect.name == 'postgresql':
+        _upgrade_postgresql(conn)
+    else:
+        op.create_table('progresso_tentativas',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('crianca_id', sa.Integer(), nullable=False),
+            sa.Column('atividade_id', sa.Integer(), nullable=False),
+            sa.Column('responsavel_id', sa.Integer(), nullable=True),
+            sa.Column('pontuacao', sa.Float(), nullable=False),
+            sa.Column('pontuacao_bruta', sa.Float(), nullable=True),
+            sa.Column('movimentos', sa.Integer(), nullable=True),
+            sa.Column('tempo_segundos', sa.Integer(), nullable=True),
+            sa.Column('concluida', sa.Boolean(), nullable=False, server_default=sa.true()),
+            sa.Column('observacoes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+            sa.ForeignKeyConstraint(['crianca_id'], ['criancas.id']),
+            sa.ForeignKeyConstraint(['atividade_id'], ['atividades.id']),
+            sa.ForeignKeyConstraint(['responsavel_id'], ['responsaveis.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_progresso_tentativas_crianca_created_at', 'progresso_tentativas', ['crianca_id', 'created_at'], unique=False)
+
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'progresso_tentativas' in inspector.get_table_names():
+        if conn.dialect.name == 'postgresql':
+            # As partições são removidas junto com a tabela pai
+            op.execute("DROP TABLE progresso_tentativas")
+        else:
+            op.drop_index('ix_progresso_tentativas_crianca_created_at', table_name='progresso_tentativas')
+            op.drop_table('progresso_tentativas')
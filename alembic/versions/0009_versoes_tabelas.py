@@ -0,0 +1,40 @@
+"""Create versoes_tabelas (contadores para ETag das listagens de referência)
+
+Revision ID: 0009_versoes_tabelas
+Revises: 0008_progresso_tentativas
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_versoes_tabelas'
+down_revision = '0008_progresso_tentativas'
+branch_labels = None
+depends_on = None
+
+TABELAS = ('atividades', 'diagnosticos', 'turmas', 'responsaveis')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'versoes_tabelas' in inspector.get_table_names():
+        return
+
+    versoes = op.create_table('versoes_tabelas',
+        sa.Column('tabela', sa.String(), nullable=False),
+        sa.Column('versao', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('atualizado_em', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('tabela')
+    )
+    op.bulk_insert(versoes, [{'tabela': tabela, 'versao': 1} for tabela in TABELAS])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'versoes_tabelas' in inspector.get_table_names():
+        op.drop_table('versoes_tabelas')
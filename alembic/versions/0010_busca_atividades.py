@@ -0,0 +1,89 @@
+"""Índices de busca por título de atividades (sem caixa e sem acentos)
+
+PostgreSQL: extensões pg_trgm e unaccent, função IMMUTABLE f_unaccent (unaccent
+não é IMMUTABLE e não pode ir direto num índice), btree text_pattern_ops para
+prefixo e GIN gin_trgm_ops para substring/similaridade, ambos sobre
+lower(f_unaccent(titulo)).
+
+SQLite: tabela FTS5 atividades_busca (external content sobre atividades) com
+tokenizer unicode61 remove_diacritics, mantida por triggers.
+
+Revision ID: 0010_busca_atividades
+Revises: 0009_versoes_tabelas
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_busca_atividades'
+down_revision = '0009_versoes_tabelas'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+        op.execute("""
+            CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+            LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+            AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """)
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_atividades_titulo_busca_prefixo "
+            "ON atividades (lower(f_unaccent(titulo)) text_pattern_ops)"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_atividades_titulo_busca_trgm "
+            "ON atividades USING gin (lower(f_unaccent(titulo)) gin_trgm_ops)"
+        )
+        return
+
+    if conn.dialect.name != 'sqlite':
+        return
+    inspector = sa.inspect(conn)
+    if 'atividades_busca' in inspector.get_table_names():
+        return
+    op.execute("""
+        CREATE VIRTUAL TABLE atividades_busca USING fts5(
+            titulo, content='atividades', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER atividades_busca_ai AFTER INSERT ON atividades BEGIN
+            INSERT INTO atividades_busca(rowid, titulo) VALUES (new.id, new.titulo);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER atividades_busca_ad AFTER DELETE ON atividades BEGIN
+            INSERT INTO atividades_busca(atividades_busca, rowid, titulo) VALUES ('delete', old.id, old.titulo);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER atividades_busca_au AFTER UPDATE OF titulo ON atividades BEGIN
+            INSERT INTO atividades_busca(atividades_busca, rowid, titulo) VALUES ('delete', old.id, old.titulo);
+            INSERT INTO atividades_busca(rowid, titulo) VALUES (new.id, new.titulo);
+        END
+    """)
+    op.execute("INSERT INTO atividades_busca(atividades_busca) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_atividades_titulo_busca_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_atividades_titulo_busca_prefixo")
+        # f_unaccent e as extensões ficam: podem ser usadas por outros índices
+        return
+    if conn.dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS atividades_busca_au")
+    op.execute("DROP TRIGGER IF EXISTS atividades_busca_ad")
+    op.execute("DROP TRIGGER IF EXISTS atividades_busca_ai")
+    op.execute("DROP TABLE IF EXISTS atividades_busca")
@@ -0,0 +1,39 @@
+"""Índices de busca por nome de crianças (sem caixa e sem acentos)
+
+PostgreSQL: btree text_pattern_ops (prefixo) e GIN gin_trgm_ops
+(substring/similaridade) sobre lower(f_unaccent(nome)); f_unaccent e as
+extensões vêm da 0010. SQLite: nada (a aplicação usa um índice em memória).
+
+Revision ID: 0011_busca_criancas
+Revises: 0010_busca_atividades
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_busca_criancas'
+down_revision = '0010_busca_atividades'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_criancas_nome_busca_prefixo "
+        "ON criancas (lower(f_unaccent(nome)) text_pattern_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_criancas_nome_busca_trgm "
+        "ON criancas USING gin (lower(f_unaccent(nome)) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_criancas_nome_busca_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_criancas_nome_busca_prefixo")
@@ -0,0 +1,52 @@
+"""Add atividades.tipo_jogo (regra de pontuação do mini-jogo)
+
+Preenche as atividades existentes pelo título, com a mesma detecção que o
+registrar_minijogo fazia a cada partida ("memória"/"memoria"/"memory" ->
+memoria). As demais ficam NULL (regra padrão).
+
+Revision ID: 0012_atividades_tipo_jogo
+Revises: 0011_busca_criancas
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_atividades_tipo_jogo'
+down_revision = '0011_busca_criancas'
+branch_labels = None
+depends_on = None
+
+PALAVRAS_TIPO = {
+    'memoria': ('memória', 'memoria', 'memory'),
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    colunas = [c['name'] for c in inspector.get_columns('atividades')]
+    if 'tipo_jogo' not in colunas:
+        op.add_column('atividades', sa.Column('tipo_jogo', sa.String(), nullable=True))
+
+    atividades = sa.table('atividades', sa.column('id', sa.Integer), sa.column('titulo', sa.String), sa.column('tipo_jogo', sa.String))
+    por_tipo = {}
+    for id_, titulo in conn.execute(sa.select(atividades.c.id, atividades.c.titulo).where(atividades.c.tipo_jogo.is_(None))):
+        titulo = (titulo or '').lower()
+        for tipo, palavras in PALAVRAS_TIPO.items():
+            if any(palavra in titulo for palavra in palavras):
+                por_tipo.setdefault(tipo, []).append(id_)
+                break
+    for tipo, ids in por_tipo.items():
+        conn.execute(atividades.update().where(atividades.c.id.in_(ids)).values(tipo_jogo=tipo))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    colunas = [c['name'] for c in inspector.get_columns('atividades')]
+    if 'tipo_jogo' in colunas:
+        with op.batch_alter_table('atividades') as batch_op:
+            batch_op.drop_column('tipo_jogo')
@@ -0,0 +1 @@
+# Comandos de manutenção (python -m app.cli.<comando>)
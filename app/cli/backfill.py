@@ -0,0 +1,67 @@
+"""Corrige a pontuação do histórico em lote (ver app/services/backfill.py).
+
+Uso::
+
+    python -m app.cli.backfill escala_0_100 --dry-run          # só as estatísticas
+    python -m app.cli.backfill escala_0_100                    # grava; checkpoint em backfill_progresso_escala_0_100.json
+    python -m app.cli.backfill escala_0_100 --retomar          # continua depois de uma interrupção
+    python -m app.cli.backfill regras --tabela progresso_tentativas --lote 50000
+
+Transformações: ``escala_0_100`` (notas 0–100 gravadas antes da normalização,
+só nos tipos de jogo cuja regra tem ``escala_entrada``),
+``arredondar`` (2 casas) e ``regras`` (regra atual do tipo de jogo). Ao final
+(fora do dry-run) a projeção ``progresso`` é sincronizada, quando a tabela é
+``progresso_tentativas``, e o resumo do painel é recalculado.
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from app.logging_config import setup_logging
+
+
+def main(argv=None) -> int:
+    from app.services.backfill import TABELAS, TRANSFORMACOES
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli.backfill", description="Corrige a pontuação do histórico em lote")
+    parser.add_argument("transformacao", choices=sorted(TRANSFORMACOES))
+    parser.add_argument("--tabela", choices=sorted(TABELAS), default="progresso")
+    parser.add_argument("--lote", type=int, default=10000, help="Linhas por bloco")
+    parser.add_argument("--dry-run", action="store_true", help="Só calcular as diferenças, sem gravar")
+    parser.add_argument("--checkpoint", type=Path, help="Arquivo de checkpoint (padrão: backfill_<tabela>_<transformacao>.json)")
+    parser.add_argument("--retomar", action="store_true", help="Continuar a partir do checkpoint existente")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    logger = logging.getLogger("funny.backfill")
+
+    from app.database import engine
+    from app.services import backfill, painel
+
+    caminho = args.checkpoint or Path(f"backfill_{args.tabela}_{args.transformacao}.json")
+    if args.retomar:
+        if not caminho.exists():
+            parser.error(f"checkpoint {caminho} não encontrado")
+        checkpoint = backfill.Checkpoint.carregar(caminho)
+        if (checkpoint.tabela, checkpoint.transformacao) != (args.tabela, args.transformacao):
+            parser.error(f"checkpoint {caminho} é de {checkpoint.tabela}/{checkpoint.transformacao}")
+        logger.info("Retomando após id %s", checkpoint.ultimo_id)
+    else:
+        if caminho.exists() and not args.dry_run:
+            parser.error(f"checkpoint {caminho} já existe; use --retomar ou apague o arquivo")
+        checkpoint = backfill.Checkpoint(tabela=args.tabela, transformacao=args.transformacao)
+
+    estatisticas = backfill.executar(engine, checkpoint, caminho, tamanho_lote=args.lote, dry_run=args.dry_run)
+    logger.info("%s: %s", "Dry-run" if args.dry_run else "Concluído", estatisticas.resumo())
+    for exemplo in estatisticas.exemplos:
+        logger.info("  id %(id)s: %(antes)s -> %(depois)s", exemplo)
+
+    if not args.dry_run and estatisticas.alteradas:
+        painel.refresh_painel(engine)
+        logger.info("Resumo do painel recalculado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Importa responsáveis, turmas ou crianças a partir de um CSV.
+
+Uso::
+
+    python -m app.cli.importar responsaveis responsaveis.csv
+    python -m app.cli.importar criancas criancas.csv --dry-run
+
+Mesma validação do ``POST /importacao/{entidade}`` (ver
+``app/services/importacao.py``); as linhas com erro são listadas no final.
+"""
+import argparse
+import logging
+import sys
+
+from app.logging_config import setup_logging
+
+
+def main(argv=None) -> int:
+    from app.services.importacao import ENTIDADES, TAMANHO_LOTE, importar_csv
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli.importar", description="Importação em lote via CSV")
+    parser.add_argument("entidade", choices=sorted(ENTIDADES))
+    parser.add_argument("arquivo", help="Caminho do CSV (UTF-8, com cabeçalho)")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas validar, sem gravar")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help=f"Linhas por executemany (padrão: {TAMANHO_LOTE})")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    logger = logging.getLogger("funny.importacao")
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with open(args.arquivo, encoding="utf-8-sig", newline="") as arquivo:
+            resultado = importar_csv(db, args.entidade, arquivo, dry_run=args.dry_run, tamanho_lote=args.lote)
+    finally:
+        db.close()
+
+    for erro in resultado.erros:
+        logger.warning("Linha %s: %s", erro["linha"], erro["erro"])
+    logger.info(
+        "%s: %s linha(s), %s %s, %s com erro",
+        resultado.entidade, resultado.total_linhas, resultado.importadas,
+        "válidas (dry-run)" if resultado.dry_run else "importadas", resultado.com_erro,
+    )
+    return 1 if resultado.com_erro else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
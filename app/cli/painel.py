@@ -0,0 +1,45 @@
+"""Atualiza o resumo do painel das turmas (``progresso_resumo``).
+
+Uso::
+
+    python -m app.cli.painel            # REFRESH da view (PostgreSQL) / reconstrução da tabela (SQLite)
+    python -m app.cli.painel --crianca 12 --crianca 15   # só essas crianças (SQLite)
+
+No PostgreSQL serve para agendar via cron quando o refresh periódico da API
+estiver desativado (``PAINEL_REFRESH_SECONDS=0``).
+"""
+import argparse
+import logging
+import sys
+
+from app.logging_config import setup_logging
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli.painel", description="Atualiza o resumo do painel das turmas")
+    parser.add_argument("--crianca", type=int, action="append", default=[], help="Recalcular apenas esta criança (SQLite; pode repetir)")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    logger = logging.getLogger("funny.painel")
+
+    from app.database import engine
+    from app.services import painel
+
+    if args.crianca:
+        if engine.dialect.name == "postgresql":
+            parser.error("--crianca só se aplica ao SQLite; no PostgreSQL a view é atualizada inteira")
+        with engine.begin() as conn:
+            painel.atualizar_criancas(conn, args.crianca)
+        logger.info("Resumo recalculado para %s criança(s)", len(set(args.crianca)))
+        return 0
+
+    if not painel.refresh_painel(engine):
+        logger.warning("Outro processo já está atualizando o painel; nada feito")
+        return 1
+    logger.info("Resumo do painel atualizado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
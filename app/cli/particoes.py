@@ -0,0 +1,39 @@
+"""Cria as partições mensais das tabelas de histórico (somente PostgreSQL).
+
+Uso::
+
+    python -m app.cli.particoes             # mês atual + 3 meses à frente
+    python -m app.cli.particoes --meses 12
+
+A API já faz isso no startup; o comando existe para agendar via cron em
+deploys que ficam muito tempo sem reiniciar.
+"""
+import argparse
+import logging
+import sys
+
+from app.logging_config import setup_logging
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli.particoes", description="Cria as partições mensais das tabelas de histórico")
+    parser.add_argument("--meses", type=int, default=3, help="Quantos meses à frente criar (padrão: 3)")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    logger = logging.getLogger("funny.particoes")
+
+    from app.database import engine
+    from app.services.particoes import garantir_particoes
+
+    if engine.dialect.name != "postgresql":
+        logger.info("Banco %s não usa particionamento; nada a fazer", engine.dialect.name)
+        return 0
+    with engine.begin() as conn:
+        criadas = garantir_particoes(conn, meses_a_frente=args.meses)
+    logger.info("Partições verificadas: %s", ", ".join(criadas))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
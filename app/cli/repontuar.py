@@ -0,0 +1,89 @@
+"""Re-pontua o histórico depois de mudar uma regra em ``app/services/pontuacao.py``.
+
+Uso::
+
+    python -m app.cli.repontuar --tipo memoria --dry-run   # só mostra o que mudaria
+    python -m app.cli.repontuar --tipo memoria
+    python -m app.cli.repontuar --atividade 3 --atividade 7
+    python -m app.cli.repontuar --tipo memoria --atividade 3   # só a 3, se for de memória
+
+Com ``--tipo`` e ``--atividade`` juntos valem os dois filtros (E): só as
+atividades listadas que forem do tipo informado.
+
+Atalho para o backfill ``regras`` em ``progresso_tentativas`` restrito às
+atividades escolhidas (ver app/services/backfill.py): as tentativas são lidas
+em blocos, recalculadas com ``RegraPontuacao.calcular_lote`` (NumPy) a partir
+do valor enviado pelo front (``pontuacao_bruta``; linhas antigas sem ele usam a
+pontuação gravada) e dos movimentos, e só as que mudaram são gravadas. No fim,
+a projeção ``progresso`` (última tentativa) e o resumo do painel são
+atualizados. Cada bloco é confirmado separadamente; para execuções longas que
+precisem ser retomadas, use ``python -m app.cli.backfill regras --tabela
+progresso_tentativas`` com checkpoint.
+"""
+import argparse
+import logging
+import sys
+
+from app.logging_config import setup_logging
+
+TAMANHO_LOTE = 10000
+
+
+def main(argv=None) -> int:
+    from app.services.pontuacao import REGRAS, TIPO_PADRAO
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli.repontuar", description="Recalcula a pontuação do histórico pelas regras atuais")
+    parser.add_argument("--tipo", choices=sorted(REGRAS), help="Todas as atividades deste tipo de jogo")
+    parser.add_argument("--atividade", type=int, action="append", default=[], help="Só esta atividade (pode repetir)")
+    parser.add_argument("--dry-run", action="store_true", help="Só calcular e mostrar o resumo, sem gravar")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="Tentativas lidas por vez")
+    args = parser.parse_args(argv)
+    if not args.tipo and not args.atividade:
+        parser.error("informe --tipo e/ou --atividade")
+
+    setup_logging()
+    logger = logging.getLogger("funny.pontuacao")
+
+    from sqlalchemy import and_, or_, select
+
+    from app.database import engine
+    from app.models.atividade import Atividade
+    from app.services import backfill, painel
+    from app.services.pontuacao import regra
+
+    filtro = []
+    if args.tipo == TIPO_PADRAO:
+        filtro.append(or_(Atividade.tipo_jogo.is_(None), Atividade.tipo_jogo == TIPO_PADRAO))
+    elif args.tipo:
+        filtro.append(Atividade.tipo_jogo == args.tipo)
+    if args.atividade:
+        filtro.append(Atividade.id.in_(args.atividade))
+    with engine.connect() as conn:
+        atividades = conn.execute(select(Atividade.id, Atividade.tipo_jogo).where(and_(*filtro))).all()
+    if not atividades:
+        logger.warning("Nenhuma atividade encontrada")
+        return 1
+
+    por_regra = {}
+    for atividade_id, tipo_jogo in atividades:
+        por_regra.setdefault(regra(tipo_jogo).nome, []).append(atividade_id)
+    for nome_regra, atividade_ids in por_regra.items():
+        logger.info("Regra %s: %s atividade(s)", nome_regra, len(atividade_ids))
+
+    checkpoint = backfill.Checkpoint(
+        tabela="progresso_tentativas",
+        transformacao="regras",
+        atividades=sorted(a.id for a in atividades),
+    )
+    estatisticas = backfill.executar(engine, checkpoint, tamanho_lote=args.lote, dry_run=args.dry_run)
+    logger.info("%s: %s", "Dry-run" if args.dry_run else "Concluído", estatisticas.resumo())
+
+    if args.dry_run or not estatisticas.alteradas:
+        return 0
+    painel.refresh_painel(engine)
+    logger.info("Histórico, projeção e painel atualizados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Retenção do histórico de tentativas (``progresso_tentativas``).
+
+Uso::
+
+    python -m app.cli.retencao --dry-run                  # só lista o que sairia
+    python -m app.cli.retencao --modo exportar --destino /backups/funny
+    python -m app.cli.retencao --modo arquivar --manter-meses 36
+
+PostgreSQL: cada partição mensal mais antiga que ``--manter-meses``
+(padrão ``RETENCAO_MESES``) é
+
+- ``exportar``: gravada em ``<destino>/<particao>.csv.gz`` e descartada
+  (DETACH + DROP);
+- ``arquivar``: desanexada e movida para o schema ``arquivo``.
+
+SQLite (sem partições): as linhas anteriores ao limite são exportadas para um
+único CSV gzip e apagadas; só o modo ``exportar`` se aplica.
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from app.logging_config import setup_logging
+
+TABELA = "progresso_tentativas"
+
+
+def main(argv=None) -> int:
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(prog="python -m app.cli.retencao", description="Retira da tabela quente o histórico antigo de tentativas")
+    parser.add_argument("--manter-meses", type=int, default=settings.retencao_meses, help="Meses completos mantidos além do atual (padrão: RETENCAO_MESES)")
+    parser.add_argument("--modo", choices=["exportar", "arquivar"], default="exportar")
+    parser.add_argument("--destino", type=Path, default=Path("arquivo"), help="Diretório dos CSV gzip (modo exportar)")
+    parser.add_argument("--dry-run", action="store_true", help="Só listar, sem alterar nada")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    logger = logging.getLogger("funny.particoes")
+
+    from sqlalchemy import text
+
+    from app.database import engine
+    from app.services import particoes
+
+    limite = particoes.limite_retencao(args.manter_meses)
+
+    if engine.dialect.name != "postgresql":
+        if args.modo == "arquivar":
+            parser.error("--modo arquivar exige PostgreSQL (partições)")
+        with engine.begin() as conn:
+            total = conn.execute(text(f"SELECT count(*) FROM {TABELA} WHERE created_at < :limite"), {"limite": limite}).scalar()
+            logger.info("%s tentativa(s) anteriores a %s", total, limite)
+            if args.dry_run or not total:
+                return 0
+            destino = args.destino / f"{TABELA}_ate_{limite.isoformat()}.csv.gz"
+            particoes.exportar_csv_gz(conn, f"SELECT * FROM {TABELA} WHERE created_at < :limite ORDER BY id", destino, {"limite": limite})
+            conn.execute(text(f"DELETE FROM {TABELA} WHERE created_at < :limite"), {"limite": limite})
+        logger.info("Exportado para %s e removido da tabela", destino)
+        return 0
+
+    with engine.connect() as conn:
+        expiradas = particoes.particoes_expiradas(conn, TABELA, args.manter_meses)
+    if not expiradas:
+        logger.info("Nenhuma partição anterior a %s", limite)
+        return 0
+
+    for nome, mes in expiradas:
+        if args.dry_run:
+            logger.info("[dry-run] %s (%s) seria %s", nome, mes.strftime("%Y-%m"), "exportada" if args.modo == "exportar" else "arquivada")
+            continue
+        # Uma transação por partição: uma falha no meio não desfaz as anteriores
+        with engine.begin() as conn:
+            if args.modo == "exportar":
+                destino = args.destino / f"{nome}.csv.gz"
+                linhas = particoes.exportar_csv_gz(conn, f"SELECT * FROM {nome} ORDER BY id", destino)
+                particoes.descartar_particao(conn, TABELA, nome)
+                logger.info("%s: %s linha(s) exportadas para %s", nome, linhas, destino)
+            else:
+                logger.info("%s arquivada em %s", nome, particoes.arquivar_particao(conn, TABELA, nome))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
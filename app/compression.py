@@ -0,0 +1,140 @@
+"""Compressão negociada (Brotli ou GZip) das respostas HTTP.
+
+``CompressionMiddleware`` escolhe a codificação pelo header ``Accept-Encoding``
+do cliente: Brotli quando o pacote ``brotli`` está instalado e o cliente aceita
+``br``, senão GZip. Respostas menores que ``minimum_size`` vão sem compressão
+(o ganho não paga o custo), assim como respostas que já têm
+``Content-Encoding`` ou tipos já compactados (gzip, imagens...). Respostas em
+streaming (ex.: ``/progresso/export``) são comprimidas bloco a bloco.
+"""
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Brotli é opcional; sem ele só GZip é oferecido
+    brotli = None
+
+TIPOS_JA_COMPACTADOS = ("application/gzip", "application/zip", "application/x-gzip", "image/", "video/", "audio/", "text/event-stream")
+
+
+def _qualidades(accept_encoding: str) -> Dict[str, float]:
+    qualidades = {}
+    for parte in accept_encoding.split(","):
+        coding, _, params = parte.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualidades[coding.strip().lower()] = q
+    return qualidades
+
+
+def escolher_codificacao(accept_encoding: str) -> Optional[str]:
+    """Retorna "br", "gzip" ou None conforme o Accept-Encoding e o que está disponível."""
+    qualidades = _qualidades(accept_encoding)
+    curinga = qualidades.get("*", 0.0)
+    candidatas = (["br"] if brotli is not None else []) + ["gzip"]
+    aceitas = [(qualidades.get(c, curinga), c) for c in candidatas]
+    aceitas = [(q, c) for q, c in aceitas if q > 0]
+    if not aceitas:
+        return None
+    # Maior q vence; empate fica com a ordem de preferência (br antes de gzip)
+    return max(aceitas, key=lambda item: (item[0], -candidatas.index(item[1])))[1]
+
+
+class _Compressor:
+    def __init__(self, codificacao: str, gzip_level: int, brotli_quality: int):
+        if codificacao == "br":
+            self._impl = brotli.Compressor(quality=brotli_quality)
+            self._compress = self._impl.process
+            self._finish = self._impl.finish
+        else:
+            self._impl = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # wbits=31: formato gzip
+            self._compress = self._impl.compress
+            self._finish = self._impl.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codificacao = escolher_codificacao(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacao is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Segura o start até ver o primeiro bloco do corpo (decide pelo tamanho)
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = "content-encoding" in headers or content_type.startswith(TIPOS_JA_COMPACTADOS)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if passthrough:
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                compressor = _Compressor(codificacao, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = codificacao
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                    message["body"] = compressor.compress(body)
+                else:
+                    message["body"] = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(message["body"]))
+                await send(start_message)
+                start_message = None
+                await send(message)
+                return
+
+            message["body"] = compressor.compress(body) + (b"" if more_body else compressor.finish())
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
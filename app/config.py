@@ -16,6 +16,27 @@ class Settings(BaseSettings):
     
     # AI/OpenAI
     openai_api_key: str = ""
+    # Base da API compatível com a OpenAI (apontar para um mock nos testes de carga: benchmarks/mock_openai.py)
+    openai_base_url: str = "https://api.openai.com/v1"
+    # Preço (USD por 1M tokens) usado para estimar o custo de cada chamada (gpt-4o-mini)
+    openai_input_price_per_1m: float = 0.15
+    openai_output_price_per_1m: float = 0.60
+    # Resiliência das chamadas à OpenAI (retentativas com backoff + circuit breaker)
+    openai_timeout_seconds: float = 120.0  # Timeout de cada tentativa
+    openai_deadline_seconds: float = 150.0  # Prazo total da chamada, somando retentativas e esperas
+    openai_max_retries: int = 3
+    openai_backoff_base_seconds: float = 0.5
+    openai_backoff_max_seconds: float = 8.0
+    openai_circuit_failure_threshold: int = 5  # Falhas seguidas para abrir o circuito
+    openai_circuit_reset_seconds: float = 30.0  # Tempo com o circuito aberto antes de testar de novo
+    # Quantas atividades entram em "atividades_mais_efetivas" (prompt e resposta)
+    relatorio_top_atividades: int = 5
+
+    # Intervalo do REFRESH da materialized view do painel da turma (PostgreSQL); 0 desativa
+    painel_refresh_seconds: float = 300.0
+    # Histórico de tentativas: meses mantidos na tabela (retenção) e período padrão lido pelas consultas
+    retencao_meses: int = 24
+    historico_periodo_padrao_dias: int = 365
     
     # App
     app_name: str = "Funny Backend API"
@@ -24,6 +45,34 @@ class Settings(BaseSettings):
     # reCAPTCHA (Google)
     recaptcha_secret: str | None = None
     recaptcha_site_key: str | None = None
+
+    # Logging (ver app/logging_config.py)
+    log_level: str = "INFO"
+    log_levels: str = "httpx=WARNING"  # Níveis por módulo: "funny.progresso=DEBUG,sqlalchemy.engine=WARNING"
+    log_json: bool = True  # Uma linha JSON por registro
+    log_debug_sample: str = "funny.progresso=0.05"  # Fração de registros DEBUG mantidos por módulo
+
+    # Respostas menores que isso (bytes) não são comprimidas (ver app/compression.py)
+    compression_minimum_size: int = 1024
+
+    # Cache no processo das versões usadas nos ETags das listagens (ver app/services/versoes.py)
+    versoes_cache_ttl_seconds: float = 2.0
+
+    # Cache no processo de atividades/diagnósticos (ver app/services/cache_referencia.py)
+    cache_referencia_ttl_seconds: float = 300.0
+    cache_referencia_max_itens: int = 1024
+
+    # Listagens paginadas (ver app/paginacao.py)
+    paginacao_limite_padrao: int = 100
+    paginacao_limite_maximo: int = 1000
+
+    # Índice em memória da busca de crianças por nome no SQLite (ver app/services/busca.py)
+    busca_indice_ttl_seconds: float = 60.0
+
+    # Métricas (/metrics). Se definido, o scraper deve enviar "Authorization: Bearer <token>"
+    metrics_token: str | None = None
+    # Log de queries lentas: statements acima deste limite (ms) vão para o logger funny.sql
+    slow_query_ms: float | None = None
     
     class Config:
         env_file = str(ENV_FILE) if ENV_FILE.exists() else ".env"
@@ -1,8 +1,12 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.query_stats import instrument_engine
+import logging
 import os
-import sys
+
+logger = logging.getLogger("funny.database")
 
 # Usar variável de ambiente DATABASE_URL (PostgreSQL no Render)
 # Fallback para SQLite apenas para desenvolvimento local
@@ -10,13 +14,13 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 
 if not DATABASE_URL:
     # Fallback apenas para desenvolvimento local
-    print("⚠️  DATABASE_URL não configurada! Usando SQLite local.", file=sys.stderr)
+    logger.warning("DATABASE_URL não configurada! Usando SQLite local.")
     DATABASE_URL = "sqlite:///./funny.db"
 else:
     # Render usa postgres://, mas SQLAlchemy 1.4+ precisa de postgresql://
     if DATABASE_URL.startswith("postgres://"):
         DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-    print(f"✅ Conectando ao PostgreSQL: {DATABASE_URL.split('@')[1] if '@' in DATABASE_URL else 'database'}", file=sys.stderr)
+    logger.info("Conectando ao PostgreSQL: %s", DATABASE_URL.split('@')[1] if '@' in DATABASE_URL else 'database')
 
 # Criar engine com configurações apropriadas para cada banco
 if DATABASE_URL.startswith("postgresql://"):
@@ -27,10 +31,17 @@ if DATABASE_URL.startswith("postgresql://"):
         pool_size=5,         # Número de conexões no pool
         max_overflow=10      # Conexões extras se necessário
     )
+elif DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+    # SQLite em memória (benchmarks/testes): uma única conexão compartilhada,
+    # senão cada conexão do pool abriria um banco vazio diferente
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool)
 else:
     # SQLite - apenas para desenvolvimento local
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 
+# Contagem/tempo de queries por requisição e log de queries lentas (app/query_stats.py)
+instrument_engine(engine)
+
 # Criar SessionLocal
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -0,0 +1,137 @@
+"""Configuração central de logging da aplicação.
+
+Todos os módulos usam ``logging.getLogger("funny.<modulo>")`` e nunca configuram
+handlers por conta própria. Aqui montamos um único pipeline:
+
+    logger -> QueueHandler -> fila em memória -> QueueListener (thread) -> stderr
+
+A thread da requisição só enfileira o ``LogRecord``; formatação (inclusive o
+``%`` dos argumentos) e escrita em stderr acontecem na thread do listener.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.config import settings
+
+# Atributos padrão de um LogRecord; qualquer outro atributo veio de `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON (um objeto por linha)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que não formata o registro na thread de quem loga.
+
+    O ``QueueHandler`` padrão chama ``self.format(record)`` em ``prepare`` para
+    que o registro possa ser serializado entre processos. Como a fila aqui é
+    local ao processo, enfileiramos o registro intacto e deixamos o
+    ``QueueListener`` formatar tudo.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Deixa passar apenas uma fração dos registros DEBUG de um logger."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        return random.random() < self.rate
+
+
+def _parse_mapping(raw: str) -> Dict[str, str]:
+    """Converte ``"a=DEBUG,b=WARNING"`` em ``{"a": "DEBUG", "b": "WARNING"}``."""
+    mapping = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        if name.strip() and value.strip():
+            mapping[name.strip()] = value.strip()
+    return mapping
+
+
+def setup_logging(force: bool = False) -> None:
+    """Configura o logging da aplicação (idempotente).
+
+    Lê de ``settings``:
+    - ``log_level``: nível do logger raiz (padrão INFO)
+    - ``log_levels``: níveis por módulo, ex. ``"funny.progresso=DEBUG,sqlalchemy.engine=WARNING"``
+    - ``log_json``: saída em linhas JSON (padrão) ou texto simples
+    - ``log_debug_sample``: amostragem de DEBUG por módulo, ex. ``"funny.progresso=0.05"``
+    """
+    global _listener
+    if _listener is not None and not force:
+        return
+    if _listener is not None:
+        _listener.stop()
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    if settings.log_json:
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, LazyQueueHandler)]:
+        root.removeHandler(handler)
+    root.addHandler(LazyQueueHandler(log_queue))
+    root.setLevel(settings.log_level.upper())
+
+    for name, level in _parse_mapping(settings.log_levels).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    for name, rate in _parse_mapping(settings.log_debug_sample).items():
+        target = logging.getLogger(name)
+        for existing in [f for f in target.filters if isinstance(f, SamplingFilter)]:
+            target.removeFilter(existing)
+        try:
+            target.addFilter(SamplingFilter(float(rate)))
+        except ValueError:
+            logging.getLogger("funny.logging").warning("Taxa de amostragem inválida para %s: %s", name, rate)
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e para a thread do listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -1,13 +1,23 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
-from app.routers import auth, turmas, responsaveis, diagnosticos, criancas, atividades, progresso, relatorios_ia, recaptcha
-import sys
-import traceback
-from fastapi.responses import JSONResponse
+from app.logging_config import setup_logging
+
+# Configurar logging antes de importar o banco/routers para não perder os logs de inicialização
+setup_logging()
+
+from app.database import engine, Base, SessionLocal
+from app.compression import CompressionMiddleware
+from app.metrics import MetricsMiddleware, metrics_response
+from app.services import cache_referencia, painel, particoes
+from app.routers import auth, turmas, responsaveis, diagnosticos, criancas, atividades, progresso, relatorios_ia, recaptcha, importacao
+import asyncio
+import logging
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.exc import IntegrityError, ProgrammingError
 
+logger = logging.getLogger("funny.main")
+
 # NÃO criar tabelas aqui - Alembic vai gerenciar as migrations
 # Base.metadata.create_all(bind=engine)  # ❌ REMOVIDO
 
@@ -17,12 +27,19 @@ app = FastAPI(
     version=settings.app_version,
     description="API para gestão de atividades terapêuticas para crianças com necessidades especiais",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson serializa bem mais rápido que o json da stdlib nas listas grandes
+    default_response_class=ORJSONResponse,
 )
 
-# Log de inicialização para debug
-print(f"🚀 Iniciando {settings.app_name} v{settings.app_version}", file=sys.stderr)
-print(f"🔧 Engine configurado: {engine.url}", file=sys.stderr)
+# Resumo do painel das turmas: no SQLite é recalculado a cada flush de progressos
+painel.instrument_session(SessionLocal)
+_tarefas_background = []
+_threads_background = []
+
+# Log de inicialização
+logger.info("Iniciando %s v%s", settings.app_name, settings.app_version)
+logger.info("Engine configurado: %s", engine.url)
 
 # Configurar CORS
 app.add_middleware(
@@ -33,6 +50,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressão Brotli/GZip negociada pelo Accept-Encoding (respostas acima do tamanho mínimo)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
+# Métricas HTTP (latência, em andamento, status, tamanho) expostas em /metrics.
+# Adicionado por último = middleware mais externo: mede o tamanho já comprimido.
+app.add_middleware(MetricsMiddleware)
+
 # Incluir routers
 app.include_router(auth.router)
 app.include_router(responsaveis.router)
@@ -43,13 +67,43 @@ app.include_router(progresso.router)
 app.include_router(relatorios_ia.router)
 app.include_router(turmas.router)
 app.include_router(recaptcha.router)
+app.include_router(importacao.router)
+
+
+def _garantir_particoes():
+    with engine.begin() as conn:
+        particoes.garantir_particoes(conn)
+
+
+@app.on_event("startup")
+async def iniciar_manutencao_postgresql():
+    """No PostgreSQL: cria as partições mensais dos próximos meses, agenda o REFRESH do painel
+    e escuta as invalidações do cache de referência feitas por outros workers."""
+    if engine.dialect.name != "postgresql":
+        return
+    try:
+        await asyncio.to_thread(_garantir_particoes)
+    except Exception:
+        logger.exception("Não foi possível criar as partições mensais")
+    if settings.painel_refresh_seconds > 0:
+        _tarefas_background.append(asyncio.create_task(painel.refresh_periodico(engine)))
+    ouvinte = cache_referencia.iniciar_ouvinte(engine)
+    if ouvinte is not None:
+        _threads_background.append(ouvinte)
+
+
+@app.on_event("shutdown")
+async def parar_tarefas_background():
+    for tarefa in _tarefas_background:
+        tarefa.cancel()
+    for thread in _threads_background:
+        thread.parar()
 
 
 @app.exception_handler(IntegrityError)
 async def sqlalchemy_integrity_error_handler(request: Request, exc: IntegrityError):
     """Return a JSON error for common DB integrity issues (FK violations, not-null)."""
-    # Log full traceback server-side for debugging
-    print("[IntegrityError]", exc, file=sys.stderr)
+    logger.warning("IntegrityError em %s %s: %s", request.method, request.url.path, exc)
     try:
         detail = str(exc.orig)
     except Exception:
@@ -60,7 +114,7 @@ async def sqlalchemy_integrity_error_handler(request: Request, exc: IntegrityErr
 @app.exception_handler(ProgrammingError)
 async def sqlalchemy_programming_error_handler(request: Request, exc: ProgrammingError):
     """Return a JSON error for programming/database schema issues (e.g. missing table)."""
-    print("[ProgrammingError]", exc, file=sys.stderr)
+    logger.error("ProgrammingError em %s %s: %s", request.method, request.url.path, exc)
     try:
         detail = str(exc.orig)
     except Exception:
@@ -71,8 +125,8 @@ async def sqlalchemy_programming_error_handler(request: Request, exc: Programmin
 @app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
     """Fallback handler: always return JSON instead of HTML tracebacks so clients can parse errors."""
-    # Print full traceback to server logs
-    traceback.print_exc()
+    # Registrar traceback completo nos logs do servidor
+    logger.error("Erro não tratado em %s %s", request.method, request.url.path, exc_info=exc)
     return JSONResponse(status_code=500, content={"error": "Internal Server Error", "detail": str(exc)})
 
 
@@ -90,3 +144,11 @@ def root():
 def health_check():
     """Endpoint de verificação de saúde da API"""
     return {"status": "healthy", "message": "API funcionando corretamente"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """Métricas da API em formato texto do Prometheus"""
+    if settings.metrics_token and request.headers.get("authorization") != f"Bearer {settings.metrics_token}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de métricas inválido")
+    return metrics_response()
@@ -0,0 +1,186 @@
+"""Métricas Prometheus da API.
+
+O ``MetricsMiddleware`` mede cada requisição HTTP (latência, requisições em
+andamento, status e tamanho da resposta) rotulando pelo *template* da rota
+(``/criancas/{crianca_id}``) e não pelo caminho real, para manter a
+cardinalidade baixa. ``GET /metrics`` expõe tudo em formato texto do Prometheus.
+
+Com gunicorn (vários workers), defina ``PROMETHEUS_MULTIPROC_DIR`` para um
+diretório vazio antes de iniciar o servidor: cada worker grava suas amostras
+ali e ``/metrics`` agrega os arquivos de todos os processos (ver
+``entrypoint.sh`` e ``gunicorn_conf.py``).
+"""
+import os
+import time
+from typing import Dict
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.query_stats import track_queries
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_LATENCY = Histogram(
+    "funny_http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "funny_http_requests_in_progress",
+    "Requisições HTTP em andamento",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUESTS_TOTAL = Counter(
+    "funny_http_requests_total",
+    "Total de requisições HTTP por rota e status",
+    ["method", "route", "status"],
+)
+RESPONSE_SIZE = Histogram(
+    "funny_http_response_size_bytes",
+    "Tamanho do corpo das respostas HTTP por rota",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "funny_db_queries_per_request",
+    "Número de statements SQL executados por requisição",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250, 500, 1000),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "funny_db_time_per_request_seconds",
+    "Tempo total gasto em SQL por requisição",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_SLOW_QUERIES = Counter(
+    "funny_db_slow_queries_total",
+    "Statements SQL acima de SLOW_QUERY_MS",
+)
+
+OPENAI_REQUEST_LATENCY = Histogram(
+    "funny_openai_request_duration_seconds",
+    "Latência das chamadas à OpenAI (incluindo retentativas)",
+    ["model", "status"],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 180.0),
+)
+OPENAI_PROMPT_CHARS = Histogram(
+    "funny_openai_prompt_chars",
+    "Tamanho (caracteres) das mensagens enviadas à OpenAI",
+    ["model"],
+    buckets=(1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000),
+)
+OPENAI_TOKENS = Counter(
+    "funny_openai_tokens_total",
+    "Tokens consumidos na OpenAI",
+    ["model", "kind"],
+)
+OPENAI_COST_USD = Counter(
+    "funny_openai_cost_usd_total",
+    "Custo estimado (USD) das chamadas à OpenAI",
+    ["model"],
+)
+OPENAI_RETRIES = Counter(
+    "funny_openai_retries_total",
+    "Retentativas de chamadas à OpenAI",
+    ["model"],
+)
+
+# endpoint -> template da rota; preenchido na primeira requisição de cada app
+_route_templates: Dict[object, str] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """Retorna o template da rota que atendeu a requisição.
+
+    Depois do roteamento o Starlette grava ``scope["endpoint"]``; mapeamos o
+    endpoint de volta para o ``path`` declarado no router.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    template = _route_templates.get(endpoint)
+    if template is None:
+        app = scope.get("app")
+        for route in getattr(app, "routes", []):
+            route_endpoint = getattr(route, "endpoint", None)
+            if route_endpoint is not None:
+                _route_templates.setdefault(route_endpoint, getattr(route, "path", UNMATCHED_ROUTE))
+        template = _route_templates.setdefault(endpoint, UNMATCHED_ROUTE)
+    return template
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que registra as métricas HTTP de cada requisição.
+
+    Também contabiliza as queries SQL da requisição (``app.query_stats``) e
+    devolve o resultado no header ``Server-Timing`` (``db`` e ``app``), visível
+    na aba Network do navegador.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                server_timing = (
+                    f'db;dur={query_stats.duration_ms:.2f};desc="{query_stats.count} queries", '
+                    f"app;dur={elapsed_ms:.2f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", server_timing.encode("latin-1"))]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        with track_queries() as query_stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = time.perf_counter() - start
+                in_progress.dec()
+                route = route_template(scope)
+                REQUEST_LATENCY.labels(method, route).observe(elapsed)
+                REQUESTS_TOTAL.labels(method, route, str(status_code)).inc()
+                RESPONSE_SIZE.labels(method, route).observe(response_size)
+                DB_QUERIES_PER_REQUEST.labels(method, route).observe(query_stats.count)
+                DB_TIME_PER_REQUEST.labels(method, route).observe(query_stats.duration)
+
+
+def metrics_response() -> Response:
+    """Gera a resposta de ``/metrics``, agregando os workers quando em modo multiprocesso."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
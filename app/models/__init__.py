@@ -5,6 +5,9 @@ from .crianca import Crianca
 from .atividade import Atividade
 from .progresso import Progresso
 from .turma import Turma
+from .relatorio_ia_chamada import RelatorioIAChamada
+from .progresso_tentativa import ProgressoTentativa
+from .versao_tabela import VersaoTabela
 
 __all__ = [
     "Usuario",
@@ -13,5 +16,8 @@ __all__ = [
     "Crianca",
     "Atividade",
     "Progresso",
-    "Turma"
+    "Turma",
+    "RelatorioIAChamada",
+    "ProgressoTentativa",
+    "VersaoTabela"
 ]
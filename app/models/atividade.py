@@ -11,9 +11,11 @@ class Atividade(Base):
     descricao = Column(Text, nullable=False)  # Obrigatório - front-end sempre envia
     categoria = Column(String, nullable=False)  # Matemáticas, Português, Lógica ou Cotidiano
     nivel_dificuldade = Column(Integer, nullable=False, default=1)  # Front-end sempre envia (padrão: 1)
+    tipo_jogo = Column(String, nullable=True)  # Regra de pontuação (app/services/pontuacao.py); NULL = padrão
     
     # Relacionamentos
     progressos = relationship("Progresso", back_populates="atividade")
     
     # Nota: Validação de categoria feita no schema Pydantic para compatibilidade com SQLite
-    # Front-end busca por titulo (case-insensitive) antes de criar nova atividade
+    # Front-end busca por titulo (case-insensitive) antes de criar nova atividade:
+    # GET /atividades/busca (índices de busca na migration 0010, ver app/services/busca.py)
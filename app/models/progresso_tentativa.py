@@ -0,0 +1,35 @@
+from sqlalchemy import BigInteger, Column, Integer, Float, Text, Boolean, ForeignKey, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+
+class ProgressoTentativa(Base):
+    """Histórico append-only: uma linha por mini-jogo jogado.
+
+    `progresso` continua sendo a projeção "última tentativa" por
+    (criança, atividade) usada pela API atual; esta tabela só recebe INSERTs
+    (ver app/services/tentativas.py) e alimenta as séries temporais. A única
+    exceção é a correção de pontuação de manutenção (app/services/backfill.py,
+    via `python -m app.cli.repontuar` ou `python -m app.cli.backfill --tabela
+    progresso_tentativas`), que faz UPDATE de `pontuacao`.
+
+    No PostgreSQL é particionada por mês em `created_at` e a chave primária
+    física é (id, created_at) — ver migration 0008.
+    """
+    __tablename__ = "progresso_tentativas"
+    __table_args__ = (
+        # Séries por criança (tendência) filtram por crianca_id + período
+        Index("ix_progresso_tentativas_crianca_created_at", "crianca_id", "created_at"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    crianca_id = Column(Integer, ForeignKey("criancas.id"), nullable=False)
+    atividade_id = Column(Integer, ForeignKey("atividades.id"), nullable=False)
+    responsavel_id = Column(Integer, ForeignKey("responsaveis.id"), nullable=True)
+    pontuacao = Column(Float, nullable=False)  # Pontuação efetiva (após regras do jogo)
+    pontuacao_bruta = Column(Float, nullable=True)  # Valor enviado pelo front, antes das regras
+    movimentos = Column(Integer, nullable=True)
+    tempo_segundos = Column(Integer, nullable=True)
+    concluida = Column(Boolean, nullable=False, default=True)
+    observacoes = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
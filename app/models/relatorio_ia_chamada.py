@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime
+from datetime import datetime
+from app.database import Base
+
+
+class RelatorioIAChamada(Base):
+    """Uma linha por chamada à OpenAI feita para gerar um relatório.
+
+    Permite correlacionar o tamanho do prompt (dados preparados em
+    `_prepare_*_data`) com latência, tokens consumidos e custo estimado.
+    """
+    __tablename__ = "relatorios_ia_chamadas"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    tipo_relatorio = Column(String, nullable=False)  # "crianca" ou "turma"
+    alvo_id = Column(Integer, nullable=True)  # crianca_id ou turma_id (None = todas as turmas)
+    modelo = Column(String, nullable=False)
+    status_http = Column(Integer, nullable=True)  # None quando a requisição nem chegou a responder (timeout/conexão)
+    latencia_ms = Column(Float, nullable=False)
+    tentativas = Column(Integer, nullable=False, default=1)
+    tamanho_prompt = Column(Integer, nullable=False)  # Caracteres enviados nas mensagens
+    tokens_prompt = Column(Integer, nullable=True)
+    tokens_resposta = Column(Integer, nullable=True)
+    tokens_total = Column(Integer, nullable=True)
+    custo_estimado_usd = Column(Float, nullable=True)
+    erro = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.database import Base
+
+
+class VersaoTabela(Base):
+    """Contador de versão por tabela de dados de referência.
+
+    Incrementado (na mesma transação) por toda escrita em atividades,
+    diagnosticos, turmas e responsaveis; vira o ETag/Last-Modified das
+    listagens (ver app/services/versoes.py).
+    """
+    __tablename__ = "versoes_tabelas"
+
+    tabela = Column(String, primary_key=True)
+    versao = Column(Integer, nullable=False, default=1)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
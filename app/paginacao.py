@@ -0,0 +1,115 @@
+"""Paginação por cursor (keyset), filtros e projeção de campos para as listagens.
+
+Uso nos routers::
+
+    def list_x(request: Request, response: Response, pagina: Paginacao = Depends(paginacao), ...):
+        query = db.query(X).filter(...)
+        return listar(query, X, pagina, request, response, XResponse)
+
+- ``after``: id do último item da página anterior; a próxima página traz ids
+  maiores (``WHERE id > :after ORDER BY id LIMIT :limit``), sem OFFSET.
+- ``limit``: tamanho da página, limitado a ``PAGINACAO_LIMITE_MAXIMO``.
+- ``fields``: lista separada por vírgulas de colunas a retornar (o ``id``
+  sempre vem). Só as colunas pedidas são lidas do banco.
+
+Quando há mais itens, a resposta traz ``X-Next-Cursor`` (valor para ``after``)
+e um header ``Link`` com ``rel="next"``.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Query as OrmQuery
+
+from app.config import settings
+from app.database import Base
+
+
+@dataclass(frozen=True)
+class Paginacao:
+    after: Optional[int]
+    limit: int
+    campos: Optional[Tuple[str, ...]]
+
+
+def paginacao(
+    after: Optional[int] = Query(None, ge=0, description="Cursor: id do último item da página anterior"),
+    limit: int = Query(
+        settings.paginacao_limite_padrao, ge=1,
+        description=f"Itens por página (máximo {settings.paginacao_limite_maximo})",
+    ),
+    fields: Optional[str] = Query(None, description="Campos a retornar, separados por vírgula (ex.: id,nome)"),
+) -> Paginacao:
+    """Dependency comum das listagens."""
+    campos = None
+    if fields:
+        campos = tuple(dict.fromkeys(c.strip() for c in fields.split(",") if c.strip()))
+    return Paginacao(after=after, limit=min(limit, settings.paginacao_limite_maximo), campos=campos or None)
+
+
+def prefixo(coluna, valor: str):
+    """Filtro "começa com" (LIKE 'valor%', com % e _ escapados)."""
+    return coluna.startswith(valor, autoescape=True)
+
+
+def _colunas_projetaveis(modelo: Type[Base], schema: Type[BaseModel]) -> List[str]:
+    colunas = set(modelo.__table__.columns.keys())
+    return [nome for nome in schema.model_fields if nome in colunas]
+
+
+def _definir_proxima_pagina(request: Request, response: Response, ultimo_id: int) -> None:
+    response.headers["X-Next-Cursor"] = str(ultimo_id)
+    proxima = request.url.include_query_params(after=ultimo_id)
+    response.headers["Link"] = f'<{proxima}>; rel="next"'
+
+
+def listar(
+    query: OrmQuery,
+    modelo: Type[Base],
+    pagina: Paginacao,
+    request: Request,
+    response: Response,
+    schema: Type[BaseModel],
+    serializar: Optional[Callable[[Any], Any]] = None,
+    opcoes: Sequence[Any] = (),
+):
+    """Aplica cursor/limite/projeção em `query` (já filtrada) e retorna a página.
+
+    Sem `fields`, retorna os objetos (ou `serializar(obj)`) para o
+    `response_model` do endpoint validar. Com `fields`, lê só as colunas pedidas
+    e retorna um `ORJSONResponse` com dicts parciais; nesse caso as `opcoes` de
+    carregamento (selectinload...) não se aplicam.
+    """
+    if pagina.campos:
+        permitidos = _colunas_projetaveis(modelo, schema)
+        invalidos = [c for c in pagina.campos if c not in permitidos]
+        if invalidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos inválidos em fields: {', '.join(invalidos)}. Disponíveis: {', '.join(permitidos)}",
+            )
+        campos: Sequence[str] = ("id",) + tuple(c for c in pagina.campos if c != "id")
+        query = query.with_entities(*(getattr(modelo, c) for c in campos))
+    elif opcoes:
+        query = query.options(*opcoes)
+
+    if pagina.after is not None:
+        query = query.filter(modelo.id > pagina.after)
+    # Um item a mais só para saber se existe próxima página
+    itens = query.order_by(modelo.id).limit(pagina.limit + 1).all()
+    tem_proxima = len(itens) > pagina.limit
+    itens = itens[:pagina.limit]
+    if tem_proxima:
+        _definir_proxima_pagina(request, response, itens[-1].id)
+
+    if pagina.campos:
+        conteudo: List[Dict[str, Any]] = [dict(zip(campos, row)) for row in itens]
+        resposta = ORJSONResponse(conteudo)
+        # Headers já definidos em `response` (cursor, ETag...) não são aplicados a uma Response retornada
+        for nome, valor in response.headers.items():
+            if nome not in ("content-length", "content-type"):
+                resposta.headers[nome] = valor
+        return resposta
+    return [serializar(item) for item in itens] if serializar else itens
@@ -0,0 +1,118 @@
+"""Instrumentação das queries SQL executadas pelo SQLAlchemy.
+
+``instrument_engine`` registra os eventos ``before_cursor_execute`` /
+``after_cursor_execute`` no engine. Cada statement é contabilizado no
+``QueryStats`` ativo no contexto atual (uma requisição, via ``MetricsMiddleware``,
+ou qualquer bloco ``with track_queries()``). O contexto é propagado pelo
+``contextvars`` para a threadpool onde rodam os endpoints síncronos.
+
+Com ``SLOW_QUERY_MS`` configurado, statements mais lentos que o limite são
+registrados no logger ``funny.sql`` com uma *fingerprint* normalizada do SQL
+(literais e listas de parâmetros substituídos por ``?``), para agrupar
+variações da mesma query.
+"""
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger("funny.sql")
+
+
+class QueryStats:
+    """Contadores de queries acumulados em um contexto (ex.: uma requisição)."""
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self, record_statements: bool = False):
+        self.count = 0
+        self.duration = 0.0  # segundos
+        # Lista de statements executados (só quando pedido, ex. em testes)
+        self.statements: Optional[List[str]] = [] if record_statements else None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("funny_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Retorna o ``QueryStats`` ativo no contexto atual, se houver."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """Contabiliza as queries executadas dentro do bloco ``with``."""
+    stats = QueryStats(record_statements=record_statements)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAM = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\?")  # (?<!:): não confunde o cast x::text com :param
+_PARAM_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normaliza um SQL para agrupar execuções da mesma query.
+
+    ``SELECT ... WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND nome = 'x'`` vira
+    ``SELECT ... WHERE id IN (?+) AND nome = ?``.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAM.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("?+", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("funny_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("funny_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+        if stats.statements is not None:
+            stats.statements.append(statement)
+
+    threshold = settings.slow_query_ms
+    if threshold is not None and elapsed * 1000 >= threshold:
+        from app.metrics import DB_SLOW_QUERIES
+
+        DB_SLOW_QUERIES.inc()
+        logger.warning(
+            "Query lenta (%.1f ms): %s",
+            elapsed * 1000,
+            fingerprint(statement),
+            extra={"duration_ms": round(elapsed * 1000, 2), "executemany": executemany},
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra os listeners de contagem/tempo de queries no engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.paginacao import Paginacao, listar, paginacao, prefixo
 from app.models.atividade import Atividade
 from app.schemas.atividade import AtividadeCreate, AtividadeResponse, AtividadeUpdate
 from app.auth.dependencies import get_current_user
+from app.services import busca, cache_referencia
+from app.services.pontuacao import inferir_tipo_jogo
+from app.services.versoes import incrementar_versao, resposta_condicional
 from app.models.usuario import Usuario
 
 router = APIRouter(prefix="/atividades", tags=["Atividades"])
@@ -12,12 +16,41 @@ router = APIRouter(prefix="/atividades", tags=["Atividades"])
 
 @router.get("/", response_model=List[AtividadeResponse])
 def list_atividades(
+    request: Request,
+    response: Response,
+    categoria: Optional[str] = Query(None, description="Filtrar pela categoria"),
+    titulo: Optional[str] = Query(None, description="Filtrar por título que comece com este texto"),
+    pagina: Paginacao = Depends(paginacao),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Listar todos os mini-jogos disponíveis"""
-    atividades = db.query(Atividade).all()
-    return atividades
+    """Listar os mini-jogos disponíveis (paginado por cursor; ver app/paginacao.py)
+
+    Responde 304 quando o If-None-Match/If-Modified-Since do cliente já corresponde à versão atual.
+    """
+    nao_modificado = resposta_condicional(request, response, db, "atividades")
+    if nao_modificado is not None:
+        return nao_modificado
+    query = db.query(Atividade)
+    if categoria:
+        query = query.filter(Atividade.categoria == categoria)
+    if titulo:
+        query = query.filter(prefixo(Atividade.titulo, titulo))
+    return listar(query, Atividade, pagina, request, response, AtividadeResponse)
+
+
+@router.get("/busca", response_model=List[AtividadeResponse])
+def buscar_atividades(
+    q: str = Query(..., min_length=1, description="Trecho do título (ignora maiúsculas e acentos)"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Buscar mini-jogos pelo título ("memoria" encontra "Jogo da Memória")
+
+    Títulos que começam com o termo vêm primeiro. Declarada antes de /{atividade_id}.
+    """
+    return busca.buscar_atividades(db, q, limit)
 
 
 @router.get("/{atividade_id}", response_model=AtividadeResponse)
@@ -45,9 +78,14 @@ def create_atividade(
     """Criar novo mini-jogo
     
     Categorias válidas: Matemáticas, Português, Lógica ou Cotidiano
+    Sem `tipo_jogo`, a regra de pontuação é deduzida do título (ex.: "Jogo da Memória" -> memoria)
     """
     new_atividade = Atividade(**atividade_data.dict())
+    if new_atividade.tipo_jogo is None:
+        new_atividade.tipo_jogo = inferir_tipo_jogo(new_atividade.titulo)
     db.add(new_atividade)
+    incrementar_versao(db, "atividades")
+    cache_referencia.invalidar(db, "atividades")
     db.commit()
     db.refresh(new_atividade)
     return new_atividade
@@ -72,6 +110,8 @@ def update_atividade(
     for field, value in update_data.items():
         setattr(atividade, field, value)
     
+    incrementar_versao(db, "atividades")
+    cache_referencia.invalidar(db, "atividades")
     db.commit()
     db.refresh(atividade)
     return atividade
@@ -92,4 +132,6 @@ def delete_atividade(
         )
     
     db.delete(atividade)
+    incrementar_versao(db, "atividades")
+    cache_referencia.invalidar(db, "atividades")
     db.commit()
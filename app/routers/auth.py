@@ -10,9 +10,12 @@ from app.models.responsavel import Responsavel
 from datetime import timedelta
 from app.config import settings
 from uuid import uuid4
+import logging
 
 router = APIRouter(prefix="/auth", tags=["Autenticação"])
 
+logger = logging.getLogger("funny.auth")
+
 
 @router.post("/register", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
 def register(user_data: UsuarioCreate, db: Session = Depends(get_db)):
@@ -38,11 +41,7 @@ def register(user_data: UsuarioCreate, db: Session = Depends(get_db)):
         db.add(new_user)
         db.commit()
         db.refresh(new_user)
-        # Debug: log created user email/id
-        try:
-            print(f"[auth.register] created user id={new_user.id} email={new_user.email}", file=__import__('sys').stderr)
-        except Exception:
-            pass
+        logger.info("Usuário criado id=%s", new_user.id)
         return new_user
 
     except IntegrityError:
@@ -70,13 +69,10 @@ def login(user_credentials: UsuarioLogin, db: Session = Depends(get_db), request
         token = user_credentials.recaptcha_token
         if not token:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="reCAPTCHA token missing")
-        # Temporary debug logging: print masked token and client info. Remove in production.
-        try:
+        if logger.isEnabledFor(logging.DEBUG):
             client_host = request.client.host if request is not None and request.client else 'unknown'
-        except Exception:
-            client_host = 'unknown'
-        masked = (token[:6] + '...' + token[-6:]) if len(token) > 12 else token
-        print(f"[reCAPTCHA] token received from {client_host} at {__import__('datetime').datetime.utcnow().isoformat()} masked={masked}", file=__import__('sys').stderr)
+            masked = (token[:6] + '...' + token[-6:]) if len(token) > 12 else token
+            logger.debug("reCAPTCHA token recebido de %s masked=%s", client_host, masked)
         try:
             verify_url = "https://www.google.com/recaptcha/api/siteverify"
             resp = httpx.post(verify_url, data={"secret": settings.recaptcha_secret, "response": token}, timeout=10.0)
@@ -92,19 +88,9 @@ def login(user_credentials: UsuarioLogin, db: Session = Depends(get_db), request
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="reCAPTCHA verification failed")
 
     # Buscar usuário
-    try:
-        print(f"[auth.login] incoming email={user_credentials.email}", file=__import__('sys').stderr)
-    except Exception:
-        pass
     user = db.query(Usuario).filter(Usuario.email == user_credentials.email).first()
-    try:
-        if user:
-            print(f"[auth.login] found user id={user.id} email={user.email}", file=__import__('sys').stderr)
-        else:
-            print(f"[auth.login] no user found for email={user_credentials.email}", file=__import__('sys').stderr)
-    except Exception:
-        pass
     if not user:
+        logger.debug("Login sem usuário para email=%s", user_credentials.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas"
@@ -123,13 +109,10 @@ def login(user_credentials: UsuarioLogin, db: Session = Depends(get_db), request
         data={"id": user.id, "email": user.email},
         expires_delta=access_token_expires
     )
-    try:
-        print(f"[auth.login] issuing token for user id={user.id} email={user.email} responsavel_id={responsavel_id}", file=__import__('sys').stderr)
-    except Exception:
-        pass
     # Tentar achar um responsável com o mesmo e-mail do usuário
     responsavel = db.query(Responsavel).filter(Responsavel.email == user.email).first()
     responsavel_id = responsavel.id if responsavel else None
+    logger.debug("Token emitido para usuário id=%s responsavel_id=%s", user.id, responsavel_id)
 
     return {"access_token": access_token, "token_type": "bearer", "responsavel_id": responsavel_id}
 
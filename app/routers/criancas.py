@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.paginacao import Paginacao, listar, paginacao, prefixo
 from app.models.crianca import Crianca
 from app.models.turma import Turma
-from app.models.diagnostico import Diagnostico
 from app.schemas.crianca import CriancaCreate, CriancaResponse, CriancaUpdate
 from app.auth.dependencies import get_current_user
+from app.services import busca, cache_referencia
 from app.models.usuario import Usuario
 
 router = APIRouter(prefix="/criancas", tags=["Crianças"])
@@ -14,12 +15,39 @@ router = APIRouter(prefix="/criancas", tags=["Crianças"])
 
 @router.get("/", response_model=List[CriancaResponse])
 def list_criancas(
+    request: Request,
+    response: Response,
+    turma_id: Optional[int] = Query(None, description="Filtrar pela turma"),
+    diagnostico_id: Optional[int] = Query(None, description="Filtrar pelo diagnóstico"),
+    nome: Optional[str] = Query(None, description="Filtrar por nome que comece com este texto"),
+    pagina: Paginacao = Depends(paginacao),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Listar todas as crianças"""
-    criancas = db.query(Crianca).all()
-    return criancas
+    """Listar as crianças (paginado por cursor; ver app/paginacao.py)"""
+    query = db.query(Crianca)
+    if turma_id is not None:
+        query = query.filter(Crianca.turma_id == turma_id)
+    if diagnostico_id is not None:
+        query = query.filter(Crianca.diagnostico_id == diagnostico_id)
+    if nome:
+        query = query.filter(prefixo(Crianca.nome, nome))
+    return listar(query, Crianca, pagina, request, response, CriancaResponse)
+
+
+@router.get("/busca", response_model=List[CriancaResponse])
+def buscar_criancas(
+    q: str = Query(..., min_length=1, description="Nome ou início do nome (ignora maiúsculas e acentos)"),
+    turma_id: Optional[int] = Query(None, description="Restringir à turma"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Buscar crianças pelo nome, em todas as turmas ou em uma
+
+    Nomes que começam com o termo vêm primeiro, depois os que têm uma palavra começando com ele.
+    """
+    return busca.buscar_criancas(db, q, turma_id, limit)
 
 
 @router.get("/{crianca_id}", response_model=CriancaResponse)
@@ -55,8 +83,7 @@ def create_crianca(
 
     diagnostico_id = data.get("diagnostico_id")
     if diagnostico_id is not None:
-        diag = db.query(Diagnostico).filter(Diagnostico.id == diagnostico_id).first()
-        if not diag:
+        if not cache_referencia.diagnostico_existe(db, diagnostico_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Diagnóstico não encontrado")
 
     new_crianca = Crianca(**data)
@@ -89,8 +116,7 @@ def update_crianca(
         if not turma:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Turma não encontrada")
     if "diagnostico_id" in update_data and update_data["diagnostico_id"] is not None:
-        diag = db.query(Diagnostico).filter(Diagnostico.id == update_data["diagnostico_id"]).first()
-        if not diag:
+        if not cache_referencia.diagnostico_existe(db, update_data["diagnostico_id"]):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Diagnóstico não encontrado")
     for field, value in update_data.items():
         setattr(crianca, field, value)
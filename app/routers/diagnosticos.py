@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.paginacao import Paginacao, listar, paginacao, prefixo
 from app.models.diagnostico import Diagnostico
 from app.schemas.diagnostico import DiagnosticoCreate, DiagnosticoResponse, DiagnosticoUpdate
 from app.auth.dependencies import get_current_user
+from app.services import cache_referencia
+from app.services.versoes import incrementar_versao, resposta_condicional
 from app.models.usuario import Usuario
 
 router = APIRouter(prefix="/diagnosticos", tags=["Diagnósticos"])
@@ -12,12 +15,24 @@ router = APIRouter(prefix="/diagnosticos", tags=["Diagnósticos"])
 
 @router.get("/", response_model=List[DiagnosticoResponse])
 def list_diagnosticos(
+    request: Request,
+    response: Response,
+    tipo: Optional[str] = Query(None, description="Filtrar por tipo que comece com este texto"),
+    pagina: Paginacao = Depends(paginacao),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Listar todos os diagnósticos"""
-    diagnosticos = db.query(Diagnostico).all()
-    return diagnosticos
+    """Listar os diagnósticos (paginado por cursor; ver app/paginacao.py)
+
+    Responde 304 quando o If-None-Match/If-Modified-Since do cliente já corresponde à versão atual.
+    """
+    nao_modificado = resposta_condicional(request, response, db, "diagnosticos")
+    if nao_modificado is not None:
+        return nao_modificado
+    query = db.query(Diagnostico)
+    if tipo:
+        query = query.filter(prefixo(Diagnostico.tipo, tipo))
+    return listar(query, Diagnostico, pagina, request, response, DiagnosticoResponse)
 
 
 @router.get("/{diagnostico_id}", response_model=DiagnosticoResponse)
@@ -45,6 +60,8 @@ def create_diagnostico(
     """Criar novo diagnóstico"""
     new_diagnostico = Diagnostico(**diagnostico_data.dict())
     db.add(new_diagnostico)
+    incrementar_versao(db, "diagnosticos")
+    cache_referencia.invalidar(db, "diagnosticos")
     db.commit()
     db.refresh(new_diagnostico)
     return new_diagnostico
@@ -69,6 +86,8 @@ def update_diagnostico(
     for field, value in update_data.items():
         setattr(diagnostico, field, value)
     
+    incrementar_versao(db, "diagnosticos")
+    cache_referencia.invalidar(db, "diagnosticos")
     db.commit()
     db.refresh(diagnostico)
     return diagnostico
@@ -89,4 +108,6 @@ def delete_diagnostico(
         )
     
     db.delete(diagnostico)
+    incrementar_versao(db, "diagnosticos")
+    cache_referencia.invalidar(db, "diagnosticos")
     db.commit()
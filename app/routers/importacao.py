@@ -0,0 +1,42 @@
+import codecs
+from dataclasses import asdict
+from typing import Literal
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.auth.dependencies import get_current_user
+from app.database import get_db
+from app.models.usuario import Usuario
+from app.schemas.importacao import ImportacaoResponse
+from app.services.importacao import importar_csv
+
+router = APIRouter(prefix="/importacao", tags=["Importação"])
+
+
+@router.post("/{entidade}", response_model=ImportacaoResponse)
+def importar(
+    entidade: Literal["responsaveis", "turmas", "criancas"],
+    arquivo: UploadFile = File(..., description="CSV com cabeçalho (colunas iguais aos campos do POST de criação)"),
+    dry_run: bool = Query(False, description="Apenas validar, sem gravar"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """
+    Importar responsáveis, turmas ou crianças a partir de um CSV
+
+    - **responsaveis**: nome, email, telefone
+    - **turmas**: nome, responsavel_id
+    - **criancas**: nome, idade, turma_id, diagnostico_id
+
+    Linhas válidas são gravadas em uma única transação; linhas inválidas
+    (campos, tipos ou ids inexistentes) são ignoradas e listadas em `erros`.
+    """
+    # Lê o upload em streaming (o arquivo já está em disco/memória temporária do Starlette)
+    linhas = codecs.getreader("utf-8-sig")(arquivo.file)
+    try:
+        resultado = importar_csv(db, entidade, linhas, dry_run=dry_run)
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="O arquivo deve estar em UTF-8")
+    return asdict(resultado)
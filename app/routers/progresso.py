@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
+from datetime import date, datetime
 import logging
+from app.config import settings
 from app.database import get_db
 from app.models.progresso import Progresso
 from app.models.atividade import Atividade
 from app.models.crianca import Crianca
 from app.models.turma import Turma
-from app.schemas.progresso import ProgressoCreate, ProgressoResponse, ProgressoUpdate, ProgressoResumo
+from app.schemas.progresso import ProgressoCreate, ProgressoResponse, ProgressoUpdate, ProgressoResumo, TendenciaResponse
+from app.services.tendencia import tendencia_crianca
+from app.services.tentativas import registrar_tentativas
+from app.services import cache_referencia
+from app.services.exportacao import exportar_progressos
+from app.services.pontuacao import inferir_tipo_jogo, regra as regra_pontuacao
+from app.services.serializadores import CARREGAR_CRIANCA_E_ATIVIDADE
+from app.services.versoes import incrementar_versao
 from app.schemas.atividade import AtividadeCreate
 from app.auth.dependencies import get_current_user
 from app.models.usuario import Usuario
@@ -18,9 +27,8 @@ from sqlalchemy.exc import IntegrityError, ProgrammingError, OperationalError
 
 router = APIRouter(prefix="/progresso", tags=["Progresso"])
 
-# Logger para debug temporário em produção (remover depois de investigado)
+# Nível e amostragem de DEBUG configurados em app/logging_config.py
 logger = logging.getLogger("funny.progresso")
-logger.setLevel(logging.INFO)
 
 
 class RegistrarMiniJogoRequest(BaseModel):
@@ -60,14 +68,13 @@ def registrar_minijogo(
     
     Comportamento:
     - Se a atividade (título + categoria) já existe, reutiliza ela
+    - Toda partida é gravada no histórico `progresso_tentativas` (append-only)
     - Se o progresso (criança + atividade) já existe, atualiza ao invés de criar novo
+      (`progresso` guarda só a última tentativa)
     - Retorna 200 (OK) se atualizou, 201 (Created) se criou novo
     """
-    # Log payload para debug (temporário)
-    try:
-        logger.info(f"registrar_minijogo payload: {request.dict()}")
-    except Exception:
-        logger.info("registrar_minijogo: unable to log payload")
+    # Payload formatado só se DEBUG estiver ativo (e amostrado) para este logger
+    logger.debug("registrar_minijogo payload: %s", request)
 
     # Validar categoria
     categorias_validas = ["Matemáticas", "Português", "Lógica", "Cotidiano"]
@@ -77,60 +84,33 @@ def registrar_minijogo(
             detail=f"Categoria deve ser uma das seguintes: {', '.join(categorias_validas)}"
         )
     
-    # Normalize / validate pontuação when provided (non-negative). For some jogos
-    # (ex: Jogo da Memória) the server will compute the score using `movimentos`.
+    # Validate pontuação when provided (non-negative). The effective score is computed
+    # below by the rule of the activity's tipo_jogo (app/services/pontuacao.py).
     if request.pontuacao is not None and request.pontuacao < 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pontuação deve ser maior ou igual a 0")
 
-    # Special-case: Jogo da Memória scoring rules
-    titulo_norm = (request.titulo or '').lower()
-    computed_score: Optional[float] = None
-    if 'memória' in titulo_norm or 'memoria' in titulo_norm or 'jogo da memória' in titulo_norm or 'memory' in titulo_norm:
-        # Max score is 10. If movimentos provided, apply reduction: after 8 moves, -0.1 per extra move
-        if request.movimentos is not None:
-            moves = int(request.movimentos)
-            if moves <= 8:
-                computed_score = 10.0
-            else:
-                computed_score = max(0.0, 10.0 - 0.1 * (moves - 8))
-        else:
-            # Fallback: if client sent a score on 0-100 scale, normalize to 0-10
-            if request.pontuacao is not None:
-                try:
-                    v = float(request.pontuacao)
-                    if v > 10 and v <= 100:
-                        computed_score = v / 10.0
-                    else:
-                        computed_score = v
-                except Exception:
-                    computed_score = 10.0
-            else:
-                computed_score = 10.0
-
-    # Use computed_score when present, otherwise prefer provided pontuacao (or default to 0)
-    effective_score = computed_score if computed_score is not None else (float(request.pontuacao) if request.pontuacao is not None else 0.0)
-    
     try:
         # Buscar ou criar atividade (mesmo título e categoria = mesma atividade)
-        atividade_existente = db.query(Atividade).filter(
-            Atividade.titulo == request.titulo,
-            Atividade.categoria == request.categoria
-        ).first()
-        
-        if atividade_existente:
-            # Usar atividade existente
-            atividade = atividade_existente
-        else:
+        # (consulta via cache no processo: a tabela é pequena e quase não muda)
+        atividade = cache_referencia.atividade_ref(db, request.titulo, request.categoria)
+
+        if atividade is None:
             # Criar nova atividade apenas se não existir
             nova_atividade = Atividade(
                 categoria=request.categoria,
                 titulo=request.titulo,
                 descricao=request.descricao,
                 nivel_dificuldade=1,
+                tipo_jogo=inferir_tipo_jogo(request.titulo),
             )
             db.add(nova_atividade)
             db.flush()  # Para obter o ID da atividade
-            atividade = nova_atividade
+            incrementar_versao(db, "atividades")
+            atividade = cache_referencia.AtividadeRef(nova_atividade.id, nova_atividade.tipo_jogo)
+        atividade_id = atividade.id
+
+        # Pontuação efetiva pela regra do tipo de jogo (ex.: memoria usa `movimentos`)
+        effective_score = regra_pontuacao(atividade.tipo_jogo).calcular(request.pontuacao, request.movimentos)
 
         # Determine responsavel_id from the child's turma (if available)
         crianca = db.query(Crianca).filter(Crianca.id == request.crianca_id).first()
@@ -145,25 +125,40 @@ def registrar_minijogo(
             if turma:
                 responsavel_id = turma.responsavel_id
 
+        # Histórico: toda partida vira uma linha nova em progresso_tentativas
+        agora = datetime.utcnow()
+        registrar_tentativas(db, [{
+            "crianca_id": request.crianca_id,
+            "atividade_id": atividade_id,
+            "responsavel_id": responsavel_id,
+            "pontuacao": effective_score,
+            "pontuacao_bruta": request.pontuacao,
+            "movimentos": request.movimentos,
+            "tempo_segundos": request.tempo_segundos,
+            "observacoes": request.observacoes,
+            "created_at": agora,
+        }])
+
         # Verificar se já existe progresso para esta criança + atividade
         progresso_existente = db.query(Progresso).filter(
             Progresso.crianca_id == request.crianca_id,
-            Progresso.atividade_id == atividade.id
+            Progresso.atividade_id == atividade_id
         ).first()
 
         if progresso_existente:
-            # Atualizar progresso existente ao invés de criar novo
+            # Atualizar progresso existente ao invés de criar novo (projeção da última tentativa)
             progresso_existente.pontuacao = effective_score
             progresso_existente.observacoes = request.observacoes
             progresso_existente.concluida = True
             progresso_existente.responsavel_id = responsavel_id
+            progresso_existente.created_at = agora
             if request.tempo_segundos is not None:
                 progresso_existente.tempo_segundos = request.tempo_segundos
             db.add(progresso_existente)
             db.commit()
             db.refresh(progresso_existente)
             # Retornar 200 (OK) para atualização
-            return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(progresso_existente))
+            return ORJSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(progresso_existente))
         else:
             # Criar novo progresso apenas se não existir
             novo_progresso = Progresso(
@@ -171,15 +166,16 @@ def registrar_minijogo(
                 observacoes=request.observacoes,
                 concluida=True,  # Se chegou aqui, foi concluída
                 crianca_id=request.crianca_id,
-                atividade_id=atividade.id,
+                atividade_id=atividade_id,
                 responsavel_id=responsavel_id,
-                tempo_segundos=request.tempo_segundos
+                tempo_segundos=request.tempo_segundos,
+                created_at=agora
             )
             db.add(novo_progresso)
             db.commit()
             db.refresh(novo_progresso)
             # Retornar 201 (Created) para criação
-            return JSONResponse(status_code=status.HTTP_201_CREATED, content=jsonable_encoder(novo_progresso))
+            return ORJSONResponse(status_code=status.HTTP_201_CREATED, content=jsonable_encoder(novo_progresso))
     except IntegrityError as e:
         db.rollback()
         # FK violation or not-null constraint
@@ -212,11 +208,7 @@ def registrar_progresso(
     Front-end envia: crianca_id, atividade_id, pontuacao, observacoes, concluida
     responsavel_id é determinado automaticamente a partir da criança/turma
     """
-    # Log payload para debug (temporário)
-    try:
-        logger.info(f"registrar_progresso payload: {progresso_data.dict(exclude_unset=True)}")
-    except Exception:
-        logger.info("registrar_progresso: unable to log payload")
+    logger.debug("registrar_progresso payload: %s", progresso_data)
 
     # Front-end NÃO envia responsavel_id; determinamos a responsavel_id a partir da criança/turma
     progresso_dict = progresso_data.dict(exclude_unset=True)
@@ -235,6 +227,11 @@ def registrar_progresso(
     # Com a mudança em registrar_minijogo, não deve haver múltiplos registros,
     # mas mantemos a busca para compatibilidade com dados antigos
     try:
+        # Histórico append-only; `progresso` abaixo fica só com a última tentativa
+        agora = datetime.utcnow()
+        progresso_dict['created_at'] = agora
+        registrar_tentativas(db, [progresso_dict])
+
         existing = db.query(Progresso).filter(
             Progresso.atividade_id == progresso_dict.get('atividade_id'),
             Progresso.crianca_id == progresso_dict.get('crianca_id')
@@ -245,6 +242,7 @@ def registrar_progresso(
             existing.pontuacao = progresso_dict.get('pontuacao', existing.pontuacao)
             existing.observacoes = progresso_dict.get('observacoes', existing.observacoes)
             existing.concluida = progresso_dict.get('concluida', existing.concluida)
+            existing.created_at = agora
             if 'tempo_segundos' in progresso_dict and progresso_dict['tempo_segundos'] is not None:
                 existing.tempo_segundos = progresso_dict['tempo_segundos']
             # Keep/update responsavel association from child's turma
@@ -253,7 +251,7 @@ def registrar_progresso(
             db.commit()
             db.refresh(existing)
             # Retornar 200 (OK) para atualização
-            return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(existing))
+            return ORJSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(existing))
 
         # No existing progresso found -> create a new one
         new_progresso = Progresso(**progresso_dict)
@@ -261,7 +259,7 @@ def registrar_progresso(
         db.commit()
         db.refresh(new_progresso)
         # return created with 201
-        return JSONResponse(status_code=status.HTTP_201_CREATED, content=jsonable_encoder(new_progresso))
+        return ORJSONResponse(status_code=status.HTTP_201_CREATED, content=jsonable_encoder(new_progresso))
     except IntegrityError as e:
         db.rollback()
         logger.exception("IntegrityError in registrar_progresso")
@@ -280,6 +278,34 @@ def registrar_progresso(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Unexpected error: {str(e)}")
 
 
+@router.get("/export")
+def exportar_progresso(
+    turma_id: Optional[int] = Query(None, description="Exportar apenas as crianças desta turma"),
+    since: Optional[Union[datetime, date]] = Query(None, description="Apenas registros com created_at a partir desta data (AAAA-MM-DD ou data/hora ISO)"),
+    format: Literal["csv", "ndjson"] = Query("csv", description="csv ou ndjson (um objeto JSON por linha)"),
+    gzip: bool = Query(False, description="Compactar o arquivo com gzip"),
+    historico: bool = Query(False, description="Exportar todas as tentativas em vez da última por atividade"),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Exportar progressos em streaming (CSV ou NDJSON)
+
+    As linhas são lidas do banco em blocos e enviadas conforme são geradas:
+    o uso de memória não depende do tamanho da exportação.
+    """
+    if since is not None and not isinstance(since, datetime):
+        since = datetime.combine(since, datetime.min.time())
+    nome = f"progresso{'_historico' if historico else ''}{f'_turma_{turma_id}' if turma_id else ''}.{format}"
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    if gzip:
+        nome += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        exportar_progressos(turma_id=turma_id, since=since, formato=format, gzip=gzip, historico=historico),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{nome}"'},
+    )
+
+
 @router.get("/crianca/{crianca_id}", response_model=List[ProgressoResponse])
 def get_progresso_crianca(
     crianca_id: int,
@@ -287,7 +313,7 @@ def get_progresso_crianca(
     current_user: Usuario = Depends(get_current_user)
 ):
     """Buscar progresso de uma criança específica, ordenado por data (mais recentes primeiro)"""
-    progressos = db.query(Progresso).filter(
+    progressos = db.query(Progresso).options(*CARREGAR_CRIANCA_E_ATIVIDADE).filter(
         Progresso.crianca_id == crianca_id
     ).order_by(Progresso.created_at.desc()).all()
     return progressos
@@ -300,7 +326,7 @@ def get_progresso_atividade(
     current_user: Usuario = Depends(get_current_user)
 ):
     """Buscar progresso de uma atividade específica"""
-    progressos = db.query(Progresso).filter(Progresso.atividade_id == atividade_id).all()
+    progressos = db.query(Progresso).options(*CARREGAR_CRIANCA_E_ATIVIDADE).filter(Progresso.atividade_id == atividade_id).all()
     return progressos
 
 
@@ -327,6 +353,34 @@ def get_resumo_progresso_crianca(
     )
 
 
+@router.get("/crianca/{crianca_id}/tendencia", response_model=TendenciaResponse)
+def get_tendencia_crianca(
+    crianca_id: int,
+    granularidade: Literal["dia", "semana"] = Query("dia", description="Tamanho do bucket: dia ou semana"),
+    janela: int = Query(7, ge=1, le=90, description="Número de buckets na média móvel"),
+    periodo_dias: Optional[int] = Query(None, ge=1, description="Considerar apenas os últimos N dias (padrão: HISTORICO_PERIODO_PADRAO_DIAS)"),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Tendência de pontuação da criança por categoria
+
+    Médias por dia/semana, média móvel e inclinação (pontos por dia), calculadas
+    no banco — o front não precisa baixar o histórico completo para desenhar o gráfico.
+    """
+    crianca = db.query(Crianca.id).filter(Crianca.id == crianca_id).first()
+    if not crianca:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Criança não encontrada")
+
+    periodo_dias = periodo_dias or settings.historico_periodo_padrao_dias
+    return TendenciaResponse(
+        crianca_id=crianca_id,
+        granularidade=granularidade,
+        janela=janela,
+        periodo_dias=periodo_dias,
+        categorias=tendencia_crianca(db, crianca_id, granularidade, janela, periodo_dias),
+    )
+
+
 @router.get("/turma/{turma_id}", response_model=List[ProgressoResponse])
 def get_progresso_turma(
     turma_id: int,
@@ -353,12 +407,14 @@ def get_progresso_turma(
     crianca_ids = [c.id for c in criancas]
 
     # Buscar todos os progressos para essas crianças
-    progressos = db.query(Progresso).filter(Progresso.crianca_id.in_(crianca_ids)).order_by(Progresso.created_at.desc()).all()
+    progressos = (
+        db.query(Progresso)
+        .options(*CARREGAR_CRIANCA_E_ATIVIDADE)
+        .filter(Progresso.crianca_id.in_(crianca_ids))
+        .order_by(Progresso.created_at.desc())
+        .all()
+    )
 
-    # Log para debug (temporário)
-    try:
-        logger.info(f"get_progresso_turma turma_id={turma_id} found {len(progressos)} progressos across {len(crianca_ids)} criancas")
-    except Exception:
-        pass
+    logger.debug("get_progresso_turma turma_id=%s: %s progressos em %s crianças", turma_id, len(progressos), len(crianca_ids))
 
     return progressos
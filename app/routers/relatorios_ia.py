@@ -9,11 +9,21 @@ from app.schemas.relatorio_ia import (
     RelatorioCriancaResponse,
     RelatorioTurmaResponse
 )
-from app.services.ai_service import ai_service
+from app.services.ai_service import ai_service, AIServiceUnavailable
+import math
 
 router = APIRouter(prefix="/relatorios-ia", tags=["Relatórios IA"])
 
 
+def _servico_indisponivel(e: AIServiceUnavailable) -> HTTPException:
+    """503 com Retry-After para quando a OpenAI está fora (circuito aberto ou retentativas esgotadas)"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+    )
+
+
 @router.post("/crianca", response_model=RelatorioCriancaResponse)
 async def gerar_relatorio_crianca(
     request: RelatorioCriancaRequest,
@@ -27,14 +37,18 @@ async def gerar_relatorio_crianca(
     - **incluir_progresso**: Se deve incluir dados de progresso (padrão: True)
     - **incluir_atividades**: Se deve incluir dados de atividades (padrão: True)
     - **periodo_dias**: Número de dias para análise (opcional, se não informado analisa todo histórico)
+    - **modo**: "auto" (padrão: IA, com relatório local se a OpenAI falhar ou responder fora do formato), "ia" ou "local" (instantâneo, sem IA)
     """
     try:
         relatorio = await ai_service.gerar_relatorio_crianca(
             db=db,
             crianca_id=request.crianca_id,
-            periodo_dias=request.periodo_dias
+            periodo_dias=request.periodo_dias,
+            modo=request.modo
         )
         return relatorio
+    except AIServiceUnavailable as e:
+        raise _servico_indisponivel(e)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,14 +74,18 @@ async def gerar_relatorio_turma(
     - **incluir_progresso**: Se deve incluir dados de progresso (padrão: True)
     - **incluir_atividades**: Se deve incluir dados de atividades (padrão: True)
     - **periodo_dias**: Número de dias para análise (opcional, se não informado analisa todo histórico)
+    - **modo**: "auto" (padrão: IA, com relatório local se a OpenAI falhar ou responder fora do formato), "ia" ou "local" (instantâneo, sem IA)
     """
     try:
         relatorio = await ai_service.gerar_relatorio_turma(
             db=db,
             turma_id=request.turma_id,
-            periodo_dias=request.periodo_dias
+            periodo_dias=request.periodo_dias,
+            modo=request.modo
         )
         return relatorio
+    except AIServiceUnavailable as e:
+        raise _servico_indisponivel(e)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -141,10 +159,19 @@ async def health_check_ai():
     """
     # Verificar se a chave está configurada no AIService (que lê do settings ou env)
     api_key_configured = bool(ai_service.api_key)
-    
+    circuit = ai_service.circuit_breaker.snapshot()
+
+    if not api_key_configured:
+        health_status, message = "misconfigured", "OPENAI_API_KEY não configurada"
+    elif circuit["state"] != "closed":
+        health_status, message = "degraded", "OpenAI instável: circuito aberto, relatórios em modo auto usam o gerador local"
+    else:
+        health_status, message = "healthy", "Serviço de IA configurado"
+
     return {
-        "status": "healthy" if api_key_configured else "misconfigured",
+        "status": health_status,
         "api_key_configured": api_key_configured,
         "model": ai_service.model,
-        "message": "Serviço de IA configurado" if api_key_configured else "OPENAI_API_KEY não configurada"
+        "circuit_breaker": circuit,
+        "message": message
     }
@@ -1,35 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.paginacao import Paginacao, listar, paginacao, prefixo
 from app.models.responsavel import Responsavel
 from app.schemas.responsavel import ResponsavelCreate, ResponsavelResponse, ResponsavelUpdate
 from app.auth.dependencies import get_current_user
+from app.services.versoes import incrementar_versao, resposta_condicional
 from app.models.usuario import Usuario
-from typing import List as _List
+from app.services.serializadores import CARREGAR_TURMAS_DO_RESPONSAVEL, responsavel_dict
 
 router = APIRouter(prefix="/responsaveis", tags=["Responsáveis"])
 
 
 @router.get("/", response_model=List[ResponsavelResponse])
 def list_responsaveis(
+    request: Request,
+    response: Response,
+    nome: Optional[str] = Query(None, description="Filtrar por nome que comece com este texto"),
+    pagina: Paginacao = Depends(paginacao),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Listar todos os responsáveis"""
-    responsaveis = db.query(Responsavel).all()
-    # converter para lista de dicts incluindo apenas os campos esperados pelo schema
-    result = []
-    for r in responsaveis:
-        turma_ids = [t.id for t in getattr(r, "turmas", [])]
-        result.append({
-            "id": r.id,
-            "nome": r.nome,
-            "email": r.email,
-            "telefone": r.telefone,
-            "turmas": turma_ids,
-        })
-    return result
+    """Listar os responsáveis (paginado por cursor; ver app/paginacao.py)
+
+    Responde 304 quando o If-None-Match/If-Modified-Since do cliente já corresponde à versão atual.
+    """
+    nao_modificado = resposta_condicional(request, response, db, "responsaveis", "turmas")
+    if nao_modificado is not None:
+        return nao_modificado
+    query = db.query(Responsavel)
+    if nome:
+        query = query.filter(prefixo(Responsavel.nome, nome))
+    return listar(
+        query, Responsavel, pagina, request, response, ResponsavelResponse,
+        serializar=responsavel_dict, opcoes=[CARREGAR_TURMAS_DO_RESPONSAVEL],
+    )
 
 
 @router.get("/{responsavel_id}", response_model=ResponsavelResponse)
@@ -45,14 +51,7 @@ def get_responsavel(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Responsável não encontrado"
         )
-    turma_ids = [t.id for t in getattr(responsavel, "turmas", [])]
-    return {
-        "id": responsavel.id,
-        "nome": responsavel.nome,
-        "email": responsavel.email,
-        "telefone": responsavel.telefone,
-        "turmas": turma_ids,
-    }
+    return responsavel_dict(responsavel)
 
 
 @router.post("/", response_model=ResponsavelResponse, status_code=status.HTTP_201_CREATED)
@@ -64,15 +63,10 @@ def create_responsavel(
     """Criar novo responsável"""
     new_responsavel = Responsavel(**responsavel_data.dict())
     db.add(new_responsavel)
+    incrementar_versao(db, "responsaveis")
     db.commit()
     db.refresh(new_responsavel)
-    return {
-        "id": new_responsavel.id,
-        "nome": new_responsavel.nome,
-        "email": new_responsavel.email,
-        "telefone": new_responsavel.telefone,
-        "turmas": [],
-    }
+    return responsavel_dict(new_responsavel)
 
 
 @router.put("/{responsavel_id}", response_model=ResponsavelResponse)
@@ -94,16 +88,10 @@ def update_responsavel(
     for field, value in update_data.items():
         setattr(responsavel, field, value)
     
+    incrementar_versao(db, "responsaveis")
     db.commit()
     db.refresh(responsavel)
-    turma_ids = [t.id for t in getattr(responsavel, "turmas", [])]
-    return {
-        "id": responsavel.id,
-        "nome": responsavel.nome,
-        "email": responsavel.email,
-        "telefone": responsavel.telefone,
-        "turmas": turma_ids,
-    }
+    return responsavel_dict(responsavel)
 
 
 @router.delete("/{responsavel_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -121,4 +109,5 @@ def delete_responsavel(
         )
     
     db.delete(responsavel)
+    incrementar_versao(db, "responsaveis")
     db.commit()
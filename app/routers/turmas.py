@@ -1,43 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.paginacao import Paginacao, listar, paginacao, prefixo
 from app.models.turma import Turma
-from app.schemas.turma import TurmaCreate, TurmaResponse, TurmaUpdate
+from app.schemas.turma import TurmaCreate, TurmaResponse, TurmaUpdate, PainelTurmaResponse
 from app.auth.dependencies import get_current_user
+from app.services.versoes import incrementar_versao, resposta_condicional
 from app.models.usuario import Usuario
 from app.models.responsavel import Responsavel
+from app.services.painel import PainelIndisponivel, painel_turma
+from app.services.serializadores import CARREGAR_RESPONSAVEL_DA_TURMA, turma_dict
 
 router = APIRouter(prefix="/turmas", tags=["Turmas"])
 
 
 @router.get("/", response_model=List[TurmaResponse])
 def list_turmas(
+    request: Request,
+    response: Response,
+    responsavel_id: Optional[int] = Query(None, description="Filtrar pelo responsável"),
+    nome: Optional[str] = Query(None, description="Filtrar por nome que comece com este texto"),
+    pagina: Paginacao = Depends(paginacao),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user)
 ):
-    """Listar todas as turmas"""
-    turmas = db.query(Turma).all()
-    result = []
-    for t in turmas:
-        resp = getattr(t, "responsavel", None)
-        responsavel_dict = None
-        if resp is not None:
-            turma_ids = [tu.id for tu in getattr(resp, "turmas", [])]
-            responsavel_dict = {
-                "id": resp.id,
-                "nome": resp.nome,
-                "email": resp.email,
-                "telefone": resp.telefone,
-                "turmas": turma_ids,
-            }
-        result.append({
-            "id": t.id,
-            "nome": t.nome,
-            "responsavel_id": t.responsavel_id,
-            "responsavel": responsavel_dict,
-        })
-    return result
+    """Listar as turmas (paginado por cursor; ver app/paginacao.py)
+
+    Responde 304 quando o If-None-Match/If-Modified-Since do cliente já corresponde à versão atual.
+    """
+    nao_modificado = resposta_condicional(request, response, db, "turmas", "responsaveis")
+    if nao_modificado is not None:
+        return nao_modificado
+    query = db.query(Turma)
+    if responsavel_id is not None:
+        query = query.filter(Turma.responsavel_id == responsavel_id)
+    if nome:
+        query = query.filter(prefixo(Turma.nome, nome))
+    return listar(
+        query, Turma, pagina, request, response, TurmaResponse,
+        serializar=turma_dict, opcoes=[CARREGAR_RESPONSAVEL_DA_TURMA],
+    )
 
 
 @router.get("/{turma_id}", response_model=TurmaResponse)
@@ -47,28 +50,39 @@ def get_turma(
     current_user: Usuario = Depends(get_current_user)
 ):
     """Buscar turma por ID"""
+    turma = db.query(Turma).options(CARREGAR_RESPONSAVEL_DA_TURMA).filter(Turma.id == turma_id).first()
+    if not turma:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Turma não encontrada"
+        )
+    return turma_dict(turma)
+
+
+@router.get("/{turma_id}/painel", response_model=PainelTurmaResponse)
+def get_painel_turma(
+    turma_id: int,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(get_current_user)
+):
+    """Painel da turma: média, quantidade, melhor tempo e última atividade por criança × categoria
+
+    Lido do resumo pré-agregado (`progresso_resumo`), sem percorrer o histórico de progressos.
+    """
     turma = db.query(Turma).filter(Turma.id == turma_id).first()
     if not turma:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Turma não encontrada"
         )
-    resp = getattr(turma, "responsavel", None)
-    responsavel_dict = None
-    if resp is not None:
-        turma_ids = [tu.id for tu in getattr(resp, "turmas", [])]
-        responsavel_dict = {
-            "id": resp.id,
-            "nome": resp.nome,
-            "email": resp.email,
-            "telefone": resp.telefone,
-            "turmas": turma_ids,
-        }
+    try:
+        criancas = painel_turma(db, turma_id)
+    except PainelIndisponivel as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     return {
-        "id": turma.id,
+        "turma_id": turma.id,
         "nome": turma.nome,
-        "responsavel_id": turma.responsavel_id,
-        "responsavel": responsavel_dict,
+        "criancas": criancas,
     }
 
 
@@ -89,25 +103,10 @@ def create_turma(
             )
     new_turma = Turma(**turma_data.dict())
     db.add(new_turma)
+    incrementar_versao(db, "turmas")
     db.commit()
     db.refresh(new_turma)
-    resp = getattr(new_turma, "responsavel", None)
-    responsavel_dict = None
-    if resp is not None:
-        turma_ids = [tu.id for tu in getattr(resp, "turmas", [])]
-        responsavel_dict = {
-            "id": resp.id,
-            "nome": resp.nome,
-            "email": resp.email,
-            "telefone": resp.telefone,
-            "turmas": turma_ids,
-        }
-    return {
-        "id": new_turma.id,
-        "nome": new_turma.nome,
-        "responsavel_id": new_turma.responsavel_id,
-        "responsavel": responsavel_dict,
-    }
+    return turma_dict(new_turma)
 
 
 @router.put("/{turma_id}", response_model=TurmaResponse)
@@ -129,25 +128,10 @@ def update_turma(
     for field, value in update_data.items():
         setattr(turma, field, value)
 
+    incrementar_versao(db, "turmas")
     db.commit()
     db.refresh(turma)
-    resp = getattr(turma, "responsavel", None)
-    responsavel_dict = None
-    if resp is not None:
-        turma_ids = [tu.id for tu in getattr(resp, "turmas", [])]
-        responsavel_dict = {
-            "id": resp.id,
-            "nome": resp.nome,
-            "email": resp.email,
-            "telefone": resp.telefone,
-            "turmas": turma_ids,
-        }
-    return {
-        "id": turma.id,
-        "nome": turma.nome,
-        "responsavel_id": turma.responsavel_id,
-        "responsavel": responsavel_dict,
-    }
+    return turma_dict(turma)
 
 
 @router.delete("/{turma_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -165,4 +149,5 @@ def delete_turma(
         )
 
     db.delete(turma)
+    incrementar_versao(db, "turmas")
     db.commit()
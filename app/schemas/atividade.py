@@ -1,5 +1,12 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
+from app.services.pontuacao import REGRAS
+
+
+def _validar_tipo_jogo(v: Optional[str]) -> Optional[str]:
+    if v is not None and v not in REGRAS:
+        raise ValueError(f"tipo_jogo deve ser um dos seguintes: {', '.join(REGRAS)}")
+    return v
 
 
 class AtividadeBase(BaseModel):
@@ -7,6 +14,7 @@ class AtividadeBase(BaseModel):
     titulo: str = Field(..., description="Título do mini-jogo")
     descricao: str = Field(..., description="Descrição do mini-jogo")
     nivel_dificuldade: int = Field(default=1, description="Nível de dificuldade (padrão: 1)")
+    tipo_jogo: Optional[str] = Field(None, description="Regra de pontuação (ex.: memoria); vazio = padrão")
     
     @field_validator('categoria')
     @classmethod
@@ -35,6 +43,12 @@ class AtividadeCreate(BaseModel):
     descricao: str = Field(..., description="Descrição do mini-jogo")
     categoria: str = Field(..., description="Categoria do mini-jogo: Matemática(s), Português, Lógica ou Cotidiano")
     nivel_dificuldade: int = Field(default=1, description="Nível de dificuldade (padrão: 1)")
+    tipo_jogo: Optional[str] = Field(None, description="Regra de pontuação (ex.: memoria); vazio = padrão")
+
+    @field_validator('tipo_jogo')
+    @classmethod
+    def validate_tipo_jogo(cls, v):
+        return _validar_tipo_jogo(v)
     
     @field_validator('categoria')
     @classmethod
@@ -62,6 +76,12 @@ class AtividadeUpdate(BaseModel):
     titulo: Optional[str] = Field(None, description="Título do mini-jogo")
     descricao: Optional[str] = Field(None, description="Descrição do mini-jogo")
     nivel_dificuldade: Optional[int] = Field(None, description="Nível de dificuldade")
+    tipo_jogo: Optional[str] = Field(None, description="Regra de pontuação (ex.: memoria); vazio = padrão")
+
+    @field_validator('tipo_jogo')
+    @classmethod
+    def validate_tipo_jogo(cls, v):
+        return _validar_tipo_jogo(v)
     
     @field_validator('categoria')
     @classmethod
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ErroImportacao(BaseModel):
+    linha: int  # Linha do arquivo CSV (o cabeçalho é a linha 1)
+    erro: str
+
+
+class ImportacaoResponse(BaseModel):
+    entidade: str
+    total_linhas: int
+    importadas: int
+    com_erro: int
+    dry_run: bool
+    erros: List[ErroImportacao]  # Limitado às primeiras 1000 linhas com erro
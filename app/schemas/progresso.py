@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 from .crianca import CriancaResponse
 from .atividade import AtividadeResponse
@@ -92,3 +92,25 @@ class ProgressoResumo(BaseModel):
     total: int
     concluidas: int
     media_pontuacao: float
+
+
+class TendenciaPonto(BaseModel):
+    periodo: datetime  # Início do bucket (dia ou semana)
+    media_pontuacao: float
+    total: int
+    media_movel: float
+
+
+class TendenciaCategoria(BaseModel):
+    categoria: str
+    pontos: List[TendenciaPonto]
+    inclinacao_por_dia: Optional[float] = Field(None, description="Inclinação da reta de mínimos quadrados (pontos por dia)")
+    direcao: Literal["melhora", "queda", "estável", "insuficiente"]
+
+
+class TendenciaResponse(BaseModel):
+    crianca_id: int
+    granularidade: Literal["dia", "semana"]
+    janela: int
+    periodo_dias: Optional[int] = None
+    categorias: List[TendenciaCategoria]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 
 
@@ -9,6 +9,9 @@ class RelatorioCriancaRequest(BaseModel):
     incluir_progresso: bool = True
     incluir_atividades: bool = True
     periodo_dias: Optional[int] = None  # Se None, inclui todo o histórico
+    # "ia": sempre via OpenAI; "local": só números + textos de template (instantâneo);
+    # "auto": IA, caindo para o local se a OpenAI falhar ou responder fora do formato
+    modo: Literal["auto", "ia", "local"] = "auto"
 
 
 class RelatorioTurmaRequest(BaseModel):
@@ -17,6 +20,7 @@ class RelatorioTurmaRequest(BaseModel):
     incluir_progresso: bool = True
     incluir_atividades: bool = True
     periodo_dias: Optional[int] = None  # Se None, inclui todo o histórico
+    modo: Literal["auto", "ia", "local"] = "auto"  # Ver RelatorioCriancaRequest.modo
 
 
 class RelatorioCriancaResponse(BaseModel):
@@ -36,6 +40,7 @@ class RelatorioCriancaResponse(BaseModel):
     # Metadados
     data_geracao: datetime
     periodo_analisado: Optional[str] = None
+    fonte: Literal["ia", "local"] = "ia"  # Quem gerou a narrativa
 
 
 class RelatorioTurmaResponse(BaseModel):
@@ -54,6 +59,7 @@ class RelatorioTurmaResponse(BaseModel):
     # Metadados
     data_geracao: datetime
     periodo_analisado: Optional[str] = None
+    fonte: Literal["ia", "local"] = "ia"  # Quem gerou a narrativa
 
 
 class DadosCriancaParaIA(BaseModel):
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 from .responsavel import ResponsavelResponse
 
 
@@ -23,3 +24,25 @@ class TurmaResponse(TurmaBase):
     
     # Pydantic v2: allow parsing from ORM objects' attributes when needed
     model_config = {"from_attributes": True}
+
+
+class PainelCategoria(BaseModel):
+    media_pontuacao: float
+    total: int
+    melhor_tempo_segundos: Optional[int] = None
+    ultima_atividade: Optional[datetime] = None
+
+
+class PainelCrianca(BaseModel):
+    crianca_id: int
+    nome: str
+    media_geral: Optional[float] = None  # Média ponderada pelo total de cada categoria
+    total: int
+    ultima_atividade: Optional[datetime] = None
+    categorias: Dict[str, PainelCategoria]
+
+
+class PainelTurmaResponse(BaseModel):
+    turma_id: int
+    nome: str
+    criancas: List[PainelCrianca]  # Ordenadas pela média geral (maior primeiro)
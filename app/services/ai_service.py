@@ -1,13 +1,22 @@
 import os
 import json
+import time
+import random
+import asyncio
+import logging
 import httpx
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, joinedload
 from app.models.crianca import Crianca
 from app.models.progresso import Progresso
 from app.models.atividade import Atividade
 from app.models.turma import Turma
+from app.models.relatorio_ia_chamada import RelatorioIAChamada
 from app.schemas.relatorio_ia import (
     DadosCriancaParaIA, 
     DadosTurmaParaIA,
@@ -15,6 +24,49 @@ from app.schemas.relatorio_ia import (
     RelatorioTurmaResponse
 )
 from app.config import settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.services import relatorio_local
+from app.metrics import OPENAI_COST_USD, OPENAI_PROMPT_CHARS, OPENAI_REQUEST_LATENCY, OPENAI_RETRIES, OPENAI_TOKENS
+
+logger = logging.getLogger("funny.ai")
+
+# Status da OpenAI que indicam problema transitório (vale tentar de novo)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Prompt da turma: só agregados, ranking e o resumo de cada criança; o histórico
+# linha a linha (progressos) e as atividades de cada criança cresceriam com a turma
+EXCLUIR_DO_PROMPT_TURMA = {
+    "atividades_disponiveis": True,
+    "criancas": {"__all__": {"progressos", "atividades_realizadas"}},
+}
+
+
+class AIServiceUnavailable(Exception):
+    """OpenAI indisponível: circuito aberto ou retentativas esgotadas"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# No modo "auto", falhas que caem no gerador local: OpenAI fora, erro HTTP não
+# retentável (ex.: 401 com chave inválida) ou resposta do modelo fora do formato
+FALHAS_COM_FALLBACK = (AIServiceUnavailable, httpx.HTTPStatusError, json.JSONDecodeError, KeyError, IndexError, TypeError)
+
+
+@dataclass
+class OpenAICallStats:
+    """Medições de uma chamada à OpenAI, preenchidas por `_make_openai_request`"""
+    modelo: str
+    tamanho_prompt: int = 0
+    status_http: Optional[int] = None
+    latencia_ms: float = 0.0
+    tentativas: int = 0
+    tokens_prompt: Optional[int] = None
+    tokens_resposta: Optional[int] = None
+    tokens_total: Optional[int] = None
+    custo_estimado_usd: Optional[float] = None
+    erro: Optional[str] = None
 
 
 class AIService:
@@ -22,13 +74,60 @@ class AIService:
     
     def __init__(self):
         self.api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.base_url = "https://api.openai.com/v1/chat/completions"
+        self.base_url = f"{settings.openai_base_url.rstrip('/')}/chat/completions"
         self.model = "gpt-4o-mini"  # Modelo OpenAI disponível (gpt-5-mini não existe ainda)
+        # Falha rápido durante incidentes da OpenAI em vez de segurar cada requisição até o timeout
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=settings.openai_circuit_failure_threshold,
+            reset_timeout=settings.openai_circuit_reset_seconds,
+        )
+
+    @staticmethod
+    def _retry_after_seconds(response: Optional[httpx.Response]) -> Optional[float]:
+        """Lê o header Retry-After (segundos ou data HTTP), se presente"""
+        if response is None:
+            return None
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _backoff_seconds(attempt: int) -> float:
+        """Backoff exponencial com jitter completo: U(0, min(max, base * 2^tentativa))"""
+        ceiling = min(settings.openai_backoff_max_seconds, settings.openai_backoff_base_seconds * (2 ** attempt))
+        return random.uniform(0, ceiling)
         
-    async def _make_openai_request(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
-        """Faz requisição para a API do OpenAI"""
+    async def _make_openai_request(self, messages: List[Dict[str, str]], stats: Optional[OpenAICallStats] = None) -> Dict[str, Any]:
+        """Faz requisição para a API do OpenAI
+
+        Se `stats` for informado, ele é preenchido com latência, status HTTP,
+        tokens (bloco `usage` da resposta) e custo estimado da chamada.
+
+        Falhas transitórias (timeout, conexão, 429, 5xx) são repetidas com
+        backoff exponencial + jitter, respeitando `Retry-After` e o prazo total
+        `openai_deadline_seconds`. Com o circuito aberto, ou se as retentativas
+        se esgotarem, levanta `AIServiceUnavailable` sem esperar.
+        """
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY não configurada")
+        # Esta chamada é a tentativa de teste do meio-aberto? (sem await até o try abaixo)
+        trial = self.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+        if not self.circuit_breaker.allow_request():
+            raise AIServiceUnavailable(
+                "Serviço de IA temporariamente indisponível (circuito aberto)",
+                retry_after=self.circuit_breaker.retry_after(),
+            )
+        if stats is None:
+            stats = OpenAICallStats(modelo=self.model)
+        stats.tamanho_prompt = sum(len(m.get("content", "")) for m in messages)
             
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -43,30 +142,118 @@ class AIService:
             "max_tokens": 2000
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.base_url,
-                headers=headers,
-                json=payload,
-                timeout=120.0  # Timeout aumentado para 2 minutos (OpenAI pode demorar)
+        start = time.perf_counter()
+        deadline = start + settings.openai_deadline_seconds
+        try:
+            async with httpx.AsyncClient() as client:
+                while True:
+                    stats.tentativas += 1
+                    response = None
+                    try:
+                        response = await client.post(
+                            self.base_url,
+                            headers=headers,
+                            json=payload,
+                            # Timeout por tentativa (OpenAI pode demorar), limitado ao prazo restante
+                            timeout=max(1.0, min(settings.openai_timeout_seconds, deadline - time.perf_counter()))
+                        )
+                        stats.status_http = response.status_code
+                        if response.status_code not in RETRYABLE_STATUS:
+                            # A OpenAI respondeu: upstream saudável, mesmo que seja um erro do cliente (4xx)
+                            self.circuit_breaker.record_success()
+                            response.raise_for_status()
+                            data = response.json()
+                            break
+                        failure = f"HTTP {response.status_code}"
+                    except (httpx.TimeoutException, httpx.TransportError) as e:
+                        failure = f"{type(e).__name__}: {e}"
+
+                    self.circuit_breaker.record_failure(failure)
+                    # Retry-After do servidor vale como está (sem o teto do backoff); se não
+                    # couber no prazo, desiste já e repassa a espera em `retry_after`
+                    wait = self._retry_after_seconds(response)
+                    if wait is None:
+                        wait = self._backoff_seconds(stats.tentativas - 1)
+                    out_of_attempts = stats.tentativas > settings.openai_max_retries
+                    out_of_time = time.perf_counter() + wait >= deadline
+                    if out_of_attempts or out_of_time or self.circuit_breaker.state == CircuitBreaker.OPEN:
+                        raise AIServiceUnavailable(
+                            f"Serviço de IA indisponível após {stats.tentativas} tentativa(s): {failure}",
+                            retry_after=max(wait, self.circuit_breaker.retry_after()),
+                        )
+                    logger.warning("OpenAI falhou (%s); nova tentativa em %.2fs", failure, wait)
+                    await asyncio.sleep(wait)
+        except Exception as e:
+            stats.erro = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stats.latencia_ms = round((time.perf_counter() - start) * 1000, 2)
+            if trial:
+                # Cancelamento (cliente desconectou) ou erro inesperado não registram
+                # sucesso/falha: sem isso o circuito ficaria meio-aberto para sempre
+                self.circuit_breaker.release_trial()
+
+        usage = data.get("usage") or {}
+        stats.tokens_prompt = usage.get("prompt_tokens")
+        stats.tokens_resposta = usage.get("completion_tokens")
+        stats.tokens_total = usage.get("total_tokens")
+        if stats.tokens_prompt is not None or stats.tokens_resposta is not None:
+            stats.custo_estimado_usd = round(
+                (stats.tokens_prompt or 0) * settings.openai_input_price_per_1m / 1_000_000
+                + (stats.tokens_resposta or 0) * settings.openai_output_price_per_1m / 1_000_000,
+                6,
             )
-            response.raise_for_status()
-            return response.json()
+        return data
+
+    def _registrar_chamada(self, db: Session, tipo_relatorio: str, alvo_id: Optional[int], stats: OpenAICallStats) -> None:
+        """Exporta as medições de uma chamada como métricas e grava uma linha em `relatorios_ia_chamadas`"""
+        if stats.tentativas == 0:
+            return  # Nenhuma requisição chegou a ser feita (ex.: chave ausente)
+
+        status_label = str(stats.status_http) if stats.status_http is not None else "erro"
+        OPENAI_REQUEST_LATENCY.labels(stats.modelo, status_label).observe(stats.latencia_ms / 1000)
+        OPENAI_PROMPT_CHARS.labels(stats.modelo).observe(stats.tamanho_prompt)
+        if stats.tentativas > 1:
+            OPENAI_RETRIES.labels(stats.modelo).inc(stats.tentativas - 1)
+        if stats.tokens_prompt:
+            OPENAI_TOKENS.labels(stats.modelo, "prompt").inc(stats.tokens_prompt)
+        if stats.tokens_resposta:
+            OPENAI_TOKENS.labels(stats.modelo, "completion").inc(stats.tokens_resposta)
+        if stats.custo_estimado_usd:
+            OPENAI_COST_USD.labels(stats.modelo).inc(stats.custo_estimado_usd)
+
+        logger.info(
+            "Chamada OpenAI %s alvo=%s status=%s latencia_ms=%s tokens=%s",
+            tipo_relatorio, alvo_id, status_label, stats.latencia_ms, stats.tokens_total,
+        )
+        try:
+            db.add(RelatorioIAChamada(tipo_relatorio=tipo_relatorio, alvo_id=alvo_id, **vars(stats)))
+            db.commit()
+        except Exception:
+            # A instrumentação nunca deve derrubar a geração do relatório
+            db.rollback()
+            logger.warning("Não foi possível registrar a chamada à OpenAI", exc_info=True)
     
+    @staticmethod
+    def _consulta_progressos(db: Session, periodo_dias: Optional[int] = None):
+        """Progressos do período com a atividade já carregada (sem lazy load por linha)"""
+        query = db.query(Progresso).options(joinedload(Progresso.atividade))
+        if periodo_dias:
+            data_limite = datetime.now() - timedelta(days=periodo_dias)
+            query = query.filter(Progresso.created_at >= data_limite)
+        return query
+
     def _prepare_crianca_data(self, db: Session, crianca_id: int, periodo_dias: int = None) -> DadosCriancaParaIA:
         """Prepara dados da criança para análise pela IA"""
-        crianca = db.query(Crianca).filter(Crianca.id == crianca_id).first()
+        crianca = db.query(Crianca).options(joinedload(Crianca.diagnostico)).filter(Crianca.id == crianca_id).first()
         if not crianca:
             raise ValueError(f"Criança com ID {crianca_id} não encontrada")
         
-        # Buscar progressos
-        query = db.query(Progresso).filter(Progresso.crianca_id == crianca_id)
-        if periodo_dias:
-            data_limite = datetime.now() - timedelta(days=periodo_dias)
-            query = query.filter(Progresso.id >= 0)  # Ajustar conforme estrutura de data
-        
-        progressos = query.all()
-        
+        progressos = self._consulta_progressos(db, periodo_dias).filter(Progresso.crianca_id == crianca_id).all()
+        return self._dados_crianca(crianca, progressos)
+
+    def _dados_crianca(self, crianca: Crianca, progressos: List[Progresso]) -> DadosCriancaParaIA:
+        """Monta os dados da criança a partir dos progressos já carregados (com atividade)"""
         # Preparar dados dos progressos
         progressos_data = []
         for progresso in progressos:
@@ -121,9 +308,8 @@ class AIService:
                     "minutos": round(sum(tempos) / len(tempos) / 60, 2)
                 }
         
-        # Buscar atividades realizadas (mini-jogos)
-        atividades_ids = list(set(p.atividade_id for p in progressos if p.atividade_id))
-        atividades = db.query(Atividade).filter(Atividade.id.in_(atividades_ids)).all()
+        # Atividades realizadas (mini-jogos), já carregadas junto com os progressos
+        atividades = sorted({p.atividade.id: p.atividade for p in progressos if p.atividade}.values(), key=lambda a: a.id)
         
         atividades_data = []
         for atividade in atividades:
@@ -164,15 +350,20 @@ class AIService:
             if not turma:
                 raise ValueError(f"Turma com ID {turma_id} não encontrada")
             # Buscar crianças da turma específica
-            criancas = db.query(Crianca).filter(Crianca.turma_id == turma_id).all()
+            criancas = db.query(Crianca).options(joinedload(Crianca.diagnostico)).filter(Crianca.turma_id == turma_id).all()
         else:
             # Se não especificado, buscar todas (compatibilidade retroativa)
-            criancas = db.query(Crianca).all()
+            criancas = db.query(Crianca).options(joinedload(Crianca.diagnostico)).all()
         
-        dados_criancas = []
-        for crianca in criancas:
-            dados_crianca = self._prepare_crianca_data(db, crianca.id, periodo_dias)
-            dados_criancas.append(dados_crianca)
+        # Progressos de todas as crianças em uma query (não uma por criança)
+        progressos_por_crianca: Dict[int, List[Progresso]] = defaultdict(list)
+        if criancas:
+            query = self._consulta_progressos(db, periodo_dias)
+            if turma_id:
+                query = query.join(Crianca, Crianca.id == Progresso.crianca_id).filter(Crianca.turma_id == turma_id)
+            for progresso in query:
+                progressos_por_crianca[progresso.crianca_id].append(progresso)
+        dados_criancas = [self._dados_crianca(crianca, progressos_por_crianca[crianca.id]) for crianca in criancas]
         
         # Calcular estatísticas gerais
         total_criancas = len(criancas)
@@ -195,17 +386,14 @@ class AIService:
         # Buscar atividades disponíveis (mini-jogos)
         # Se há turma específica, buscar IDs de atividades realizadas pelas crianças da turma
         if turma_id and criancas:
-            # Coletar IDs de atividades das crianças da turma
-            atividades_ids = set()
-            for crianca in criancas:
-                progressos_crianca = db.query(Progresso).filter(Progresso.crianca_id == crianca.id).all()
-                for progresso in progressos_crianca:
-                    if progresso.atividade_id:
-                        atividades_ids.add(progresso.atividade_id)
-            
-            if atividades_ids:
-                atividades = db.query(Atividade).filter(Atividade.id.in_(list(atividades_ids))).all()
-            else:
+            # Atividades realizadas pelas crianças da turma (todo o histórico), em uma query
+            realizadas = (
+                select(Progresso.atividade_id)
+                .join(Crianca, Crianca.id == Progresso.crianca_id)
+                .where(Crianca.turma_id == turma_id)
+            )
+            atividades = db.query(Atividade).filter(Atividade.id.in_(realizadas)).all()
+            if not atividades:
                 # Se não houver atividades, buscar todas (fallback)
                 atividades = db.query(Atividade).all()
         else:
@@ -233,9 +421,108 @@ class AIService:
             atividades_disponiveis=atividades_data
         )
     
-    async def gerar_relatorio_crianca(self, db: Session, crianca_id: int, periodo_dias: int = None) -> RelatorioCriancaResponse:
-        """Gera relatório individual de uma criança usando IA"""
+    def _computar_agregados_turma(self, dados_turma: DadosTurmaParaIA) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, int]]:
+        """Calcula resumo geral, performance média e distribuição de diagnósticos da turma"""
+        # Compute accurate numeric aggregates from the prepared turma data so the AI
+        # receives reliable numbers and cannot hallucinate totals or percentages.
+        # Flatten all progressos across children
+        all_progressos = []
+        for dc in dados_turma.criancas:
+            for p in dc.progressos:
+                # ensure keys exist
+                all_progressos.append({
+                    "crianca_id": dc.id,
+                    "pontuacao": p.get("pontuacao", 0),
+                    "concluida": bool(p.get("concluida", False)),
+                    "atividade_titulo": p.get("atividade_titulo")
+                })
+
+        total_criancas = dados_turma.total_criancas
+        total_atividades = len(dados_turma.atividades_disponiveis or [])
+
+        # overall average score
+        pontuacoes = [p["pontuacao"] for p in all_progressos if p.get("pontuacao") is not None]
+        pontuacao_media = round((sum(pontuacoes) / len(pontuacoes)) if len(pontuacoes) > 0 else 0, 2)
+
+        # taxa_conclusao computed as percent of children with at least one concluida == True
+        crianças_com_conclusao = set(p["crianca_id"] for p in all_progressos if p.get("concluida"))
+        taxa_conclusao = round((len(crianças_com_conclusao) / total_criancas) * 100, 2) if total_criancas > 0 else 0
+
+        # distribuicao_diagnosticos already available in dados_turma.estatisticas_gerais
+        distribuicao_diagnosticos = dados_turma.estatisticas_gerais.get("distribuicao_diagnosticos", {}) if dados_turma.estatisticas_gerais else {}
+
+        computed_resumo_geral = {
+            "total_criancas": total_criancas,
+            "total_atividades": total_atividades
+        }
+
+        computed_performance_media = {
+            "pontuacao_media": pontuacao_media,
+            "taxa_conclusao": taxa_conclusao,
+            "tempo_medio_minutos": dados_turma.estatisticas_gerais.get("tempo_medio_minutos") if dados_turma.estatisticas_gerais else None
+        }
+
+        return computed_resumo_geral, computed_performance_media, distribuicao_diagnosticos
+
+    @staticmethod
+    def _descricao_periodo(periodo_dias: Optional[int]) -> str:
+        return f"Últimos {periodo_dias} dias" if periodo_dias else "Todo o histórico"
+
+    def _usar_local(self, modo: str) -> bool:
+        """Decide de antemão se o relatório sai do gerador local (sem chamar a OpenAI)"""
+        if modo == "local":
+            return True
+        # No modo "auto", sem chave ou com o circuito aberto nem tentamos a IA
+        return modo == "auto" and (not self.api_key or self.circuit_breaker.state == CircuitBreaker.OPEN)
+
+    def _ranking_atividades_turma(self, db: Session, turma_id: int = None, periodo_dias: int = None, limite: int = None) -> List[Dict[str, Any]]:
+        """Top-N atividades da turma por média de pontuação, calculado em uma única query agrupada
+
+        Inclui taxa de conclusão (%) e tempo médio por atividade. Sem `turma_id`,
+        considera todas as crianças (mesmo comportamento de `_prepare_turma_data`).
+        """
+        media_pontuacao = func.avg(Progresso.pontuacao).label("media_pontuacao")
+        total_registros = func.count(Progresso.id).label("total_registros")
+        query = db.query(
+            Atividade.titulo,
+            Atividade.categoria,
+            media_pontuacao,
+            total_registros,
+            func.avg(case((Progresso.concluida.is_(True), 100.0), else_=0.0)).label("taxa_conclusao"),
+            func.avg(Progresso.tempo_segundos).label("tempo_medio_segundos"),
+        ).join(Progresso, Progresso.atividade_id == Atividade.id)
+        if turma_id:
+            query = query.join(Crianca, Crianca.id == Progresso.crianca_id).filter(Crianca.turma_id == turma_id)
+        if periodo_dias:
+            query = query.filter(Progresso.created_at >= datetime.now() - timedelta(days=periodo_dias))
+
+        rows = (
+            query.group_by(Atividade.id, Atividade.titulo, Atividade.categoria)
+            .order_by(media_pontuacao.desc(), total_registros.desc(), Atividade.titulo)
+            .limit(limite or settings.relatorio_top_atividades)
+            .all()
+        )
+        return [
+            {
+                "titulo": row.titulo,
+                "categoria": row.categoria,
+                "media_pontuacao": round(row.media_pontuacao, 2),
+                "total_registros": row.total_registros,
+                "taxa_conclusao": round(row.taxa_conclusao, 2),
+                "tempo_medio_segundos": round(row.tempo_medio_segundos, 2) if row.tempo_medio_segundos is not None else None,
+            }
+            for row in rows
+        ]
+
+    async def gerar_relatorio_crianca(self, db: Session, crianca_id: int, periodo_dias: int = None, modo: str = "auto") -> RelatorioCriancaResponse:
+        """Gera relatório individual de uma criança usando IA
+
+        `modo`: "ia", "local" ou "auto" (IA com fallback para o gerador local
+        quando a OpenAI falha ou responde fora do formato; ver `FALHAS_COM_FALLBACK`).
+        """
         dados_crianca = self._prepare_crianca_data(db, crianca_id, periodo_dias)
+        if self._usar_local(modo):
+            return relatorio_local.relatorio_crianca_local(dados_crianca, self._descricao_periodo(periodo_dias))
         
         prompt = f"""
         Você é um especialista em terapia ocupacional e desenvolvimento infantil. 
@@ -273,62 +560,51 @@ class AIService:
             {"role": "user", "content": prompt}
         ]
         
-        response = await self._make_openai_request(messages)
-        relatorio_data = json.loads(response["choices"][0]["message"]["content"])
+        stats = OpenAICallStats(modelo=self.model)
+        try:
+            response = await self._make_openai_request(messages, stats)
+            relatorio_data = json.loads(response["choices"][0]["message"]["content"])
+            resumo_geral = relatorio_data["resumo_geral"]
+        except FALHAS_COM_FALLBACK as e:
+            if modo != "auto":
+                raise
+            logger.warning("IA falhou (%s: %s); relatório da criança %s gerado localmente", type(e).__name__, e, crianca_id)
+            return relatorio_local.relatorio_crianca_local(dados_crianca, self._descricao_periodo(periodo_dias))
+        finally:
+            self._registrar_chamada(db, "crianca", crianca_id, stats)
         
         return RelatorioCriancaResponse(
             crianca_id=crianca_id,
             nome_crianca=dados_crianca.nome,
             idade=dados_crianca.idade,
             diagnostico=dados_crianca.diagnostico,
-            resumo_geral=relatorio_data["resumo_geral"],
+            resumo_geral=resumo_geral,
             desempenho_por_categoria=relatorio_data.get("desempenho_por_categoria", {}),
             resumo=relatorio_data.get("resumo", ""),
             data_geracao=datetime.now(),
-            periodo_analisado=f"Últimos {periodo_dias} dias" if periodo_dias else "Todo o histórico"
+            periodo_analisado=self._descricao_periodo(periodo_dias)
         )
     
-    async def gerar_relatorio_turma(self, db: Session, turma_id: int = None, periodo_dias: int = None) -> RelatorioTurmaResponse:
-        """Gera relatório da turma usando IA"""
-        dados_turma = self._prepare_turma_data(db, turma_id=turma_id, periodo_dias=periodo_dias)
-        # Compute accurate numeric aggregates from the prepared turma data so the AI
-        # receives reliable numbers and cannot hallucinate totals or percentages.
-        # Flatten all progressos across children
-        all_progressos = []
-        for dc in dados_turma.criancas:
-            for p in dc.progressos:
-                # ensure keys exist
-                all_progressos.append({
-                    "crianca_id": dc.id,
-                    "pontuacao": p.get("pontuacao", 0),
-                    "concluida": bool(p.get("concluida", False)),
-                    "atividade_titulo": p.get("atividade_titulo")
-                })
+    async def gerar_relatorio_turma(self, db: Session, turma_id: int = None, periodo_dias: int = None, modo: str = "auto") -> RelatorioTurmaResponse:
+        """Gera relatório da turma usando IA
 
+        `modo`: "ia", "local" ou "auto" (IA com fallback para o gerador local
+        quando a OpenAI falha ou responde fora do formato; ver `FALHAS_COM_FALLBACK`).
+        """
+        dados_turma = self._prepare_turma_data(db, turma_id=turma_id, periodo_dias=periodo_dias)
+        computed_resumo_geral, computed_performance_media, distribuicao_diagnosticos = self._computar_agregados_turma(dados_turma)
         total_criancas = dados_turma.total_criancas
-        total_atividades = len(dados_turma.atividades_disponiveis or [])
-
-        # overall average score
-        pontuacoes = [p["pontuacao"] for p in all_progressos if p.get("pontuacao") is not None]
-        pontuacao_media = round((sum(pontuacoes) / len(pontuacoes)) if len(pontuacoes) > 0 else 0, 2)
+        # Ranking exato vindo do banco; a IA só comenta, não inventa esse campo
+        atividades_mais_efetivas = self._ranking_atividades_turma(db, turma_id=turma_id, periodo_dias=periodo_dias)
 
-        # taxa_conclusao computed as percent of children with at least one concluida == True
-        crianças_com_conclusao = set(p["crianca_id"] for p in all_progressos if p.get("concluida"))
-        taxa_conclusao = round((len(crianças_com_conclusao) / total_criancas) * 100, 2) if total_criancas > 0 else 0
-
-        # distribuicao_diagnosticos already available in dados_turma.estatisticas_gerais
-        distribuicao_diagnosticos = dados_turma.estatisticas_gerais.get("distribuicao_diagnosticos", {}) if dados_turma.estatisticas_gerais else {}
-
-        computed_resumo_geral = {
-            "total_criancas": total_criancas,
-            "total_atividades": total_atividades
-        }
+        def _relatorio_local() -> RelatorioTurmaResponse:
+            return relatorio_local.relatorio_turma_local(
+                dados_turma, computed_resumo_geral, computed_performance_media,
+                distribuicao_diagnosticos, atividades_mais_efetivas, self._descricao_periodo(periodo_dias)
+            )
 
-        computed_performance_media = {
-            "pontuacao_media": pontuacao_media,
-            "taxa_conclusao": taxa_conclusao,
-            "tempo_medio_minutos": dados_turma.estatisticas_gerais.get("tempo_medio_minutos") if dados_turma.estatisticas_gerais else None
-        }
+        if self._usar_local(modo):
+            return _relatorio_local()
 
         # Instruct the AI to use these precomputed numeric aggregates and not to alter them
         prompt = f"""
@@ -340,10 +616,10 @@ class AIService:
         registros de progresso no banco de dados.
 
         AGREGADOS PRÉ-COMPUTADOS (use estes números):
-        {json.dumps({"resumo_geral_turma": computed_resumo_geral, "performance_media": computed_performance_media, "distribuicao_diagnosticos": distribuicao_diagnosticos}, ensure_ascii=False)}
+        {json.dumps({"resumo_geral_turma": computed_resumo_geral, "performance_media": computed_performance_media, "distribuicao_diagnosticos": distribuicao_diagnosticos, "atividades_mais_efetivas": atividades_mais_efetivas}, ensure_ascii=False)}
 
-        DADOS DA TURMA (detalhes):
-        {dados_turma.json()}
+        DADOS DA TURMA (resumo por criança):
+        {dados_turma.json(exclude=EXCLUIR_DO_PROMPT_TURMA)}
 
         Gere um relatório JSON com a seguinte estrutura (os campos numéricos acima devem refletir os valores pré-computados):
         {{
@@ -357,10 +633,7 @@ class AIService:
                 "taxa_conclusao": "number",
                 "tempo_medio_minutos": "number (tempo médio em minutos para completar atividades, se disponível)"
             }},
-            "atividades_mais_efetivas": [
-                {{"titulo": "string", "categoria": "string", "media_pontuacao": "number"}}
-            ],
-            "resumo": "resumo executivo curto (2-3 parágrafos) destacando os principais pontos do relatório da turma"
+            "resumo": "resumo executivo curto (2-3 parágrafos) destacando os principais pontos do relatório da turma, comentando as atividades mais efetivas listadas acima"
         }}
 
         Analise padrões coletivos nos mini-jogos, identifique necessidades comuns,
@@ -373,8 +646,17 @@ class AIService:
             {"role": "user", "content": prompt}
         ]
 
-        response = await self._make_openai_request(messages)
-        relatorio_data = json.loads(response["choices"][0]["message"]["content"]) if response and response.get("choices") else {}
+        stats = OpenAICallStats(modelo=self.model)
+        try:
+            response = await self._make_openai_request(messages, stats)
+            relatorio_data = json.loads(response["choices"][0]["message"]["content"]) if response and response.get("choices") else {}
+        except FALHAS_COM_FALLBACK as e:
+            if modo != "auto":
+                raise
+            logger.warning("IA falhou (%s: %s); relatório da turma %s gerado localmente", type(e).__name__, e, turma_id)
+            return _relatorio_local()
+        finally:
+            self._registrar_chamada(db, "turma", turma_id, stats)
 
         # Overwrite numeric aggregates in the AI response with computed values to guarantee accuracy
         relatorio_data["resumo_geral_turma"] = computed_resumo_geral
@@ -386,10 +668,10 @@ class AIService:
             resumo_geral_turma=relatorio_data.get("resumo_geral_turma", computed_resumo_geral),
             distribuicao_diagnosticos=relatorio_data.get("distribuicao_diagnosticos", distribuicao_diagnosticos),
             performance_media=relatorio_data.get("performance_media", computed_performance_media),
-            atividades_mais_efetivas=relatorio_data.get("atividades_mais_efetivas", []),
+            atividades_mais_efetivas=atividades_mais_efetivas,
             resumo=relatorio_data.get("resumo", ""),
             data_geracao=datetime.now(),
-            periodo_analisado=f"Últimos {periodo_dias} dias" if periodo_dias else "Todo o histórico"
+            periodo_analisado=self._descricao_periodo(periodo_dias)
         )
 
 
@@ -0,0 +1,255 @@
+"""Correção em lote da pontuação do histórico (``progresso`` / ``progresso_tentativas``).
+
+Usado por ``python -m app.cli.backfill``. As linhas são lidas em ordem de id
+(cursor do lado do servidor no PostgreSQL; no SQLite, páginas por id), cada
+bloco vira arrays NumPy, a ``TRANSFORMACOES[nome]`` calcula a nova pontuação
+de uma vez e só as linhas que mudaram são gravadas:
+
+- PostgreSQL: um ``UPDATE ... FROM (VALUES ...)`` por bloco;
+- SQLite: ``executemany``.
+
+Cada bloco é confirmado separadamente e o último id processado fica num
+arquivo de checkpoint (JSON), então uma execução interrompida pode ser
+retomada de onde parou. Em dry-run nada é gravado e o resultado é só a
+estatística das diferenças.
+
+Quando a tabela é ``progresso_tentativas``, ao final a projeção ``progresso``
+(última tentativa de cada criança/atividade) é sincronizada com o histórico.
+O resumo do painel fica a cargo de quem chama (``painel.refresh_painel``).
+Também é a base de ``python -m app.cli.repontuar`` (transformação ``regras``
+restrita a algumas atividades).
+"""
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Float, Integer, bindparam, column, literal, select, update, values
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.atividade import Atividade
+from app.models.progresso import Progresso
+from app.models.progresso_tentativa import ProgressoTentativa
+from app.services.pontuacao import regra
+
+logger = logging.getLogger("funny.backfill")
+
+TABELAS = {
+    "progresso": Progresso.__table__,
+    "progresso_tentativas": ProgressoTentativa.__table__,
+}
+
+Transformacao = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+
+def _escala_0_100(lote: Dict[str, np.ndarray]) -> np.ndarray:
+    # Notas enviadas na escala 0–100 antes da normalização em registrar_minijogo. Só os
+    # tipos de jogo cuja regra tem `escala_entrada` (ex.: memória) eram normalizados; nos
+    # demais, um 50 é a nota que o front mandou e fica como está
+    novas = lote["pontuacao"].copy()
+    tipos = lote["tipo_jogo"]
+    for tipo in set(tipos.tolist()):
+        r = regra(tipo)
+        if r.escala_entrada is None:
+            continue
+        mascara = tipos == tipo
+        p = novas[mascara]
+        novas[mascara] = np.where((p > r.nota_maxima) & (p <= r.escala_entrada), p * r.nota_maxima / r.escala_entrada, p)
+    return novas
+
+
+def _arredondar(lote: Dict[str, np.ndarray]) -> np.ndarray:
+    # Resíduos de ponto flutuante (ex.: 8.499999999) desde a troca para Float (migration 0005)
+    return np.round(lote["pontuacao"], 2)
+
+
+def _regras(lote: Dict[str, np.ndarray]) -> np.ndarray:
+    # Regra atual do tipo de jogo de cada atividade (app/services/pontuacao.py)
+    entrada = np.where(np.isnan(lote["pontuacao_bruta"]), lote["pontuacao"], lote["pontuacao_bruta"])
+    novas = lote["pontuacao"].copy()
+    tipos = lote["tipo_jogo"]
+    for tipo in set(tipos.tolist()):
+        mascara = tipos == tipo
+        novas[mascara] = regra(tipo).calcular_lote(entrada[mascara], lote["movimentos"][mascara])
+    return novas
+
+
+TRANSFORMACOES: Dict[str, Transformacao] = {
+    "escala_0_100": _escala_0_100,
+    "arredondar": _arredondar,
+    "regras": _regras,
+}
+
+
+@dataclass
+class Estatisticas:
+    lidas: int = 0
+    alteradas: int = 0
+    soma_antes: float = 0.0
+    soma_depois: float = 0.0
+    maior_diferenca: float = 0.0
+    exemplos: List[Dict[str, float]] = field(default_factory=list)  # Algumas alterações, para conferência
+
+    def registrar(self, ids: np.ndarray, antes: np.ndarray, depois: np.ndarray, mudou: np.ndarray) -> None:
+        self.lidas += len(ids)
+        self.alteradas += int(mudou.sum())
+        self.soma_antes += float(antes.sum())
+        self.soma_depois += float(depois.sum())
+        if mudou.any():
+            self.maior_diferenca = max(self.maior_diferenca, float(np.abs(depois[mudou] - antes[mudou]).max()))
+            for i, a, d in zip(ids[mudou][:10 - len(self.exemplos)], antes[mudou], depois[mudou]):
+                self.exemplos.append({"id": int(i), "antes": float(a), "depois": float(d)})
+
+    def resumo(self) -> str:
+        if not self.lidas:
+            return "nenhuma linha lida"
+        return (
+            f"{self.lidas} linha(s) lidas, {self.alteradas} alteradas "
+            f"({100.0 * self.alteradas / self.lidas:.1f}%); média {self.soma_antes / self.lidas:.3f} -> "
+            f"{self.soma_depois / self.lidas:.3f}; maior diferença {self.maior_diferenca:.3f}"
+        )
+
+
+@dataclass
+class Checkpoint:
+    tabela: str
+    transformacao: str
+    atividades: List[int] = field(default_factory=list)  # Vazio: todas
+    ultimo_id: int = 0
+    estatisticas: Estatisticas = field(default_factory=Estatisticas)
+
+    @classmethod
+    def carregar(cls, caminho: Path) -> "Checkpoint":
+        dados = json.loads(caminho.read_text())
+        return cls(
+            tabela=dados["tabela"],
+            transformacao=dados["transformacao"],
+            atividades=dados.get("atividades", []),
+            ultimo_id=dados["ultimo_id"],
+            estatisticas=Estatisticas(**dados["estatisticas"]),
+        )
+
+    def salvar(self, caminho: Path) -> None:
+        temporario = caminho.with_suffix(caminho.suffix + ".tmp")
+        temporario.write_text(json.dumps(asdict(self), indent=2))
+        temporario.replace(caminho)  # Atômico: nunca deixa um checkpoint pela metade
+
+
+def _consulta(tabela, atividades: Sequence[int]):
+    tem_historico = "pontuacao_bruta" in tabela.c
+    consulta = (
+        select(
+            tabela.c.id,
+            tabela.c.pontuacao,
+            tabela.c.pontuacao_bruta if tem_historico else literal(None, Float).label("pontuacao_bruta"),
+            tabela.c.movimentos if tem_historico else literal(None, Integer).label("movimentos"),
+            Atividade.tipo_jogo,
+        )
+        .join(Atividade, Atividade.id == tabela.c.atividade_id)
+        .order_by(tabela.c.id)
+    )
+    if atividades:
+        consulta = consulta.where(tabela.c.atividade_id.in_(list(atividades)))
+    return consulta
+
+
+def _ler_blocos(engine: Engine, tabela, atividades: Sequence[int], a_partir_de: int, tamanho: int) -> Iterator[list]:
+    consulta = _consulta(tabela, atividades)
+    if engine.dialect.name == "postgresql":
+        # Cursor do lado do servidor: o banco entrega `tamanho` linhas por vez
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=tamanho).execute(
+                consulta.where(tabela.c.id > a_partir_de)
+            )
+            yield from result.partitions()
+        return
+    # SQLite: um cursor aberto bloquearia as escritas da outra conexão; lê página a página
+    ultimo = a_partir_de
+    while True:
+        with engine.connect() as conn:
+            linhas = conn.execute(consulta.where(tabela.c.id > ultimo).limit(tamanho)).all()
+        if not linhas:
+            return
+        ultimo = linhas[-1].id
+        yield linhas
+
+
+def _arrays(linhas: list) -> Dict[str, np.ndarray]:
+    ids, pontuacoes, brutas, movimentos, tipos = zip(*linhas)
+    return {
+        "id": np.array(ids, dtype=np.int64),
+        "pontuacao": np.array(pontuacoes, dtype=np.float64),
+        "pontuacao_bruta": np.array(brutas, dtype=np.float64),  # NULL -> NaN
+        "movimentos": np.array(movimentos, dtype=np.float64),
+        "tipo_jogo": np.array(tipos, dtype=object),
+    }
+
+
+def _gravar(conn, tabela, ids: np.ndarray, pontuacoes: np.ndarray) -> None:
+    if conn.dialect.name == "postgresql":
+        novos = values(column("id", Integer), column("pontuacao", Float), name="novos").data(
+            list(zip(ids.tolist(), pontuacoes.tolist()))
+        )
+        conn.execute(update(tabela).where(tabela.c.id == novos.c.id).values(pontuacao=novos.c.pontuacao))
+        return
+    conn.execute(
+        update(tabela).where(tabela.c.id == bindparam("b_id")).values(pontuacao=bindparam("b_pontuacao")),
+        [{"b_id": i, "b_pontuacao": p} for i, p in zip(ids.tolist(), pontuacoes.tolist())],
+    )
+
+
+def sincronizar_projecao(conn: Connection, atividades: Sequence[int] = ()) -> None:
+    """Copia para ``progresso`` a pontuação da última tentativa de cada (criança, atividade)."""
+    tentativas = ProgressoTentativa.__table__
+    ultima = (
+        select(tentativas.c.pontuacao)
+        .where(
+            tentativas.c.crianca_id == Progresso.crianca_id,
+            tentativas.c.atividade_id == Progresso.atividade_id,
+        )
+        .order_by(tentativas.c.created_at.desc(), tentativas.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    alterar = update(Progresso.__table__).where(ultima.is_not(None)).values(pontuacao=ultima)
+    if atividades:
+        alterar = alterar.where(Progresso.atividade_id.in_(list(atividades)))
+    conn.execute(alterar)
+
+
+def executar(
+    engine: Engine,
+    checkpoint: Checkpoint,
+    caminho_checkpoint: Optional[Path] = None,
+    tamanho_lote: int = 10000,
+    dry_run: bool = False,
+) -> Estatisticas:
+    """Processa a tabela a partir de `checkpoint.ultimo_id`, salvando o checkpoint a cada bloco.
+
+    Para `progresso_tentativas`, sincroniza a projeção `progresso` no final.
+    """
+    tabela = TABELAS[checkpoint.tabela]
+    transformar = TRANSFORMACOES[checkpoint.transformacao]
+    estatisticas = checkpoint.estatisticas
+
+    for linhas in _ler_blocos(engine, tabela, checkpoint.atividades, checkpoint.ultimo_id, tamanho_lote):
+        lote = _arrays(linhas)
+        novas = transformar(lote)
+        mudou = ~np.isclose(novas, lote["pontuacao"], rtol=0.0, atol=1e-9)
+        estatisticas.registrar(lote["id"], lote["pontuacao"], novas, mudou)
+        if not dry_run and mudou.any():
+            with engine.begin() as conn:
+                _gravar(conn, tabela, lote["id"][mudou], novas[mudou])
+        checkpoint.ultimo_id = int(lote["id"][-1])
+        if caminho_checkpoint is not None and not dry_run:
+            checkpoint.salvar(caminho_checkpoint)
+        logger.info("Até id %s: %s", checkpoint.ultimo_id, estatisticas.resumo())
+
+    # As estatísticas vêm do checkpoint: numa retomada, contam também as alterações da execução anterior
+    if tabela is ProgressoTentativa.__table__ and not dry_run and estatisticas.alteradas:
+        with engine.begin() as conn:
+            sincronizar_projecao(conn, checkpoint.atividades)
+        logger.info("Projeção progresso sincronizada com as tentativas")
+    return estatisticas
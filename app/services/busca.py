@@ -0,0 +1,231 @@
+"""Busca por texto sem diferenciar maiúsculas nem acentos ("memoria" acha "Memória").
+
+- PostgreSQL: compara ``lower(f_unaccent(coluna))`` com o termo normalizado.
+  ``f_unaccent`` é um wrapper IMMUTABLE de ``unaccent`` (criado na migration
+  0010) para poder ser usado em índices de expressão: um btree
+  ``text_pattern_ops`` atende o prefixo (``LIKE 'termo%'``) e um GIN
+  ``gin_trgm_ops`` atende substring e similaridade por trigramas (``<%``),
+  que tolera pequenos erros de digitação.
+- SQLite: atividades usam a tabela FTS5 ``atividades_busca`` com
+  ``remove_diacritics``, sincronizada por triggers (migration 0010); sem ela
+  (banco criado com ``create_all``), varre a tabela comparando já normalizado.
+  Crianças usam um índice ordenado em memória (``IndiceNomes``) com busca
+  binária por prefixo de cada palavra do nome.
+"""
+import bisect
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import List, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect, literal, or_, select, text
+from sqlalchemy.orm import Session, object_session
+
+from app.config import settings
+from app.models.atividade import Atividade
+from app.models.crianca import Crianca
+
+logger = logging.getLogger("funny.busca")
+
+TABELA_FTS_ATIVIDADES = "atividades_busca"
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos: "Memória Visual" -> "memoria visual"."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).lower().strip()
+
+
+def expressao_normalizada(coluna):
+    """`lower(f_unaccent(coluna))` — a mesma expressão dos índices do PostgreSQL."""
+    return func.lower(func.f_unaccent(coluna))
+
+
+def consulta_fts(termo: str) -> str:
+    """Termo do usuário -> query FTS5: cada palavra vira um prefixo entre aspas ("memo"* AND "jog"*)."""
+    palavras = re.findall(r"\w+", normalizar(termo))
+    return " AND ".join(f'"{p}"*' for p in palavras)
+
+
+def _atividades_postgresql(db: Session, termo: str, limite: int) -> List[Atividade]:
+    expr = expressao_normalizada(Atividade.titulo)
+    return list(db.execute(
+        select(Atividade)
+        .where(or_(
+            expr.contains(termo, autoescape=True),
+            literal(termo).op("<%")(expr),  # word_similarity acima do limiar (pg_trgm)
+        ))
+        .order_by(
+            case((expr.startswith(termo, autoescape=True), 0), else_=1),
+            func.word_similarity(termo, expr).desc(),
+            Atividade.titulo,
+        )
+        .limit(limite)
+    ).scalars())
+
+
+def _tem_fts(db: Session) -> bool:
+    conn = db.connection()
+    if "fts_atividades_ok" not in conn.info:
+        conn.info["fts_atividades_ok"] = inspect(conn).has_table(TABELA_FTS_ATIVIDADES)
+        if not conn.info["fts_atividades_ok"]:
+            logger.warning("Tabela %s não existe; busca de atividades sem índice (rode as migrations)", TABELA_FTS_ATIVIDADES)
+    return conn.info["fts_atividades_ok"]
+
+
+def _atividades_sqlite(db: Session, termo: str, limite: int) -> List[Atividade]:
+    if _tem_fts(db):
+        consulta = consulta_fts(termo)
+        if not consulta:
+            return []
+        ids = db.execute(
+            text(f"SELECT rowid FROM {TABELA_FTS_ATIVIDADES} WHERE {TABELA_FTS_ATIVIDADES} MATCH :q ORDER BY rank LIMIT :n"),
+            {"q": consulta, "n": limite},
+        ).scalars().all()
+        por_id = {a.id: a for a in db.query(Atividade).filter(Atividade.id.in_(ids))}
+        return [por_id[i] for i in ids if i in por_id]
+
+    # Sem FTS: varre a tabela (é pequena) e compara já normalizado
+    encontradas = [a for a in db.query(Atividade).order_by(Atividade.titulo) if termo in normalizar(a.titulo)]
+    encontradas.sort(key=lambda a: not normalizar(a.titulo).startswith(termo))
+    return encontradas[:limite]
+
+
+def buscar_atividades(db: Session, q: str, limite: int = 20) -> List[Atividade]:
+    """Atividades cujo título contém `q` (prefixos primeiro), ignorando caixa e acentos."""
+    termo = normalizar(q)
+    if not termo:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _atividades_postgresql(db, termo, limite)
+    return _atividades_sqlite(db, termo, limite)
+
+
+class IndiceNomes:
+    """Índice em memória (por processo) das palavras dos nomes das crianças, ordenado para bisect.
+
+    Reconstruído sob demanda quando expira (``BUSCA_INDICE_TTL_SECONDS``) ou depois
+    do commit de uma sessão que inseriu/alterou/removeu crianças pelo ORM neste
+    processo (rollback não invalida).
+    """
+
+    def __init__(self, ttl_segundos: float):
+        self.ttl_segundos = ttl_segundos
+        self._palavras: List[Tuple[str, int]] = []  # (palavra normalizada, crianca_id), ordenado
+        self._criancas: dict = {}  # crianca_id -> (nome normalizado, turma_id)
+        self._expira_em = 0.0
+        self._geracao = 0  # Incrementada a cada invalidação
+        self._lock = threading.Lock()
+
+    def invalidar(self, *args) -> None:
+        self._geracao += 1
+        self._expira_em = 0.0
+
+    def _carregar(self, db: Session) -> None:
+        geracao = self._geracao
+        palavras: List[Tuple[str, int]] = []
+        criancas = {}
+        for crianca_id, nome, turma_id in db.execute(select(Crianca.id, Crianca.nome, Crianca.turma_id)):
+            normalizado = normalizar(nome or "")
+            criancas[crianca_id] = (normalizado, turma_id)
+            palavras.extend((palavra, crianca_id) for palavra in set(normalizado.split()))
+        palavras.sort()
+        self._palavras, self._criancas = palavras, criancas
+        # Invalidado durante a leitura: o que foi lido pode estar velho, recarrega na próxima busca
+        if geracao == self._geracao:
+            self._expira_em = time.monotonic() + self.ttl_segundos
+
+    def buscar(self, db: Session, termo: str, turma_id: Optional[int], limite: int) -> List[int]:
+        """Ids das crianças em que cada palavra de `termo` é prefixo de alguma palavra do nome."""
+        palavras_termo = termo.split()
+        if not palavras_termo:
+            return []
+        with self._lock:
+            if time.monotonic() >= self._expira_em:
+                self._carregar(db)
+            palavras, criancas = self._palavras, self._criancas
+
+        # A palavra mais longa do termo restringe mais os candidatos
+        chave = max(palavras_termo, key=len)
+        inicio = bisect.bisect_left(palavras, (chave, -1))
+        candidatos = set()
+        for palavra, crianca_id in palavras[inicio:]:
+            if not palavra.startswith(chave):
+                break
+            candidatos.add(crianca_id)
+
+        encontrados = []
+        for crianca_id in candidatos:
+            nome, turma = criancas[crianca_id]
+            if turma_id is not None and turma != turma_id:
+                continue
+            palavras_nome = nome.split()
+            if all(any(p.startswith(t) for p in palavras_nome) for t in palavras_termo):
+                encontrados.append((not nome.startswith(termo), nome, crianca_id))
+        encontrados.sort()
+        return [crianca_id for _, _, crianca_id in encontrados[:limite]]
+
+
+indice_nomes_criancas = IndiceNomes(settings.busca_indice_ttl_seconds)
+
+
+def _crianca_alterada(mapper, connection, crianca: Crianca) -> None:
+    # Os eventos do mapper vêm no flush, antes do commit: invalidar aqui deixaria uma
+    # busca concorrente recarregar os nomes antigos; só invalida depois do commit
+    db = object_session(crianca)
+    if db is None:
+        indice_nomes_criancas.invalidar()
+        return
+    if db.info.get("indice_nomes_pendente"):
+        return
+    db.info["indice_nomes_pendente"] = True
+
+    def _apos_commit(session):
+        if session.info.pop("indice_nomes_pendente", False):
+            indice_nomes_criancas.invalidar()
+
+    def _apos_rollback(session, transacao):
+        session.info.pop("indice_nomes_pendente", None)
+
+    event.listen(db, "after_commit", _apos_commit, once=True)
+    event.listen(db, "after_soft_rollback", _apos_rollback, once=True)
+
+
+for _evento in ("after_insert", "after_update", "after_delete"):
+    event.listen(Crianca, _evento, _crianca_alterada)
+
+
+def _criancas_postgresql(db: Session, termo: str, turma_id: Optional[int], limite: int) -> List[Crianca]:
+    expr = expressao_normalizada(Crianca.nome)
+    query = select(Crianca).where(or_(
+        expr.contains(termo, autoescape=True),
+        literal(termo).op("<%")(expr),
+    ))
+    if turma_id is not None:
+        query = query.where(Crianca.turma_id == turma_id)
+    return list(db.execute(
+        query.order_by(
+            case(
+                (expr.startswith(termo, autoescape=True), 0),  # começa pelo termo
+                (expr.contains(" " + termo, autoescape=True), 1),  # alguma palavra começa pelo termo
+                else_=2,
+            ),
+            func.word_similarity(termo, expr).desc(),
+            Crianca.nome,
+        )
+        .limit(limite)
+    ).scalars())
+
+
+def buscar_criancas(db: Session, q: str, turma_id: Optional[int] = None, limite: int = 20) -> List[Crianca]:
+    """Crianças pelo nome, ignorando caixa e acentos; quem começa pelo termo vem primeiro."""
+    termo = " ".join(normalizar(q).split())
+    if not termo:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _criancas_postgresql(db, termo, turma_id, limite)
+    ids = indice_nomes_criancas.buscar(db, termo, turma_id, limite)
+    por_id = {c.id: c for c in db.query(Crianca).filter(Crianca.id.in_(ids))}
+    return [por_id[i] for i in ids if i in por_id]
@@ -0,0 +1,190 @@
+"""Cache no processo das tabelas de referência (atividades e diagnósticos).
+
+``registrar_minijogo`` procura a atividade (id e tipo de jogo) por
+(titulo, categoria) a cada partida e o cadastro/edição de crianças confere se
+o diagnóstico existe. São tabelas pequenas que quase não mudam, então as
+consultas passam por um cache read-through com TTL e tamanho máximo (LRU).
+
+Só entradas encontradas são cacheadas (uma atividade criada depois nunca fica
+"escondida" por um negativo). Toda escrita nessas tabelas chama ``invalidar``
+na transação: o cache local é limpo no commit e, no PostgreSQL, um
+``pg_notify`` (entregue só se a transação for confirmada) avisa os outros
+workers, que escutam o canal com ``LISTEN`` em uma thread iniciada no startup.
+No SQLite não há canal; escritas de outros processos aparecem após o TTL.
+"""
+import logging
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.atividade import Atividade
+from app.models.diagnostico import Diagnostico
+
+logger = logging.getLogger("funny.cache")
+
+CANAL_NOTIFY = "funny_cache_referencia"
+
+
+class CacheTTL:
+    """Dicionário com TTL e tamanho máximo (remove o menos usado), seguro entre threads."""
+
+    def __init__(self, max_itens: int, ttl_segundos: float):
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self._itens: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            valor, expira_em = item
+            if expira_em <= time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave: Hashable, valor: Any) -> None:
+        with self._lock:
+            self._itens[chave] = (valor, time.monotonic() + self.ttl_segundos)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+
+_caches: Dict[str, CacheTTL] = {
+    "atividades": CacheTTL(settings.cache_referencia_max_itens, settings.cache_referencia_ttl_seconds),
+    "diagnosticos": CacheTTL(settings.cache_referencia_max_itens, settings.cache_referencia_ttl_seconds),
+}
+
+
+class AtividadeRef(NamedTuple):
+    id: int
+    tipo_jogo: Optional[str]
+
+
+def atividade_ref(db: Session, titulo: str, categoria: str) -> Optional[AtividadeRef]:
+    """Id e tipo de jogo da atividade com esse título e categoria, ou None se não existir."""
+    cache = _caches["atividades"]
+    chave = (titulo, categoria)
+    encontrado = cache.get(chave)
+    if encontrado is not None:
+        return encontrado
+    row = db.query(Atividade.id, Atividade.tipo_jogo).filter(
+        Atividade.titulo == titulo,
+        Atividade.categoria == categoria,
+    ).order_by(Atividade.id).first()
+    if row is None:
+        return None
+    encontrado = AtividadeRef(row.id, row.tipo_jogo)
+    cache.set(chave, encontrado)
+    return encontrado
+
+
+def diagnostico_existe(db: Session, diagnostico_id: int) -> bool:
+    cache = _caches["diagnosticos"]
+    if cache.get(diagnostico_id) is not None:
+        return True
+    existe = db.query(Diagnostico.id).filter(Diagnostico.id == diagnostico_id).scalar() is not None
+    if existe:
+        cache.set(diagnostico_id, True)
+    return existe
+
+
+def limpar(*tabelas: str) -> None:
+    """Esvazia o cache local das tabelas (todas, se nenhuma for informada)."""
+    for tabela in tabelas or tuple(_caches):
+        cache = _caches.get(tabela)
+        if cache is not None:
+            cache.clear()
+
+
+def invalidar(db: Session, tabela: str) -> None:
+    """Marca `tabela` como alterada na transação atual (chamar antes do commit)."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_notify(:canal, :tabela)"), {"canal": CANAL_NOTIFY, "tabela": tabela})
+    pendentes = db.info.setdefault("cache_referencia_pendentes", set())
+    if not pendentes:
+        def _apos_commit(session):
+            limpar(*session.info.pop("cache_referencia_pendentes", ()))
+
+        def _apos_rollback(session, transacao):
+            session.info.pop("cache_referencia_pendentes", None)
+
+        event.listen(db, "after_commit", _apos_commit, once=True)
+        event.listen(db, "after_soft_rollback", _apos_rollback, once=True)
+    pendentes.add(tabela)
+
+
+class OuvinteInvalidacao(threading.Thread):
+    """Thread que faz LISTEN no canal de invalidação e limpa o cache local (só PostgreSQL)."""
+
+    INTERVALO_RECONEXAO = 5.0
+
+    def __init__(self, engine: Engine):
+        super().__init__(name="cache-referencia-listen", daemon=True)
+        self.engine = engine
+        self._parar = threading.Event()
+
+    def parar(self) -> None:
+        self._parar.set()
+
+    def _conectar(self):
+        # Conexão dedicada fora do pool: fica presa no LISTEN enquanto a API roda
+        dialect = self.engine.dialect
+        cargs, cparams = dialect.create_connect_args(self.engine.url)
+        conn = dialect.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {CANAL_NOTIFY}")
+        return conn
+
+    def run(self) -> None:
+        while not self._parar.is_set():
+            conn = None
+            try:
+                conn = self._conectar()
+                # Notificações perdidas enquanto estava desconectado
+                limpar()
+                while not self._parar.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notificacao = conn.notifies.pop(0)
+                        logger.debug("Invalidação recebida: %s", notificacao.payload)
+                        limpar(notificacao.payload)
+            except Exception:
+                logger.exception("Falha no LISTEN de invalidação do cache; reconectando")
+                self._parar.wait(self.INTERVALO_RECONEXAO)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+def iniciar_ouvinte(engine: Engine) -> Optional[OuvinteInvalidacao]:
+    """Inicia a thread de LISTEN no PostgreSQL; no SQLite não faz nada e retorna None."""
+    if engine.dialect.name != "postgresql":
+        return None
+    ouvinte = OuvinteInvalidacao(engine)
+    ouvinte.start()
+    return ouvinte
@@ -0,0 +1,77 @@
+import time
+from typing import Any, Dict, Optional
+
+
+class CircuitBreaker:
+    """Circuit breaker simples (por processo) para dependências externas.
+
+    - fechado: requisições passam; falhas consecutivas são contadas
+    - aberto: após `failure_threshold` falhas seguidas, recusa tudo por `reset_timeout` segundos
+    - meio-aberto: passado o `reset_timeout`, deixa passar uma requisição de teste;
+      sucesso fecha o circuito, falha reabre; se a requisição de teste terminar sem
+      resultado (cancelada, erro inesperado), `release_trial` libera a vaga para outra
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._last_failure: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._opened_at is not None and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def retry_after(self) -> float:
+        """Segundos até o circuito aceitar uma nova tentativa (0 se já aceita)."""
+        if self.state != self.OPEN or self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """Libera a vaga de teste do meio-aberto quando a tentativa acabou sem sucesso nem falha registrados."""
+        if self._state == self.HALF_OPEN:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self, reason: str = "") -> None:
+        self._consecutive_failures += 1
+        self._last_failure = reason or None
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado atual para exposição em endpoints de health."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "last_failure": self._last_failure,
+        }
@@ -0,0 +1,105 @@
+"""Exportação em streaming de progressos (CSV ou NDJSON).
+
+As linhas são lidas com ``yield_per`` (cursor do lado do servidor no
+PostgreSQL) e serializadas em blocos, então a memória do worker fica constante
+independente do tamanho da exportação. Com ``gzip`` o mesmo fluxo passa por um
+compressor incremental.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.atividade import Atividade
+from app.models.crianca import Crianca
+from app.models.progresso import Progresso
+from app.models.progresso_tentativa import ProgressoTentativa
+
+LINHAS_POR_BLOCO = 1000
+
+
+def _consulta(turma_id: Optional[int], since: Optional[datetime], historico: bool):
+    tabela = ProgressoTentativa if historico else Progresso
+    query = (
+        select(
+            tabela.id,
+            tabela.crianca_id,
+            Crianca.nome.label("crianca_nome"),
+            Crianca.turma_id,
+            tabela.atividade_id,
+            Atividade.titulo.label("atividade_titulo"),
+            Atividade.categoria.label("atividade_categoria"),
+            tabela.pontuacao,
+            tabela.concluida,
+            tabela.tempo_segundos,
+            tabela.observacoes,
+            tabela.created_at,
+        )
+        .join(Crianca, Crianca.id == tabela.crianca_id)
+        .join(Atividade, Atividade.id == tabela.atividade_id)
+        .order_by(tabela.id)
+    )
+    if turma_id is not None:
+        query = query.where(Crianca.turma_id == turma_id)
+    if since is not None:
+        query = query.where(tabela.created_at >= since)
+    return query.execution_options(yield_per=LINHAS_POR_BLOCO)
+
+
+def _valor(valor):
+    return valor.isoformat() if isinstance(valor, datetime) else valor
+
+
+def _blocos_texto(turma_id: Optional[int], since: Optional[datetime], formato: str, historico: bool) -> Iterator[bytes]:
+    # Sessão própria: o gerador é consumido depois que o endpoint retorna
+    db = SessionLocal()
+    try:
+        result = db.execute(_consulta(turma_id, since, historico))
+        colunas = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if formato == "csv" else None
+        if writer:
+            writer.writerow(colunas)
+
+        for particao in result.partitions():
+            for row in particao:
+                if writer:
+                    writer.writerow(_valor(v) for v in row)
+                else:
+                    buffer.write(json.dumps(dict(zip(colunas, map(_valor, row))), ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+        resto = buffer.getvalue()
+        if resto:
+            yield resto.encode("utf-8")
+    finally:
+        db.close()
+
+
+def _gzip(blocos: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: formato gzip
+    for bloco in blocos:
+        comprimido = compressor.compress(bloco)
+        if comprimido:
+            yield comprimido
+    yield compressor.flush()
+
+
+def exportar_progressos(
+    turma_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    formato: str = "csv",
+    gzip: bool = False,
+    historico: bool = False,
+) -> Iterator[bytes]:
+    """Gerador de bytes para `StreamingResponse`."""
+    blocos = _blocos_texto(turma_id, since, formato, historico)
+    return _gzip(blocos) if gzip else blocos
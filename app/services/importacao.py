@@ -0,0 +1,140 @@
+"""Importação em lote (CSV) de responsáveis, turmas e crianças.
+
+Usado por ``POST /importacao/{entidade}`` e ``python -m app.cli.importar``.
+O CSV é lido linha a linha; cada linha é validada com o mesmo schema do
+endpoint de criação e as chaves estrangeiras são conferidas contra conjuntos de
+ids carregados uma única vez no início (em vez de uma query por linha). As
+linhas válidas são inseridas em blocos com ``executemany`` e tudo é gravado em
+uma única transação; as inválidas voltam no relatório com o número da linha.
+
+Ordem para uma escola nova: responsaveis → turmas → criancas (os ids
+referenciados precisam existir no banco).
+"""
+import csv
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.crianca import Crianca
+from app.models.diagnostico import Diagnostico
+from app.models.responsavel import Responsavel
+from app.models.turma import Turma
+from app.schemas.crianca import CriancaCreate
+from app.schemas.responsavel import ResponsavelCreate
+from app.schemas.turma import TurmaCreate
+from app.services.busca import indice_nomes_criancas
+from app.services.versoes import TABELAS_VERSIONADAS, incrementar_versao
+
+TAMANHO_LOTE = 1000
+MAX_ERROS = 1000  # Erros detalhados no relatório; o total é sempre contado
+
+
+@dataclass(frozen=True)
+class Entidade:
+    modelo: Type[Base]
+    schema: Type[BaseModel]
+    # coluna -> modelo referenciado
+    chaves_estrangeiras: Dict[str, Type[Base]] = field(default_factory=dict)
+
+
+ENTIDADES: Dict[str, Entidade] = {
+    "responsaveis": Entidade(Responsavel, ResponsavelCreate),
+    "turmas": Entidade(Turma, TurmaCreate, {"responsavel_id": Responsavel}),
+    "criancas": Entidade(Crianca, CriancaCreate, {"turma_id": Turma, "diagnostico_id": Diagnostico}),
+}
+
+
+@dataclass
+class ResultadoImportacao:
+    entidade: str
+    total_linhas: int = 0
+    importadas: int = 0
+    com_erro: int = 0
+    dry_run: bool = False
+    erros: List[Dict[str, Any]] = field(default_factory=list)
+
+    def registrar_erro(self, linha: int, erro: str) -> None:
+        self.com_erro += 1
+        if len(self.erros) < MAX_ERROS:
+            self.erros.append({"linha": linha, "erro": erro})
+
+
+def _mensagem_validacao(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in erro['loc']) or 'linha'}: {erro['msg']}" for erro in exc.errors()
+    )
+
+
+def _ids_existentes(db: Session, entidade: Entidade) -> Dict[str, Set[int]]:
+    return {
+        coluna: set(db.execute(select(modelo.id)).scalars())
+        for coluna, modelo in entidade.chaves_estrangeiras.items()
+    }
+
+
+def importar_csv(
+    db: Session,
+    nome_entidade: str,
+    linhas: Iterable[str],
+    dry_run: bool = False,
+    tamanho_lote: int = TAMANHO_LOTE,
+) -> ResultadoImportacao:
+    """Valida e importa o CSV (iterável de linhas de texto, com cabeçalho).
+
+    Não levanta exceção por linha inválida: o erro entra no resultado e a
+    linha é ignorada. Com `dry_run` nada é gravado.
+    """
+    entidade = ENTIDADES[nome_entidade]
+    resultado = ResultadoImportacao(entidade=nome_entidade, dry_run=dry_run)
+    ids_validos = _ids_existentes(db, entidade)
+    tabela = entidade.modelo.__table__
+    lote: List[Dict[str, Any]] = []
+
+    reader = csv.DictReader(linhas)
+    for linha in reader:
+        numero = reader.line_num  # Número da linha física no arquivo (cabeçalho = 1)
+        resultado.total_linhas += 1
+        if None in linha:
+            resultado.registrar_erro(numero, "mais colunas que o cabeçalho")
+            continue
+        dados = {coluna.strip(): (valor.strip() or None) if valor is not None else None for coluna, valor in linha.items()}
+        try:
+            registro = entidade.schema.model_validate(dados).model_dump()
+        except ValidationError as exc:
+            resultado.registrar_erro(numero, _mensagem_validacao(exc))
+            continue
+
+        fk_invalida = next(
+            (coluna for coluna, ids in ids_validos.items() if registro.get(coluna) is not None and registro[coluna] not in ids),
+            None,
+        )
+        if fk_invalida:
+            resultado.registrar_erro(numero, f"{fk_invalida}={registro[fk_invalida]} não existe")
+            continue
+
+        lote.append(registro)
+        if len(lote) >= tamanho_lote:
+            if not dry_run:
+                db.execute(insert(tabela), lote)
+            resultado.importadas += len(lote)
+            lote = []
+
+    if lote:
+        if not dry_run:
+            db.execute(insert(tabela), lote)
+        resultado.importadas += len(lote)
+
+    if dry_run:
+        db.rollback()
+    else:
+        if resultado.importadas and nome_entidade in TABELAS_VERSIONADAS:
+            incrementar_versao(db, nome_entidade)
+        db.commit()
+        if resultado.importadas and nome_entidade == "criancas":
+            # insert em lote não dispara os eventos do ORM que invalidam o índice da busca
+            indice_nomes_criancas.invalidar()
+    return resultado
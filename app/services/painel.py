@@ -0,0 +1,207 @@
+"""Agregados do painel da turma (criança × categoria).
+
+``progresso_resumo`` guarda, por (crianca_id, categoria), média de pontuação,
+quantidade de mini-jogos, melhor tempo e data da última atividade. Assim o
+painel lê O(crianças × categorias) linhas em vez de todo o histórico.
+
+- PostgreSQL: é uma *materialized view* (migration 0007), atualizada com
+  ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` por uma tarefa periódica
+  (``PAINEL_REFRESH_SECONDS``) e pelo comando ``python -m app.cli.painel``.
+- SQLite: é uma tabela comum, mantida incrementalmente. Um listener
+  ``after_flush`` na sessão recalcula só as crianças cujos progressos mudaram,
+  na mesma transação.
+
+A tabela fica em um ``MetaData`` próprio para que ``Base.metadata.create_all``
+(e o autogenerate do Alembic) não tentem criá-la como tabela no PostgreSQL.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table, event, func, insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.models.atividade import Atividade
+from app.models.crianca import Crianca
+from app.models.progresso import Progresso
+
+logger = logging.getLogger("funny.painel")
+
+painel_metadata = MetaData()
+
+progresso_resumo = Table(
+    "progresso_resumo",
+    painel_metadata,
+    Column("crianca_id", Integer, primary_key=True),
+    Column("categoria", String, primary_key=True),
+    Column("media_pontuacao", Float, nullable=False),
+    Column("total", Integer, nullable=False),
+    Column("melhor_tempo_segundos", Integer, nullable=True),
+    Column("ultima_atividade", DateTime, nullable=True),
+)
+
+# Lock consultivo para que só um worker do gunicorn faça o REFRESH por vez
+_ADVISORY_LOCK_ID = 0x70A1E1
+
+# Resultado de has_table guardado em conn.info (positivo ou negativo), uma verificação por conexão
+_CHAVE_TABELA_OK = "painel_tabela_ok"
+
+
+class PainelIndisponivel(Exception):
+    """``progresso_resumo`` não existe (migrations não aplicadas)"""
+
+
+def _tem_resumo(conn: Connection) -> bool:
+    if _CHAVE_TABELA_OK not in conn.info:
+        conn.info[_CHAVE_TABELA_OK] = inspect(conn).has_table(progresso_resumo.name)
+        if not conn.info[_CHAVE_TABELA_OK]:
+            logger.warning("Tabela progresso_resumo não existe; rode as migrations ou `python -m app.cli.painel`")
+    return conn.info[_CHAVE_TABELA_OK]
+
+
+def _select_agregados(crianca_ids: Optional[Iterable[int]] = None):
+    query = (
+        select(
+            Progresso.crianca_id,
+            Atividade.categoria,
+            func.avg(Progresso.pontuacao),
+            func.count(Progresso.id),
+            func.min(Progresso.tempo_segundos),
+            func.max(Progresso.created_at),
+        )
+        .join(Atividade, Atividade.id == Progresso.atividade_id)
+        .group_by(Progresso.crianca_id, Atividade.categoria)
+    )
+    if crianca_ids is not None:
+        query = query.where(Progresso.crianca_id.in_(list(crianca_ids)))
+    return query
+
+
+def atualizar_criancas(conn: Connection, crianca_ids: Iterable[int]) -> None:
+    """Recalcula as linhas do resumo das crianças informadas (somente SQLite)."""
+    crianca_ids = sorted(set(crianca_ids))
+    if not crianca_ids:
+        return
+    conn.execute(progresso_resumo.delete().where(progresso_resumo.c.crianca_id.in_(crianca_ids)))
+    conn.execute(insert(progresso_resumo).from_select(
+        [c.name for c in progresso_resumo.columns], _select_agregados(crianca_ids)
+    ))
+
+
+def reconstruir(conn: Connection) -> None:
+    """Recalcula o resumo inteiro: REFRESH da view no PostgreSQL, reconstrução da tabela no SQLite."""
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY progresso_resumo"))
+        return
+    progresso_resumo.create(conn, checkfirst=True)
+    conn.info[_CHAVE_TABELA_OK] = True
+    conn.execute(progresso_resumo.delete())
+    conn.execute(insert(progresso_resumo).from_select(
+        [c.name for c in progresso_resumo.columns], _select_agregados()
+    ))
+
+
+def refresh_painel(engine: Engine) -> bool:
+    """Atualiza o resumo completo; retorna False se outro processo já está atualizando."""
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            if not conn.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": _ADVISORY_LOCK_ID}).scalar():
+                return False
+        reconstruir(conn)
+    return True
+
+
+async def refresh_periodico(engine: Engine) -> None:
+    """Loop de REFRESH da materialized view (iniciado no startup da API, só no PostgreSQL)."""
+    intervalo = settings.painel_refresh_seconds
+    while True:
+        await asyncio.sleep(intervalo)
+        try:
+            atualizado = await asyncio.to_thread(refresh_painel, engine)
+            logger.debug("Refresh do painel %s", "concluído" if atualizado else "ignorado (lock ocupado)")
+        except Exception:
+            logger.exception("Falha no refresh periódico do painel")
+
+
+def _criancas_alteradas(session: Session) -> Set[int]:
+    ids: Set[int] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Progresso):
+            if obj.crianca_id is not None:
+                ids.add(obj.crianca_id)
+            # Progresso movido de criança: a criança antiga também muda
+            ids.update(v for v in inspect(obj).attrs.crianca_id.history.deleted if v is not None)
+    return ids
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    conn = session.connection()
+    if conn.dialect.name == "postgresql":
+        return
+    ids = _criancas_alteradas(session)
+    if not ids:
+        return
+    if _tem_resumo(conn):
+        atualizar_criancas(conn, ids)
+
+
+def instrument_session(factory: sessionmaker) -> None:
+    """Mantém o resumo atualizado a cada flush de progressos (no-op no PostgreSQL)."""
+    if not event.contains(factory, "after_flush", _after_flush):
+        event.listen(factory, "after_flush", _after_flush)
+
+
+def painel_turma(db: Session, turma_id: int) -> List[Dict[str, Any]]:
+    """Uma entrada por criança da turma, com os agregados por categoria, ordenadas pela média geral.
+
+    Levanta `PainelIndisponivel` se o resumo ainda não foi criado.
+    """
+    if not _tem_resumo(db.connection()):
+        raise PainelIndisponivel("Resumo do painel indisponível; rode as migrations ou `python -m app.cli.painel`")
+    rows = db.execute(
+        select(
+            Crianca.id,
+            Crianca.nome,
+            progresso_resumo.c.categoria,
+            progresso_resumo.c.media_pontuacao,
+            progresso_resumo.c.total,
+            progresso_resumo.c.melhor_tempo_segundos,
+            progresso_resumo.c.ultima_atividade,
+        )
+        .outerjoin(progresso_resumo, progresso_resumo.c.crianca_id == Crianca.id)
+        .where(Crianca.turma_id == turma_id)
+    ).all()
+
+    criancas: Dict[int, Dict[str, Any]] = {}
+    somas: Dict[int, float] = {}
+    for row in rows:
+        crianca = criancas.setdefault(row.id, {
+            "crianca_id": row.id,
+            "nome": row.nome,
+            "categorias": {},
+            "total": 0,
+            "media_geral": None,
+            "ultima_atividade": None,
+        })
+        if row.categoria is None:
+            continue
+        crianca["categorias"][row.categoria] = {
+            "media_pontuacao": round(row.media_pontuacao, 2),
+            "total": row.total,
+            "melhor_tempo_segundos": row.melhor_tempo_segundos,
+            "ultima_atividade": row.ultima_atividade,
+        }
+        crianca["total"] += row.total
+        somas[row.id] = somas.get(row.id, 0.0) + row.media_pontuacao * row.total
+        if row.ultima_atividade and (crianca["ultima_atividade"] is None or row.ultima_atividade > crianca["ultima_atividade"]):
+            crianca["ultima_atividade"] = row.ultima_atividade
+
+    for crianca_id, soma in somas.items():
+        criancas[crianca_id]["media_geral"] = round(soma / criancas[crianca_id]["total"], 2)
+
+    return sorted(
+        criancas.values(),
+        key=lambda c: (c["media_geral"] is None, -(c["media_geral"] or 0), c["nome"]),
+    )
@@ -0,0 +1,122 @@
+"""Partições mensais (PostgreSQL) das tabelas de histórico.
+
+As tabelas em ``TABELAS_PARTICIONADAS`` são ``PARTITION BY RANGE (created_at)``
+com uma partição por mês (``<tabela>_AAAA_MM``) e uma partição ``_default``
+que recebe o que cair fora dos meses já criados. ``garantir_particoes`` cria
+as partições dos próximos meses; roda no startup da API e pode ser agendado
+via ``python -m app.cli.particoes``. Em outros bancos é no-op.
+
+A retenção (``python -m app.cli.retencao``) tira da tabela as partições mais
+antigas que ``RETENCAO_MESES``: exporta para CSV gzip e descarta, ou move para
+o schema ``arquivo``. Consultas com filtro em ``created_at`` só leem as
+partições do período (partition pruning).
+"""
+import csv
+import gzip
+import logging
+import re
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger("funny.particoes")
+
+TABELAS_PARTICIONADAS = ("progresso_tentativas",)
+
+
+def inicio_mes(dia: date) -> date:
+    return dia.replace(day=1)
+
+
+def proximo_mes(mes: date) -> date:
+    return date(mes.year + (mes.month // 12), mes.month % 12 + 1, 1)
+
+
+def nome_particao(tabela: str, mes: date) -> str:
+    return f"{tabela}_{mes.year:04d}_{mes.month:02d}"
+
+
+def criar_particao(conn: Connection, tabela: str, mes: date) -> str:
+    nome = nome_particao(tabela, mes)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {nome} PARTITION OF {tabela} "
+        f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{proximo_mes(mes).isoformat()}')"
+    ))
+    return nome
+
+
+def garantir_particoes(conn: Connection, meses_a_frente: int = 3) -> List[str]:
+    """Cria (se faltarem) as partições do mês atual e dos próximos `meses_a_frente` meses."""
+    if conn.dialect.name != "postgresql":
+        return []
+    criadas = []
+    for tabela in TABELAS_PARTICIONADAS:
+        mes = inicio_mes(date.today())
+        for _ in range(meses_a_frente + 1):
+            criadas.append(criar_particao(conn, tabela, mes))
+            mes = proximo_mes(mes)
+    logger.debug("Partições garantidas: %s", ", ".join(criadas))
+    return criadas
+
+
+def subtrair_meses(mes: date, meses: int) -> date:
+    total = mes.year * 12 + (mes.month - 1) - meses
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def limite_retencao(manter_meses: int) -> date:
+    """Primeiro dia do mês mais antigo que ainda fica na tabela quente."""
+    return subtrair_meses(inicio_mes(date.today()), manter_meses)
+
+
+def listar_particoes(conn: Connection, tabela: str) -> List[Tuple[str, date]]:
+    """Partições mensais (nome, primeiro dia do mês) da tabela, em ordem cronológica."""
+    nomes = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :tabela"
+    ), {"tabela": tabela}).scalars()
+    padrao = re.compile(rf"^{re.escape(tabela)}_(\d{{4}})_(\d{{2}})$")
+    particoes = []
+    for nome in nomes:
+        match = padrao.match(nome)
+        if match:
+            particoes.append((nome, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(particoes, key=lambda p: p[1])
+
+
+def particoes_expiradas(conn: Connection, tabela: str, manter_meses: int) -> List[Tuple[str, date]]:
+    """Partições cujo mês inteiro é anterior ao limite de retenção."""
+    limite = limite_retencao(manter_meses)
+    return [(nome, mes) for nome, mes in listar_particoes(conn, tabela) if proximo_mes(mes) <= limite]
+
+
+def exportar_csv_gz(conn: Connection, consulta: str, destino: Path, parametros: Optional[dict] = None) -> int:
+    """Grava o resultado da consulta em CSV compactado (gzip), em streaming. Retorna o número de linhas."""
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    result = conn.execution_options(stream_results=True, yield_per=1000).execute(text(consulta), parametros or {})
+    linhas = 0
+    with gzip.open(destino, "wt", newline="", encoding="utf-8") as arquivo:
+        writer = csv.writer(arquivo)
+        writer.writerow(result.keys())
+        for row in result:
+            writer.writerow(row)
+            linhas += 1
+    return linhas
+
+
+def arquivar_particao(conn: Connection, tabela: str, nome: str) -> str:
+    """Desanexa a partição e move para o schema `arquivo` (continua consultável, fora da tabela quente)."""
+    conn.execute(text(f"ALTER TABLE {tabela} DETACH PARTITION {nome}"))
+    conn.execute(text("CREATE SCHEMA IF NOT EXISTS arquivo"))
+    conn.execute(text(f"ALTER TABLE {nome} SET SCHEMA arquivo"))
+    return f"arquivo.{nome}"
+
+
+def descartar_particao(conn: Connection, tabela: str, nome: str) -> None:
+    conn.execute(text(f"ALTER TABLE {tabela} DETACH PARTITION {nome}"))
+    conn.execute(text(f"DROP TABLE {nome}"))
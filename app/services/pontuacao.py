@@ -0,0 +1,107 @@
+"""Regras de pontuação dos mini-jogos.
+
+Cada atividade tem um ``tipo_jogo`` (coluna em ``atividades``) que aponta para
+uma ``RegraPontuacao`` em ``REGRAS``. As regras são só dados (limiar de
+movimentos, penalidade, escala de entrada...), aplicados da mesma forma:
+
+- ``calcular``: uma tentativa, no ``registrar_minijogo``;
+- ``calcular_lote``: arrays NumPy, para re-pontuar o histórico
+  (``python -m app.cli.repontuar``) depois de mudar uma regra.
+
+Jogo novo com regra própria = nova entrada em ``REGRAS`` (e o ``tipo_jogo``
+correspondente nas atividades), sem mexer no endpoint.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+TIPO_PADRAO = "padrao"
+
+
+@dataclass(frozen=True)
+class RegraPontuacao:
+    """Nota final (0 a ``nota_maxima``) a partir da pontuação enviada e/ou dos movimentos.
+
+    Ordem de aplicação:
+    1. com ``movimentos_sem_penalidade`` definido e movimentos informados:
+       ``nota_maxima - penalidade_por_movimento * movimentos_excedentes`` (mínimo 0);
+    2. sem pontuação enviada: ``pontuacao_padrao``;
+    3. pontuação em ``(nota_maxima, escala_entrada]``: reescalada para ``0..nota_maxima``
+       (ex.: 85 numa escala 0–100 vira 8,5);
+    4. senão, a pontuação enviada como está.
+    """
+    nome: str
+    descricao: str = ""
+    nota_maxima: float = 10.0
+    movimentos_sem_penalidade: Optional[int] = None
+    penalidade_por_movimento: float = 0.0
+    escala_entrada: Optional[float] = None
+    pontuacao_padrao: float = 0.0
+
+    def calcular(self, pontuacao: Optional[float], movimentos: Optional[int] = None) -> float:
+        # NaN vale como "não informado", igual a `calcular_lote`
+        if movimentos is not None and math.isnan(movimentos):
+            movimentos = None
+        if pontuacao is not None and math.isnan(pontuacao):
+            pontuacao = None
+        if self.movimentos_sem_penalidade is not None and movimentos is not None:
+            excedentes = max(0, int(movimentos) - self.movimentos_sem_penalidade)
+            return max(0.0, self.nota_maxima - self.penalidade_por_movimento * excedentes)
+        if pontuacao is None:
+            return self.pontuacao_padrao
+        pontuacao = float(pontuacao)
+        if self.escala_entrada is not None and self.nota_maxima < pontuacao <= self.escala_entrada:
+            return pontuacao * self.nota_maxima / self.escala_entrada
+        return pontuacao
+
+    def calcular_lote(self, pontuacoes, movimentos):
+        """Versão vetorizada de `calcular`: arrays float (NaN = não informado) -> array de notas."""
+        import numpy as np
+
+        pontuacoes = np.asarray(pontuacoes, dtype=np.float64)
+        movimentos = np.asarray(movimentos, dtype=np.float64)
+        notas = pontuacoes
+        if self.escala_entrada is not None:
+            reescalar = (notas > self.nota_maxima) & (notas <= self.escala_entrada)
+            notas = np.where(reescalar, notas * self.nota_maxima / self.escala_entrada, notas)
+        notas = np.where(np.isnan(pontuacoes), self.pontuacao_padrao, notas)
+        if self.movimentos_sem_penalidade is not None:
+            excedentes = np.maximum(0.0, np.floor(movimentos) - self.movimentos_sem_penalidade)
+            por_movimentos = np.maximum(0.0, self.nota_maxima - self.penalidade_por_movimento * excedentes)
+            notas = np.where(np.isnan(movimentos), notas, por_movimentos)
+        return notas
+
+
+REGRAS: Dict[str, RegraPontuacao] = {
+    TIPO_PADRAO: RegraPontuacao(
+        nome=TIPO_PADRAO,
+        descricao="Usa a pontuação enviada pelo front (0 se ausente)",
+    ),
+    "memoria": RegraPontuacao(
+        nome="memoria",
+        descricao="Jogo da Memória: 10 até 8 movimentos, -0,1 por movimento extra; sem movimentos, aceita 0–100",
+        movimentos_sem_penalidade=8,
+        penalidade_por_movimento=0.1,
+        escala_entrada=100.0,
+        pontuacao_padrao=10.0,
+    ),
+}
+
+# Trechos do título que identificam o tipo de jogo de atividades antigas/criadas pelo front
+_PALAVRAS_TIPO = {
+    "memoria": ("memória", "memoria", "memory"),
+}
+
+
+def regra(tipo_jogo: Optional[str]) -> RegraPontuacao:
+    """Regra do tipo de jogo; tipos ausentes ou desconhecidos usam a padrão."""
+    return REGRAS.get(tipo_jogo or TIPO_PADRAO, REGRAS[TIPO_PADRAO])
+
+
+def inferir_tipo_jogo(titulo: Optional[str]) -> Optional[str]:
+    """Tipo de jogo pelo título; usado só ao criar a atividade (depois fica gravado nela)."""
+    titulo = (titulo or "").lower()
+    for tipo, palavras in _PALAVRAS_TIPO.items():
+        if any(palavra in titulo for palavra in palavras):
+            return tipo
+    return None
@@ -0,0 +1,170 @@
+"""Gerador local (determinístico) de relatórios.
+
+Produz `RelatorioCriancaResponse` / `RelatorioTurmaResponse` completos a partir
+dos mesmos dados preparados para a IA (`_prepare_*_data`), trocando a narrativa
+do LLM por textos montados a partir de templates. Roda em milissegundos e não
+depende da OpenAI, então serve tanto para quem só precisa dos números quanto
+como fallback quando a IA está indisponível.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+
+from app.schemas.relatorio_ia import (
+    DadosCriancaParaIA,
+    DadosTurmaParaIA,
+    RelatorioCriancaResponse,
+    RelatorioTurmaResponse,
+)
+
+CATEGORIAS = ["Matemáticas", "Português", "Lógica", "Cotidiano"]
+
+# Variação mínima (em pontos, do início ao fim da série) para considerar tendência
+LIMIAR_TENDENCIA = 1.0
+MIN_PONTOS_TENDENCIA = 4
+
+
+def _nivel(media: float) -> str:
+    if media >= 8:
+        return "excelente"
+    if media >= 6:
+        return "bom"
+    if media >= 4:
+        return "em desenvolvimento"
+    return "que precisa de apoio"
+
+
+def detectar_tendencia(pontuacoes: List[float]) -> Dict[str, Any]:
+    """Classifica a trajetória de uma série de pontuações (em ordem cronológica).
+
+    Usa a inclinação da reta de mínimos quadrados; a variação estimada do
+    primeiro ao último ponto decide entre "melhora", "queda" e "estável".
+    """
+    n = len(pontuacoes)
+    if n < MIN_PONTOS_TENDENCIA:
+        return {"direcao": "insuficiente", "inclinacao": None, "pontos": n}
+    media_x = (n - 1) / 2
+    media_y = sum(pontuacoes) / n
+    cov = sum((i - media_x) * (y - media_y) for i, y in enumerate(pontuacoes))
+    var = sum((i - media_x) ** 2 for i in range(n))
+    inclinacao = cov / var
+    variacao = inclinacao * (n - 1)
+    if variacao >= LIMIAR_TENDENCIA:
+        direcao = "melhora"
+    elif variacao <= -LIMIAR_TENDENCIA:
+        direcao = "queda"
+    else:
+        direcao = "estável"
+    return {"direcao": direcao, "inclinacao": round(inclinacao, 4), "pontos": n}
+
+
+def _texto_tendencia(tendencia: Dict[str, Any]) -> str:
+    return {
+        "melhora": "As pontuações mais recentes mostram tendência de melhora.",
+        "queda": "As pontuações mais recentes mostram tendência de queda e merecem atenção.",
+        "estável": "As pontuações se mantêm estáveis ao longo do período.",
+    }.get(tendencia["direcao"], "Ainda não há partidas suficientes para identificar uma tendência.")
+
+
+def relatorio_crianca_local(dados: DadosCriancaParaIA, periodo_analisado: str) -> RelatorioCriancaResponse:
+    """Monta o relatório individual sem IA."""
+    stats = dados.resumo_estatisticas
+    media_por_categoria = stats.get("media_por_categoria", {})
+    tempo_por_categoria = stats.get("tempo_medio_por_categoria", {})
+
+    # Progressos já vêm em ordem de criação (id crescente)
+    serie = [p["pontuacao"] for p in sorted(dados.progressos, key=lambda p: p["id"]) if p.get("pontuacao") is not None]
+    tendencia = detectar_tendencia(serie)
+
+    contagem_por_categoria: Dict[str, int] = defaultdict(int)
+    for p in dados.progressos:
+        if p.get("atividade_categoria"):
+            contagem_por_categoria[p["atividade_categoria"]] += 1
+
+    desempenho_por_categoria = {}
+    for categoria in CATEGORIAS:
+        if categoria not in media_por_categoria:
+            desempenho_por_categoria[categoria] = f"Nenhum mini-jogo de {categoria} registrado no período."
+            continue
+        media = media_por_categoria[categoria]
+        texto = (
+            f"Desempenho {_nivel(media)} em {categoria}: média {media:.1f}/10 "
+            f"em {contagem_por_categoria[categoria]} mini-jogo(s)"
+        )
+        tempo = tempo_por_categoria.get(categoria)
+        if tempo:
+            texto += f", com tempo médio de {tempo['minutos']:.1f} min"
+        desempenho_por_categoria[categoria] = texto + "."
+
+    total = stats.get("total_progressos", 0)
+    if total == 0:
+        resumo = f"{dados.nome} ainda não possui mini-jogos registrados no período analisado."
+    else:
+        categorias_ordenadas = sorted(media_por_categoria.items(), key=lambda kv: kv[1], reverse=True)
+        paragrafos = [
+            f"{dados.nome} ({dados.idade} anos, diagnóstico: {dados.diagnostico}) realizou {total} mini-jogo(s), "
+            f"com média geral de {stats.get('media_pontuacao', 0):.1f}/10 e taxa de conclusão de "
+            f"{stats.get('taxa_conclusao', 0):.0f}%. {_texto_tendencia(tendencia)}"
+        ]
+        if categorias_ordenadas:
+            melhor, pior = categorias_ordenadas[0], categorias_ordenadas[-1]
+            texto = f"O melhor desempenho é em {melhor[0]} (média {melhor[1]:.1f})"
+            if pior[0] != melhor[0]:
+                texto += f", e {pior[0]} (média {pior[1]:.1f}) é a categoria com mais espaço para evolução"
+            paragrafos.append(texto + ".")
+        resumo = "\n\n".join(paragrafos)
+
+    return RelatorioCriancaResponse(
+        crianca_id=dados.id,
+        nome_crianca=dados.nome,
+        idade=dados.idade,
+        diagnostico=dados.diagnostico,
+        resumo_geral={
+            "total_mini_jogos": total,
+            "taxa_sucesso": round(stats.get("taxa_conclusao", 0), 2),
+            "media_pontuacao": stats.get("media_pontuacao", 0),
+            "tempo_medio_minutos": stats.get("tempo_medio_minutos"),
+            "tendencia": tendencia,
+        },
+        desempenho_por_categoria=desempenho_por_categoria,
+        resumo=resumo,
+        data_geracao=datetime.now(),
+        periodo_analisado=periodo_analisado,
+        fonte="local",
+    )
+
+
+def relatorio_turma_local(
+    dados_turma: DadosTurmaParaIA,
+    resumo_geral: Dict[str, Any],
+    performance_media: Dict[str, Any],
+    distribuicao_diagnosticos: Dict[str, int],
+    atividades_mais_efetivas: List[Dict[str, Any]],
+    periodo_analisado: str,
+) -> RelatorioTurmaResponse:
+    """Monta o relatório da turma sem IA, a partir dos agregados já calculados
+    (incluindo o ranking de atividades de `AIService._ranking_atividades_turma`)."""
+    total_criancas = dados_turma.total_criancas
+    paragrafos = [
+        f"A turma tem {total_criancas} criança(s) e {resumo_geral.get('total_atividades', 0)} atividade(s) no período. "
+        f"A pontuação média é {performance_media.get('pontuacao_media', 0):.1f}/10 e "
+        f"{performance_media.get('taxa_conclusao', 0):.0f}% das crianças concluíram ao menos um mini-jogo."
+    ]
+    if atividades_mais_efetivas:
+        destaques = ", ".join(f"{a['titulo']} ({a['media_pontuacao']:.1f})" for a in atividades_mais_efetivas[:3])
+        paragrafos.append(f"As atividades com melhores resultados são: {destaques}.")
+    if distribuicao_diagnosticos:
+        diagnosticos = ", ".join(f"{tipo}: {qtd}" for tipo, qtd in sorted(distribuicao_diagnosticos.items(), key=lambda kv: -kv[1]))
+        paragrafos.append(f"Distribuição de diagnósticos — {diagnosticos}.")
+
+    return RelatorioTurmaResponse(
+        total_criancas=total_criancas,
+        resumo_geral_turma=resumo_geral,
+        distribuicao_diagnosticos=distribuicao_diagnosticos,
+        performance_media=performance_media,
+        atividades_mais_efetivas=atividades_mais_efetivas,
+        resumo="\n\n".join(paragrafos),
+        data_geracao=datetime.now(),
+        periodo_analisado=periodo_analisado,
+        fonte="local",
+    )
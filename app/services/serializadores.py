@@ -0,0 +1,47 @@
+"""Conversão de responsáveis e turmas para os dicts de `ResponsavelResponse`/`TurmaResponse`.
+
+Os schemas expõem só os ids das turmas do responsável (evita referência
+circular turma → responsável → turmas). Para listas, carregue os
+relacionamentos antes com as opções abaixo; senão cada item dispara
+lazy loads (N+1). O mesmo vale para listas de `ProgressoResponse`, que
+aninham a criança e a atividade.
+"""
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import selectinload
+
+from app.models.progresso import Progresso
+from app.models.responsavel import Responsavel
+from app.models.turma import Turma
+
+# Responsável → ids das turmas (uma query extra para a lista inteira)
+CARREGAR_TURMAS_DO_RESPONSAVEL = selectinload(Responsavel.turmas).load_only(Turma.id)
+
+# Turma → responsável → ids das turmas dele (duas queries extras para a lista inteira)
+CARREGAR_RESPONSAVEL_DA_TURMA = (
+    selectinload(Turma.responsavel).selectinload(Responsavel.turmas).load_only(Turma.id)
+)
+
+# Progresso → criança e atividade (uma query extra para cada, na lista inteira)
+CARREGAR_CRIANCA_E_ATIVIDADE = (selectinload(Progresso.crianca), selectinload(Progresso.atividade))
+
+
+def responsavel_dict(responsavel: Optional[Responsavel]) -> Optional[Dict[str, Any]]:
+    if responsavel is None:
+        return None
+    return {
+        "id": responsavel.id,
+        "nome": responsavel.nome,
+        "email": responsavel.email,
+        "telefone": responsavel.telefone,
+        "turmas": [t.id for t in responsavel.turmas],
+    }
+
+
+def turma_dict(turma: Turma) -> Dict[str, Any]:
+    return {
+        "id": turma.id,
+        "nome": turma.nome,
+        "responsavel_id": turma.responsavel_id,
+        "responsavel": responsavel_dict(turma.responsavel),
+    }
@@ -0,0 +1,172 @@
+"""Tendência de pontuação de uma criança ao longo do tempo.
+
+Lê o histórico de tentativas (``progresso_tentativas``), não a projeção
+``progresso`` (que guarda só a última partida por atividade). Agrupa as
+tentativas em buckets diários ou semanais por categoria e calcula,
+para cada série, a média móvel e a inclinação (pontos por dia) da reta de
+mínimos quadrados. No PostgreSQL tudo sai de uma única query com window
+functions (``date_trunc`` + ``avg() OVER`` + ``regr_slope() OVER``); no SQLite,
+que não tem ``date_trunc`` nem ``regr_slope``, o mesmo cálculo é feito em Python
+a partir de (categoria, created_at, pontuacao).
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, cast, extract, func, literal_column
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.atividade import Atividade
+from app.models.progresso_tentativa import ProgressoTentativa
+from app.services.relatorio_local import LIMIAR_TENDENCIA
+
+GRANULARIDADES = {"dia": "day", "semana": "week"}
+
+
+def _inicio_bucket(momento: datetime, granularidade: str) -> datetime:
+    """Equivalente em Python de ``date_trunc('day'|'week', ...)`` (semanas começam na segunda)."""
+    inicio = momento.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularidade == "semana":
+        inicio -= timedelta(days=inicio.weekday())
+    return inicio
+
+
+def _inclinacao_por_dia(pontos: List[Tuple[datetime, float]]) -> Optional[float]:
+    """Inclinação (pontos/dia) da reta de mínimos quadrados; None com menos de 2 buckets."""
+    if len(pontos) < 2:
+        return None
+    origem = pontos[0][0]
+    xs = [(periodo - origem).total_seconds() / 86400 for periodo, _ in pontos]
+    ys = [media for _, media in pontos]
+    media_x = sum(xs) / len(xs)
+    media_y = sum(ys) / len(ys)
+    var = sum((x - media_x) ** 2 for x in xs)
+    if var == 0:
+        return None
+    return sum((x - media_x) * (y - media_y) for x, y in zip(xs, ys)) / var
+
+
+def _direcao(inclinacao: Optional[float], pontos: List[Dict[str, Any]]) -> str:
+    """Mesmo critério do relatório local: variação estimada entre o primeiro e o último bucket."""
+    if inclinacao is None:
+        return "insuficiente"
+    dias = (pontos[-1]["periodo"] - pontos[0]["periodo"]).total_seconds() / 86400
+    variacao = inclinacao * dias
+    if variacao >= LIMIAR_TENDENCIA:
+        return "melhora"
+    if variacao <= -LIMIAR_TENDENCIA:
+        return "queda"
+    return "estável"
+
+
+def _buckets_postgresql(db: Session, crianca_id: int, granularidade: str, janela: int, desde: datetime):
+    # Literal (e não bind param) para o GROUP BY casar com a expressão do SELECT
+    unidade = literal_column(f"'{GRANULARIDADES[granularidade]}'")
+    periodo = func.date_trunc(unidade, ProgressoTentativa.created_at).label("periodo")
+    query = (
+        db.query(
+            Atividade.categoria.label("categoria"),
+            periodo,
+            func.avg(ProgressoTentativa.pontuacao).label("media"),
+            func.count(ProgressoTentativa.id).label("total"),
+        )
+        .join(Atividade, Atividade.id == ProgressoTentativa.atividade_id)
+        .filter(ProgressoTentativa.crianca_id == crianca_id, ProgressoTentativa.created_at >= desde)
+    )
+    buckets = query.group_by(Atividade.categoria, periodo).subquery()
+
+    dias = cast(extract("epoch", buckets.c.periodo) / 86400, Float)
+    rows = (
+        db.query(
+            buckets.c.categoria,
+            buckets.c.periodo,
+            buckets.c.media,
+            buckets.c.total,
+            func.avg(buckets.c.media).over(
+                partition_by=buckets.c.categoria,
+                order_by=buckets.c.periodo,
+                rows=(-(janela - 1), 0),
+            ).label("media_movel"),
+            func.regr_slope(buckets.c.media, dias).over(partition_by=buckets.c.categoria).label("inclinacao"),
+        )
+        .order_by(buckets.c.categoria, buckets.c.periodo)
+        .all()
+    )
+
+    series: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        serie = series.setdefault(row.categoria, {"pontos": [], "inclinacao": row.inclinacao})
+        serie["pontos"].append({
+            "periodo": row.periodo,
+            "media_pontuacao": float(row.media),
+            "total": row.total,
+            "media_movel": float(row.media_movel),
+        })
+    return series
+
+
+def _buckets_python(db: Session, crianca_id: int, granularidade: str, janela: int, desde: datetime):
+    query = (
+        db.query(Atividade.categoria, ProgressoTentativa.created_at, ProgressoTentativa.pontuacao)
+        .join(Atividade, Atividade.id == ProgressoTentativa.atividade_id)
+        .filter(ProgressoTentativa.crianca_id == crianca_id, ProgressoTentativa.created_at >= desde)
+    )
+
+    acumulado: Dict[str, Dict[datetime, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for categoria, created_at, pontuacao in query.all():
+        acumulado[categoria][_inicio_bucket(created_at, granularidade)].append(pontuacao)
+
+    series: Dict[str, Dict[str, Any]] = {}
+    for categoria in sorted(acumulado):
+        pontos = []
+        medias: List[float] = []
+        for periodo in sorted(acumulado[categoria]):
+            valores = acumulado[categoria][periodo]
+            media = sum(valores) / len(valores)
+            medias.append(media)
+            ultimas = medias[-janela:]
+            pontos.append({
+                "periodo": periodo,
+                "media_pontuacao": media,
+                "total": len(valores),
+                "media_movel": sum(ultimas) / len(ultimas),
+            })
+        inclinacao = _inclinacao_por_dia([(p["periodo"], p["media_pontuacao"]) for p in pontos])
+        series[categoria] = {"pontos": pontos, "inclinacao": inclinacao}
+    return series
+
+
+def tendencia_crianca(
+    db: Session,
+    crianca_id: int,
+    granularidade: str = "dia",
+    janela: int = 7,
+    periodo_dias: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Séries de tendência por categoria para uma criança.
+
+    `janela` é o número de buckets da média móvel (incluindo o atual). Sem
+    `periodo_dias`, usa HISTORICO_PERIODO_PADRAO_DIAS: o filtro em `created_at`
+    faz o PostgreSQL ler só as partições mensais do período.
+    """
+    desde = datetime.utcnow() - timedelta(days=periodo_dias or settings.historico_periodo_padrao_dias)
+    if db.get_bind().dialect.name == "postgresql":
+        series = _buckets_postgresql(db, crianca_id, granularidade, janela, desde)
+    else:
+        series = _buckets_python(db, crianca_id, granularidade, janela, desde)
+
+    resultado = []
+    for categoria, serie in series.items():
+        pontos = serie["pontos"]
+        for ponto in pontos:
+            ponto["media_pontuacao"] = round(ponto["media_pontuacao"], 2)
+            ponto["media_movel"] = round(ponto["media_movel"], 2)
+        inclinacao = float(serie["inclinacao"]) if serie["inclinacao"] is not None else None
+        resultado.append({
+            "categoria": categoria,
+            "pontos": pontos,
+            "inclinacao_por_dia": round(inclinacao, 4) if inclinacao is not None else None,
+            "direcao": _direcao(inclinacao, pontos),
+        })
+    return resultado
@@ -0,0 +1,36 @@
+"""Escrita do histórico de tentativas (``progresso_tentativas``).
+
+Só INSERTs: nenhuma linha é atualizada depois de gravada, então não há
+disputa de lock em linhas "quentes". Várias tentativas são gravadas em um único
+``executemany`` (importações/backfills passam listas grandes; os endpoints
+passam uma tentativa por vez, na mesma transação que atualiza a projeção em
+``progresso``).
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.progresso_tentativa import ProgressoTentativa
+
+CAMPOS = (
+    "crianca_id", "atividade_id", "responsavel_id", "pontuacao", "pontuacao_bruta",
+    "movimentos", "tempo_segundos", "concluida", "observacoes", "created_at",
+)
+
+
+def registrar_tentativas(db: Session, tentativas: Iterable[Dict[str, Any]]) -> int:
+    """Insere as tentativas em lote e retorna quantas foram gravadas (não faz commit)."""
+    agora = datetime.utcnow()
+    linhas: List[Dict[str, Any]] = []
+    for tentativa in tentativas:
+        linha = {campo: tentativa.get(campo) for campo in CAMPOS}
+        if linha["created_at"] is None:
+            linha["created_at"] = agora
+        if linha["concluida"] is None:
+            linha["concluida"] = True
+        linhas.append(linha)
+    if linhas:
+        db.execute(insert(ProgressoTentativa.__table__), linhas)
+    return len(linhas)
@@ -0,0 +1,114 @@
+"""Versões das tabelas de referência e GET condicional (ETag / Last-Modified).
+
+Toda escrita em uma tabela de ``TABELAS_VERSIONADAS`` chama
+``incrementar_versao`` antes do commit; as listagens chamam
+``resposta_condicional`` e, se o cliente já tem a versão atual
+(``If-None-Match`` / ``If-Modified-Since``), devolvem 304 sem consultar a
+tabela.
+
+As versões ficam em cache no processo por ``VERSOES_CACHE_TTL_SECONDS``: dentro
+desse prazo a checagem não vai ao banco. Escritas feitas pelo próprio worker
+invalidam o cache no commit; as de outros workers aparecem no máximo após o TTL.
+"""
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.versao_tabela import VersaoTabela
+
+TABELAS_VERSIONADAS = ("atividades", "diagnosticos", "turmas", "responsaveis")
+
+# tabela -> (versao, atualizado_em, expira_em)
+_cache: Dict[str, Tuple[int, datetime, float]] = {}
+
+
+def _invalidar(tabelas: Sequence[str]) -> None:
+    for tabela in tabelas:
+        _cache.pop(tabela, None)
+
+
+def incrementar_versao(db: Session, *tabelas: str) -> None:
+    """Incrementa a versão das tabelas na transação atual (o commit fica com o chamador)."""
+    agora = datetime.utcnow()
+    for tabela in tabelas:
+        resultado = db.execute(
+            update(VersaoTabela)
+            .where(VersaoTabela.tabela == tabela)
+            .values(versao=VersaoTabela.versao + 1, atualizado_em=agora)
+        )
+        if resultado.rowcount == 0:
+            db.add(VersaoTabela(tabela=tabela, versao=2, atualizado_em=agora))
+    # Só invalida depois do commit: antes disso outra requisição leria a versão antiga e a cachearia
+    pendentes = db.info.setdefault("versoes_pendentes", set())
+    if not pendentes:
+        def _apos_commit(session):
+            _invalidar(list(session.info.pop("versoes_pendentes", ())))
+
+        def _apos_rollback(session, transacao):
+            session.info.pop("versoes_pendentes", None)
+
+        event.listen(db, "after_commit", _apos_commit, once=True)
+        event.listen(db, "after_soft_rollback", _apos_rollback, once=True)
+    pendentes.update(tabelas)
+
+
+def versoes_atuais(db: Session, tabelas: Sequence[str]) -> Tuple[Dict[str, int], datetime]:
+    """Versão de cada tabela e a data da escrita mais recente entre elas."""
+    agora = time.monotonic()
+    faltando = [t for t in tabelas if t not in _cache or _cache[t][2] <= agora]
+    if faltando:
+        encontradas = {
+            row.tabela: row
+            for row in db.execute(select(VersaoTabela).where(VersaoTabela.tabela.in_(faltando))).scalars()
+        }
+        expira_em = agora + settings.versoes_cache_ttl_seconds
+        for tabela in faltando:
+            row = encontradas.get(tabela)
+            # Sem linha (banco criado sem a migration): versão 1, data fixa
+            _cache[tabela] = (row.versao, row.atualizado_em, expira_em) if row else (1, datetime(2020, 1, 1), expira_em)
+    versoes = {t: _cache[t][0] for t in tabelas}
+    ultima = max(_cache[t][1] for t in tabelas)
+    return versoes, ultima
+
+
+def _etag(versoes: Dict[str, int]) -> str:
+    return 'W/"' + "-".join(f"{tabela}.{versao}" for tabela, versao in versoes.items()) + '"'
+
+
+def _nao_modificado(request: Request, etag: str, ultima: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            desde = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if desde.tzinfo is None:
+            desde = desde.replace(tzinfo=timezone.utc)
+        # Last-Modified tem resolução de segundos
+        return ultima.replace(microsecond=0, tzinfo=timezone.utc) <= desde
+    return False
+
+
+def resposta_condicional(request: Request, response: Response, db: Session, *tabelas: str) -> Optional[Response]:
+    """Preenche ETag/Last-Modified em `response`; retorna um 304 se o cliente já está atualizado."""
+    versoes, ultima = versoes_atuais(db, tabelas)
+    etag = _etag(versoes)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(ultima.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+    if _nao_modificado(request, etag, ultima):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
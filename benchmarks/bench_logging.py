@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark do overhead de logging por requisição.
+
+Executa N envios de POST /progresso/registrar-minijogo (o caminho mais ruidoso)
+contra um SQLite temporário, com o logging desligado, no nível padrão (INFO) e
+com DEBUG total em JSON, e imprime latência média/p50/p95 de cada cenário.
+
+Uso:
+    python benchmarks/bench_logging.py [--requests 500]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_tmpdir = tempfile.mkdtemp(prefix="funny-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402,F401
+from app.config import settings  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.logging_config import setup_logging  # noqa: E402
+from app.main import app  # noqa: E402
+
+SCENARIOS = {
+    "desligado": {"log_level": "CRITICAL", "log_levels": "", "log_debug_sample": ""},
+    "padrao (INFO)": {"log_level": "INFO", "log_levels": "httpx=WARNING", "log_debug_sample": "funny.progresso=0.05"},
+    "debug total": {"log_level": "DEBUG", "log_levels": "sqlalchemy.engine=WARNING,httpx=WARNING", "log_debug_sample": "funny.progresso=1.0"},
+}
+
+
+def _seed(client: TestClient) -> dict:
+    client.post("/auth/register", json={"nome": "Bench", "email": "bench@funny.dev", "senha": "bench"})
+    token = client.post("/auth/login", json={"email": "bench@funny.dev", "senha": "bench"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/responsaveis/", json={"nome": "R", "email": "r@funny.dev", "telefone": "0"}, headers=headers)
+    client.post("/turmas/", json={"nome": "T", "responsavel_id": 1}, headers=headers)
+    client.post("/criancas/", json={"nome": "C", "idade": 7, "turma_id": 1}, headers=headers)
+    return headers
+
+
+def _run(client: TestClient, headers: dict, total: int) -> list:
+    timings = []
+    for i in range(total):
+        payload = {
+            "pontuacao": (i % 10) + 0.5,
+            "categoria": "Lógica",
+            "crianca_id": 1,
+            "titulo": f"Jogo {i % 20}",
+            "descricao": "Benchmark de logging",
+            "tempo_segundos": 30 + i % 60,
+        }
+        start = time.perf_counter()
+        response = client.post("/progresso/registrar-minijogo", json=payload, headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code in (200, 201), response.text
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="requisições por cenário")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    # Descartar a saída de log do benchmark para medir só o custo no processo
+    sys.stderr = open(os.devnull, "w")
+    client = TestClient(app)
+    headers = _seed(client)
+    _run(client, headers, 50)  # aquecimento
+
+    results = {}
+    for name, overrides in SCENARIOS.items():
+        for key, value in overrides.items():
+            setattr(settings, key, value)
+        setup_logging(force=True)
+        results[name] = _run(client, headers, args.requests)
+
+    sys.stderr = sys.__stderr__
+    baseline = statistics.mean(results["desligado"])
+    print(f"{'cenário':<16} {'média ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'overhead':>9}")
+    for name, timings in results.items():
+        ordered = sorted(timings)
+        mean = statistics.mean(ordered)
+        p50 = ordered[len(ordered) // 2]
+        p95 = ordered[int(len(ordered) * 0.95) - 1]
+        print(f"{name:<16} {mean:>9.3f} {p50:>8.3f} {p95:>8.3f} {(mean / baseline - 1) * 100:>8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialização JSON e bytes trafegados nos endpoints de lista.
+
+Popula um SQLite temporário (uma turma grande) e, para cada endpoint, mede:
+- tempo de render do corpo com o `json` da stdlib (JSONResponse) e com orjson
+  (ORJSONResponse, a classe padrão da API);
+- tamanho da resposta sem compressão, com GZip e com Brotli (se instalado),
+  como chega ao cliente pelo CompressionMiddleware.
+
+Uso:
+    python benchmarks/bench_serializacao.py [--progressos 5000] [--criancas 1000] [--repeticoes 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_tmpdir = tempfile.mkdtemp(prefix="funny-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app import models  # noqa: E402
+from app.compression import brotli  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.painel import painel_metadata  # noqa: E402
+
+ENDPOINTS = ["/progresso/turma/1", "/criancas/", "/atividades/"]
+CATEGORIAS = ["Matemáticas", "Português", "Lógica", "Cotidiano"]
+
+
+def _seed(client: TestClient, total_criancas: int, total_progressos: int) -> dict:
+    client.post("/auth/register", json={"nome": "Bench", "email": "bench@funny.dev", "senha": "bench"})
+    token = client.post("/auth/login", json={"email": "bench@funny.dev", "senha": "bench"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/responsaveis/", json={"nome": "R", "email": "r@funny.dev", "telefone": "0"}, headers=headers)
+    client.post("/turmas/", json={"nome": "T", "responsavel_id": 1}, headers=headers)
+
+    inicio = datetime.utcnow() - timedelta(days=180)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Atividade.__table__), [
+            {"titulo": f"Atividade {i}", "descricao": "Descrição da atividade de benchmark " * 3,
+             "categoria": CATEGORIAS[i % 4], "nivel_dificuldade": 1 + i % 3}
+            for i in range(200)
+        ])
+        conn.execute(insert(models.Crianca.__table__), [
+            {"nome": f"Criança {i}", "idade": 5 + i % 8, "turma_id": 1} for i in range(total_criancas)
+        ])
+        conn.execute(insert(models.Progresso.__table__), [
+            {"pontuacao": (i % 100) / 10, "concluida": True, "crianca_id": 1 + i % total_criancas,
+             "atividade_id": 1 + i % 200, "responsavel_id": 1, "tempo_segundos": 20 + i % 90,
+             "observacoes": None, "created_at": inicio + timedelta(minutes=i)}
+            for i in range(total_progressos)
+        ])
+    return headers
+
+
+def _tempo_render(classe, conteudo, repeticoes: int) -> float:
+    resposta = classe(content=None)
+    tempos = []
+    for _ in range(repeticoes):
+        start = time.perf_counter()
+        resposta.render(conteudo)
+        tempos.append((time.perf_counter() - start) * 1000)
+    return statistics.median(tempos)
+
+
+def _bytes(client: TestClient, path: str, headers: dict, encoding: str) -> int:
+    with client.stream("GET", path, headers={**headers, "Accept-Encoding": encoding}) as response:
+        return sum(len(chunk) for chunk in response.iter_raw())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--progressos", type=int, default=5000)
+    parser.add_argument("--criancas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=20, help="renders por medição (mediana)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    painel_metadata.create_all(bind=engine)
+    sys.stderr = open(os.devnull, "w")
+    client = TestClient(app)
+    headers = _seed(client, args.criancas, args.progressos)
+    sys.stderr = sys.__stderr__
+
+    codificacoes = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    print(f"{'endpoint':<22} {'itens':>6} {'json ms':>8} {'orjson ms':>10} {'ganho':>6}  " + "  ".join(f"{c + ' KB':>11}" for c in codificacoes))
+    for path in ENDPOINTS:
+        conteudo = client.get(path, headers=headers).json()
+        json_ms = _tempo_render(JSONResponse, conteudo, args.repeticoes)
+        orjson_ms = _tempo_render(ORJSONResponse, conteudo, args.repeticoes)
+        tamanhos = [_bytes(client, path, headers, c) / 1024 for c in codificacoes]
+        print(
+            f"{path:<22} {len(conteudo):>6} {json_ms:>8.2f} {orjson_ms:>10.2f} {json_ms / orjson_ms:>5.1f}x  "
+            + "  ".join(f"{t:>11.1f}" for t in tamanhos)
+        )
+    if brotli is None:
+        print("(Brotli não instalado: só GZip medido)")
+
+
+if __name__ == "__main__":
+    main()
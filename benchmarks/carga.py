@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Teste de carga (open-loop) dos fluxos principais contra uma API já rodando.
+
+As chegadas de cada cenário seguem um processo de Poisson na taxa pedida e
+são disparadas no horário agendado, sem esperar as respostas anteriores
+(open-loop): se a API ficar lenta, as requisições se acumulam como em
+produção, em vez de o gerador "frear" junto. A latência é medida a partir do
+horário agendado (inclui a espera por conexão no cliente), o que evita a
+omissão coordenada.
+
+Cenários (``--taxa nome=req/s``; 0 desliga):
+
+- ``login``: POST /auth/login;
+- ``minijogo``: rajadas de POST /progresso/registrar-minijogo — a turma inteira
+  termina o mesmo jogo ao mesmo tempo (``--rajada`` crianças por evento;
+  a taxa é de rajadas por segundo);
+- ``painel``: GET /turmas/{id}/painel e GET /progresso/turma/{id};
+- ``preview``: GET /relatorios-ia/crianca/{id}/preview e /relatorios-ia/turma/preview;
+- ``relatorio``: POST /relatorios-ia/crianca com ``modo=ia`` — suba a API com
+  ``OPENAI_BASE_URL`` apontando para benchmarks/mock_openai.py.
+
+Ao final imprime, por cenário, requisições, erros, vazão e latência
+p50/p95/p99/máx; ``--saida`` grava o resultado em JSON e ``--baseline``
+compara com um resultado anterior (sai com código 1 se p95 ou vazão pioraram
+além de ``--tolerancia``).
+
+Uso:
+    python benchmarks/gerar_dados.py --database-url sqlite:///carga.db
+    python benchmarks/mock_openai.py --latencia-ms 800 &
+    DATABASE_URL=sqlite:///carga.db OPENAI_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_API_KEY=mock \\
+        uvicorn app.main:app --workers 4 &
+    python benchmarks/carga.py --url http://127.0.0.1:8000 --duracao 60 --saida antes.json
+    # ... mudança ...
+    python benchmarks/carga.py --url http://127.0.0.1:8000 --duracao 60 --baseline antes.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+TAXAS_PADRAO = {"login": 0.2, "minijogo": 0.1, "painel": 1.0, "preview": 0.2, "relatorio": 0.1}
+
+
+@dataclass
+class Medicoes:
+    latencias_ms: List[float] = field(default_factory=list)
+    erros: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def registrar(self, latencia_ms: float, erro: Optional[str]) -> None:
+        if erro is None:
+            self.latencias_ms.append(latencia_ms)
+        else:
+            self.erros[erro] += 1
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil por interpolação linear (como numpy.percentile)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    baixo = int(posicao)
+    alto = min(baixo + 1, len(ordenados) - 1)
+    return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (posicao - baixo)
+
+
+class Carga:
+    def __init__(self, client: httpx.AsyncClient, manifesto: dict, rajada: int, janela_medicao: float):
+        self.client = client
+        self.manifesto = manifesto
+        self.rajada = rajada
+        self.medicoes: Dict[str, Medicoes] = defaultdict(Medicoes)
+        self.headers: Dict[str, str] = {}
+        self._inicio_medicao = janela_medicao  # Antes disso é aquecimento: executa, mas não mede
+        self._pendentes: set = set()
+
+    async def autenticar(self) -> None:
+        resposta = await self.client.post("/auth/login", json=self.manifesto["usuario"])
+        resposta.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {resposta.json()['access_token']}"}
+
+    async def _requisicao(self, cenario: str, agendado: float, metodo: str, url: str, **kwargs) -> None:
+        erro = None
+        try:
+            resposta = await self.client.request(metodo, url, headers=self.headers, **kwargs)
+            if resposta.status_code >= 400:
+                erro = f"HTTP {resposta.status_code}"
+        except httpx.HTTPError as e:
+            erro = type(e).__name__
+        fim = time.perf_counter()
+        if agendado >= self._inicio_medicao:
+            self.medicoes[cenario].registrar((fim - agendado) * 1000, erro)
+
+    def _turma(self) -> int:
+        return random.choice(self.manifesto["turmas"])
+
+    def _crianca(self, turma_id: Optional[int] = None) -> int:
+        turma_id = turma_id or self._turma()
+        return random.choice(self.manifesto["criancas_por_turma"][str(turma_id)])
+
+    def disparar(self, cenario: str, agendado: float) -> None:
+        for coro in getattr(self, f"_cenario_{cenario}")(agendado):
+            tarefa = asyncio.create_task(coro)
+            self._pendentes.add(tarefa)
+            tarefa.add_done_callback(self._pendentes.discard)
+
+    def _cenario_login(self, agendado: float):
+        yield self._requisicao("login", agendado, "POST", "/auth/login", json=self.manifesto["usuario"])
+
+    def _cenario_minijogo(self, agendado: float):
+        turma_id = self._turma()
+        criancas = self.manifesto["criancas_por_turma"][str(turma_id)]
+        atividade = random.choice(self.manifesto["atividades"])
+        for crianca_id in random.sample(criancas, min(self.rajada, len(criancas))):
+            corpo = {
+                "crianca_id": crianca_id, "titulo": atividade["titulo"], "descricao": atividade["descricao"],
+                "categoria": atividade["categoria"], "tempo_segundos": random.randint(20, 180),
+            }
+            if atividade["tipo_jogo"] == "memoria":
+                corpo["movimentos"] = 8 + int(random.expovariate(0.4))
+            else:
+                corpo["pontuacao"] = round(min(10.0, max(0.0, random.gauss(7.0, 2.0))), 1)
+            yield self._requisicao("minijogo", agendado, "POST", "/progresso/registrar-minijogo", json=corpo)
+
+    def _cenario_painel(self, agendado: float):
+        turma_id = self._turma()
+        yield self._requisicao("painel", agendado, "GET", f"/turmas/{turma_id}/painel")
+        yield self._requisicao("painel", agendado, "GET", f"/progresso/turma/{turma_id}")
+
+    def _cenario_preview(self, agendado: float):
+        turma_id = self._turma()
+        yield self._requisicao("preview", agendado, "GET", f"/relatorios-ia/crianca/{self._crianca(turma_id)}/preview",
+                               params={"periodo_dias": 90})
+        yield self._requisicao("preview", agendado, "GET", "/relatorios-ia/turma/preview",
+                               params={"turma_id": turma_id, "periodo_dias": 90})
+
+    def _cenario_relatorio(self, agendado: float):
+        yield self._requisicao("relatorio", agendado, "POST", "/relatorios-ia/crianca",
+                               json={"crianca_id": self._crianca(), "periodo_dias": 90, "modo": "ia"})
+
+    async def gerar_chegadas(self, cenario: str, taxa: float, inicio: float, fim: float) -> None:
+        agendado = inicio
+        while True:
+            agendado += random.expovariate(taxa)
+            if agendado >= fim:
+                return
+            espera = agendado - time.perf_counter()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            self.disparar(cenario, agendado)
+
+    async def aguardar_pendentes(self, timeout: float) -> int:
+        if self._pendentes:
+            await asyncio.wait(list(self._pendentes), timeout=timeout)
+        return len(self._pendentes)
+
+
+def resumo(medicoes: Dict[str, Medicoes], duracao: float) -> Dict[str, dict]:
+    resultado = {}
+    for cenario, m in sorted(medicoes.items()):
+        resultado[cenario] = {
+            "requisicoes": len(m.latencias_ms) + sum(m.erros.values()),
+            "erros": dict(m.erros),
+            "vazao_rps": round(len(m.latencias_ms) / duracao, 2),
+            "p50_ms": round(percentil(m.latencias_ms, 50), 1),
+            "p95_ms": round(percentil(m.latencias_ms, 95), 1),
+            "p99_ms": round(percentil(m.latencias_ms, 99), 1),
+            "max_ms": round(max(m.latencias_ms, default=0.0), 1),
+        }
+    return resultado
+
+
+def imprimir(resultado: Dict[str, dict]) -> None:
+    print(f"{'cenário':<10} {'req':>7} {'erros':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'máx ms':>9}")
+    for cenario, r in resultado.items():
+        print(
+            f"{cenario:<10} {r['requisicoes']:>7} {sum(r['erros'].values()):>6} {r['vazao_rps']:>8.2f} "
+            f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}"
+        )
+        for erro, quantidade in sorted(r["erros"].items()):
+            print(f"{'':<10} {erro}: {quantidade}")
+
+
+def comparar(atual: Dict[str, dict], baseline: Dict[str, dict], tolerancia: float) -> bool:
+    """Imprime a variação contra o baseline; retorna True se algum cenário piorou além da tolerância."""
+    piorou = False
+    print(f"\n{'cenário':<10} {'p95 antes':>10} {'p95 agora':>10} {'Δp95':>8} {'req/s antes':>12} {'req/s agora':>12} {'Δvazão':>8}")
+    for cenario, r in atual.items():
+        b = baseline.get(cenario)
+        if b is None:
+            continue
+        delta_p95 = (r["p95_ms"] - b["p95_ms"]) / b["p95_ms"] if b["p95_ms"] else 0.0
+        delta_vazao = (r["vazao_rps"] - b["vazao_rps"]) / b["vazao_rps"] if b["vazao_rps"] else 0.0
+        regressao = delta_p95 > tolerancia or delta_vazao < -tolerancia
+        piorou = piorou or regressao
+        print(
+            f"{cenario:<10} {b['p95_ms']:>10.1f} {r['p95_ms']:>10.1f} {delta_p95:>+8.1%} "
+            f"{b['vazao_rps']:>12.2f} {r['vazao_rps']:>12.2f} {delta_vazao:>+8.1%}" + ("  << REGRESSÃO" if regressao else "")
+        )
+    return piorou
+
+
+def _taxa(valor: str):
+    nome, _, taxa = valor.partition("=")
+    if nome not in TAXAS_PADRAO or not taxa:
+        raise argparse.ArgumentTypeError(f"use nome=req/s com nome em {', '.join(TAXAS_PADRAO)}")
+    return nome, float(taxa)
+
+
+async def executar(args, manifesto: dict) -> Dict[str, dict]:
+    taxas = {**TAXAS_PADRAO, **dict(args.taxa)}
+    limites = httpx.Limits(max_connections=args.conexoes, max_keepalive_connections=args.conexoes)
+    async with httpx.AsyncClient(base_url=args.url, limits=limites, timeout=args.timeout) as client:
+        inicio = time.perf_counter()
+        carga = Carga(client, manifesto, args.rajada, janela_medicao=inicio + args.aquecimento)
+        await carga.autenticar()
+        fim = inicio + args.aquecimento + args.duracao
+        await asyncio.gather(*(
+            carga.gerar_chegadas(cenario, taxa, inicio, fim) for cenario, taxa in taxas.items() if taxa > 0
+        ))
+        restantes = await carga.aguardar_pendentes(args.timeout)
+        if restantes:
+            print(f"{restantes} requisição(ões) ainda pendentes ao encerrar", file=sys.stderr)
+    return resumo(carga.medicoes, args.duracao)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--manifesto", type=Path, default=Path("dados_carga.json"), help="gerado por benchmarks/gerar_dados.py")
+    parser.add_argument("--taxa", type=_taxa, action="append", default=[], metavar="CENARIO=RPS",
+                        help=f"chegadas por segundo do cenário (padrão: {TAXAS_PADRAO}); pode repetir")
+    parser.add_argument("--rajada", type=int, default=25, help="crianças por rajada do cenário minijogo")
+    parser.add_argument("--duracao", type=float, default=60.0, help="segundos medidos")
+    parser.add_argument("--aquecimento", type=float, default=5.0, help="segundos iniciais com carga, mas fora das medições")
+    parser.add_argument("--conexoes", type=int, default=100, help="conexões simultâneas no cliente")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--saida", type=Path, help="grava o resultado em JSON")
+    parser.add_argument("--baseline", type=Path, help="resultado anterior (JSON de --saida) para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="piora relativa aceita no p95 e na vazão")
+    args = parser.parse_args()
+
+    random.seed(args.semente)
+    manifesto = json.loads(args.manifesto.read_text())
+    resultado = asyncio.run(executar(args, manifesto))
+    imprimir(resultado)
+
+    if args.saida:
+        args.saida.write_text(json.dumps({
+            "url": args.url,
+            "duracao_s": args.duracao,
+            "taxas": {**TAXAS_PADRAO, **dict(args.taxa)},
+            "rajada": args.rajada,
+            "manifesto": manifesto.get("parametros"),
+            "cenarios": resultado,
+        }, ensure_ascii=False, indent=2))
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("taxas") != {**TAXAS_PADRAO, **dict(args.taxa)} or baseline.get("rajada") != args.rajada:
+            print("\nAtenção: taxas/rajada diferentes do baseline; a comparação de vazão não é direta", file=sys.stderr)
+        if comparar(resultado, baseline["cenarios"], args.tolerancia):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
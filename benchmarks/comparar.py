@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Compara dois resultados dos micro-benchmarks (JSON do --benchmark-json) e aponta regressões.
+
+Para cada benchmark presente nos dois arquivos compara a mediana. É regressão
+quando a mediana nova passa da antiga por mais que --tolerancia (relativo) e
+a diferença também é maior que o IQR do baseline (ruído da própria medição).
+Sai com código 1 se houver alguma regressão.
+
+Uso:
+    python benchmarks/comparar.py benchmarks/resultados/antes.json benchmarks/resultados/depois.json [--tolerancia 0.15]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+
+def _carregar(caminho: Path) -> Dict[str, dict]:
+    dados = json.loads(caminho.read_text())
+    return {b["fullname"]: b["stats"] for b in dados["benchmarks"]}
+
+
+def _formatar(segundos: float) -> str:
+    for unidade, fator in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if segundos >= fator:
+            return f"{segundos / fator:.2f} {unidade}"
+    return f"{segundos / 1e-9:.0f} ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("atual", type=Path)
+    parser.add_argument("--tolerancia", type=float, default=0.15, help="piora relativa aceita na mediana")
+    args = parser.parse_args()
+
+    antes, depois = _carregar(args.baseline), _carregar(args.atual)
+    largura = max((len(nome) for nome in {**antes, **depois}), default=10)
+    print(f"{'benchmark':<{largura}} {'antes':>11} {'depois':>11} {'variação':>9}")
+    regressoes = []
+    for nome, stats in depois.items():
+        base = antes.get(nome)
+        if base is None:
+            print(f"{nome:<{largura}} {'—':>11} {_formatar(stats['median']):>11}      novo")
+            continue
+        variacao = stats["median"] / base["median"] - 1
+        regressao = variacao > args.tolerancia and stats["median"] - base["median"] > base["iqr"]
+        if regressao:
+            regressoes.append(nome)
+        print(
+            f"{nome:<{largura}} {_formatar(base['median']):>11} {_formatar(stats['median']):>11} {variacao:>+9.1%}"
+            + ("  << REGRESSÃO" if regressao else "")
+        )
+    for nome in sorted(set(antes) - set(depois)):
+        print(f"{nome:<{largura}} {_formatar(antes[nome]['median']):>11} {'—':>11}  ausente")
+
+    if regressoes:
+        print(f"\n{len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
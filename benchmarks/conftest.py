@@ -0,0 +1,102 @@
+"""Fixtures dos micro-benchmarks (pytest-benchmark) contra SQLite em memória.
+
+Uso:
+    pip install -r requirements-dev.txt
+    pytest benchmarks/ --benchmark-json=benchmarks/resultados/antes.json
+    # ... mudança ...
+    pytest benchmarks/ --benchmark-json=benchmarks/resultados/depois.json
+    python benchmarks/comparar.py benchmarks/resultados/antes.json benchmarks/resultados/depois.json
+
+Os scripts ``bench_*.py`` desta pasta continuam sendo executados direto com
+``python`` (não são coletados pelo pytest).
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Antes de importar o app: o engine de app.database é criado na importação
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app import models  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.painel import painel_metadata  # noqa: E402
+
+CATEGORIAS = ["Matemáticas", "Português", "Lógica", "Cotidiano"]
+
+
+@pytest.fixture(scope="session")
+def banco():
+    Base.metadata.create_all(bind=engine)
+    painel_metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Responsavel.__table__), [{"nome": "Bench", "email": "r@funny.dev", "telefone": "0"}])
+        conn.execute(insert(models.Diagnostico.__table__), [{"tipo": "TDAH"}])
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="session")
+def client(banco):
+    with TestClient(app) as client:
+        client.post("/auth/register", json={"nome": "Bench", "email": "bench@funny.dev", "senha": "bench"})
+        token = client.post("/auth/login", json={"email": "bench@funny.dev", "senha": "bench"}).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        yield client
+
+
+@pytest.fixture
+def semear(banco):
+    """Cria uma turma com `criancas` crianças, cada uma com um progresso em `atividades` atividades novas.
+
+    Retorna ``(turma_id, [crianca_ids])``. Cada chamada cria dados novos (o banco é
+    compartilhado pela sessão inteira), então o histórico medido é exatamente o pedido.
+    """
+    def _semear(criancas: int, atividades: int):
+        inicio = datetime.utcnow() - timedelta(days=60)
+        with engine.begin() as conn:
+            turma_id = conn.execute(insert(models.Turma.__table__).values(nome="Bench", responsavel_id=1)).inserted_primary_key[0]
+            atividade_ids = [
+                conn.execute(insert(models.Atividade.__table__).values(
+                    titulo=f"Bench {turma_id}-{i}", descricao="Atividade de benchmark",
+                    categoria=CATEGORIAS[i % 4], nivel_dificuldade=1 + i % 3,
+                )).inserted_primary_key[0]
+                for i in range(atividades)
+            ]
+            crianca_ids = [
+                conn.execute(insert(models.Crianca.__table__).values(
+                    nome=f"Criança {turma_id}-{i}", idade=6 + i % 6, turma_id=turma_id,
+                    diagnostico_id=1 if i % 5 == 0 else None,
+                )).inserted_primary_key[0]
+                for i in range(criancas)
+            ]
+            if crianca_ids and atividade_ids:
+                conn.execute(insert(models.Progresso.__table__), [
+                    {"pontuacao": (c + a) % 11, "concluida": True, "crianca_id": crianca_id, "atividade_id": atividade_id,
+                     "responsavel_id": 1, "tempo_segundos": 20 + (c * a) % 120, "observacoes": None,
+                     "created_at": inicio + timedelta(minutes=c * len(atividade_ids) + a)}
+                    for c, crianca_id in enumerate(crianca_ids) for a, atividade_id in enumerate(atividade_ids)
+                ])
+        return turma_id, crianca_ids
+
+    return _semear
+
+
+@pytest.fixture
+def sessao():
+    """Abre uma sessão nova a cada uso (sem identity map aquecido entre rodadas)."""
+    def _rodar(funcao, *args, **kwargs):
+        with SessionLocal() as db:
+            return funcao(db, *args, **kwargs)
+
+    return _rodar
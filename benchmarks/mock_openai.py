@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Servidor que imita o endpoint de chat completions da OpenAI, para os testes de carga.
+
+Responde a POST /v1/chat/completions (e /chat/completions) com um relatório
+JSON válido para os dois tipos de relatório (criança e turma) depois de uma
+latência sorteada (log-normal em torno de --latencia-ms), e pode devolver
+429/503 numa fração das chamadas para exercitar as retentativas e o circuit
+breaker do AIService. O consumo de tokens é estimado pelo tamanho do prompt.
+
+Uso:
+    python benchmarks/mock_openai.py [--porta 8099] [--latencia-ms 800] [--taxa-erro 0.0]
+
+e suba a API apontando para ele:
+    OPENAI_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_API_KEY=mock uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+CATEGORIAS = ["Matemáticas", "Português", "Lógica", "Cotidiano"]
+
+
+def _relatorio() -> dict:
+    # Campos lidos por gerar_relatorio_crianca e gerar_relatorio_turma (o resto a API recalcula)
+    return {
+        "resumo_geral": {"media_pontuacao": 7.5, "taxa_sucesso": 0.8, "total_mini_jogos": 42},
+        "desempenho_por_categoria": {
+            c: {"media": 7.0, "observacao": "Evolução consistente no período."} for c in CATEGORIAS
+        },
+        "resumo": "Relatório gerado pelo mock da OpenAI para testes de carga. " * 4,
+    }
+
+
+def criar_app(latencia_ms: float, desvio: float, taxa_erro: float) -> Starlette:
+    async def chat_completions(request: Request) -> JSONResponse:
+        corpo = await request.json()
+        # Log-normal com mediana = latencia_ms: cauda longa, como a API real
+        await asyncio.sleep(latencia_ms * math.exp(random.gauss(0.0, desvio)) / 1000)
+        if random.random() < taxa_erro:
+            status = random.choice([429, 503])
+            return JSONResponse({"error": {"message": "mock: erro simulado"}}, status_code=status, headers={"Retry-After": "1"})
+        tokens_prompt = sum(len(m.get("content", "")) for m in corpo.get("messages", [])) // 4
+        conteudo = json.dumps(_relatorio(), ensure_ascii=False)
+        tokens_resposta = len(conteudo) // 4
+        return JSONResponse({
+            "id": f"chatcmpl-mock-{time.monotonic_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": corpo.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": conteudo}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": tokens_prompt,
+                "completion_tokens": tokens_resposta,
+                "total_tokens": tokens_prompt + tokens_resposta,
+            },
+        })
+
+    return Starlette(routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/chat/completions", chat_completions, methods=["POST"]),
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8099)
+    parser.add_argument("--latencia-ms", type=float, default=800.0, help="latência mediana de cada resposta")
+    parser.add_argument("--desvio", type=float, default=0.35, help="desvio (log) da latência; 0 = constante")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="fração de respostas 429/503")
+    args = parser.parse_args()
+
+    app = criar_app(args.latencia_ms, args.desvio, args.taxa_erro)
+    uvicorn.run(app, host=args.host, port=args.porta, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
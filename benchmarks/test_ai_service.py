@@ -0,0 +1,18 @@
+"""Preparação dos dados enviados à IA (AIService._prepare_*) por tamanho de histórico."""
+import pytest
+
+from app.services.ai_service import ai_service
+
+
+@pytest.mark.parametrize("historico", [10, 100, 1000])
+def test_prepare_crianca_data(benchmark, semear, sessao, historico):
+    _, (crianca_id,) = semear(criancas=1, atividades=historico)
+    dados = benchmark(sessao, ai_service._prepare_crianca_data, crianca_id)
+    assert len(dados.progressos) == historico
+
+
+@pytest.mark.parametrize("criancas,atividades", [(10, 10), (25, 40), (25, 200)])
+def test_prepare_turma_data(benchmark, semear, sessao, criancas, atividades):
+    turma_id, _ = semear(criancas=criancas, atividades=atividades)
+    dados = benchmark(sessao, ai_service._prepare_turma_data, turma_id=turma_id)
+    assert dados.total_criancas == criancas
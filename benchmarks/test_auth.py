@@ -0,0 +1,23 @@
+"""Tokens JWT e hash de senha (bcrypt)."""
+from app.auth import create_access_token, hash_password, verify_password, verify_token
+
+DADOS_TOKEN = {"id": 1, "email": "bench@funny.dev"}
+
+
+def test_create_access_token(benchmark):
+    assert benchmark(create_access_token, DADOS_TOKEN)
+
+
+def test_verify_token(benchmark):
+    token = create_access_token(DADOS_TOKEN)
+    assert benchmark(verify_token, token)["id"] == 1
+
+
+def test_hash_password(benchmark):
+    # bcrypt é lento de propósito: poucas rodadas bastam
+    assert benchmark.pedantic(hash_password, args=("senha-bench",), rounds=5, warmup_rounds=1)
+
+
+def test_verify_password(benchmark):
+    senha_hash = hash_password("senha-bench")
+    assert benchmark.pedantic(verify_password, args=("senha-bench", senha_hash), rounds=5, warmup_rounds=1)
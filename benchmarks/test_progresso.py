@@ -0,0 +1,22 @@
+"""POST /progresso/registrar-minijogo de ponta a ponta (TestClient + SQLite em memória)."""
+import itertools
+
+import pytest
+
+
+@pytest.mark.parametrize("titulo,campos", [
+    ("Soma", {"pontuacao": 8.5}),
+    ("Jogo da Memória", {"movimentos": 12}),
+], ids=["padrao", "memoria"])
+def test_registrar_minijogo(benchmark, client, semear, titulo, campos):
+    _, crianca_ids = semear(criancas=25, atividades=0)
+    criancas = itertools.cycle(crianca_ids)
+
+    def _registrar():
+        return client.post("/progresso/registrar-minijogo", json={
+            "crianca_id": next(criancas), "titulo": titulo, "descricao": "Mini-jogo de benchmark",
+            "categoria": "Matemáticas", "tempo_segundos": 42, **campos,
+        })
+
+    resposta = benchmark(_registrar)
+    assert resposta.status_code in (200, 201), resposta.text
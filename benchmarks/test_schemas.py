@@ -0,0 +1,47 @@
+"""Serialização de ProgressoResponse (10k linhas), como nos endpoints de progresso."""
+from datetime import datetime, timedelta
+from typing import List
+
+import orjson
+import pytest
+from pydantic import TypeAdapter
+
+from app import models
+from app.schemas.progresso import ProgressoResponse
+
+TOTAL = 10_000
+LISTA = TypeAdapter(List[ProgressoResponse])
+
+
+@pytest.fixture(scope="module")
+def progressos():
+    """Objetos ORM soltos (sem sessão), com criança e atividade aninhadas como no lazy load."""
+    inicio = datetime(2024, 1, 1)
+    criancas = [models.Crianca(id=i, nome=f"Criança {i}", idade=6 + i % 6, turma_id=1) for i in range(1, 26)]
+    atividades = [
+        models.Atividade(id=i, titulo=f"Atividade {i}", descricao="Descrição da atividade " * 3,
+                         categoria="Matemáticas", nivel_dificuldade=1 + i % 3)
+        for i in range(1, 41)
+    ]
+    return [
+        models.Progresso(
+            id=i, pontuacao=(i % 100) / 10, concluida=True, observacoes=None, responsavel_id=1,
+            tempo_segundos=20 + i % 90, created_at=inicio + timedelta(minutes=i),
+            crianca_id=criancas[i % 25].id, crianca=criancas[i % 25],
+            atividade_id=atividades[i % 40].id, atividade=atividades[i % 40],
+        )
+        for i in range(1, TOTAL + 1)
+    ]
+
+
+def test_validar_10k(benchmark, progressos):
+    resultado = benchmark(LISTA.validate_python, progressos, from_attributes=True)
+    assert len(resultado) == TOTAL
+
+
+def test_json_10k(benchmark, progressos):
+    # Caminho da resposta: validação (response_model) + dump em modo JSON + orjson (ORJSONResponse)
+    def _serializar():
+        return orjson.dumps(LISTA.dump_python(LISTA.validate_python(progressos, from_attributes=True), mode="json"))
+
+    assert benchmark(_serializar).startswith(b"[")
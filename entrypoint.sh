@@ -45,9 +45,16 @@ else
   echo "⚠️  Alembic não encontrado - pulando migrations"
 fi
 
+# Métricas Prometheus agregadas entre os workers do Gunicorn (ver app/metrics.py).
+# O diretório precisa estar vazio a cada start para não somar processos antigos.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/funny-metrics}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 # Start Gunicorn com Uvicorn worker. Porta provida por $PORT (Render usa 10000)
 echo "Iniciando Gunicorn..."
 exec gunicorn -k uvicorn.workers.UvicornWorker "app.main:app" \
+  --config gunicorn_conf.py \
   --bind "0.0.0.0:${PORT:-10000}" \
   --workers 2 \
   --timeout 120 \
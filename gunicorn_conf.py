@@ -0,0 +1,12 @@
+"""Configuração do Gunicorn usada pelo entrypoint.sh.
+
+Com vários workers as métricas Prometheus ficam em arquivos por processo em
+PROMETHEUS_MULTIPROC_DIR; quando um worker morre, marcamos o processo como
+encerrado para que os gauges "livesum" dele deixem de ser somados em /metrics.
+"""
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,168 @@
+"""Fixtures dos testes: SQLite em memória, cliente autenticado e contagem de queries.
+
+Uso:
+    pip install -r requirements-dev.txt
+    pytest
+"""
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Antes de importar o app: o engine de app.database é criado na importação
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from app import models  # noqa: E402
+from app.auth import create_access_token, hash_password  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.query_stats import fingerprint  # noqa: E402
+from app.services import busca, cache_referencia, painel, versoes  # noqa: E402
+
+CATEGORIAS = ["Matemáticas", "Português", "Lógica", "Cotidiano"]
+NOMES = ["Ana Souza", "João Araújo", "Lúcia Simões", "Théo Lima", "Cecília Santos"]
+TITULOS = ["Soma", "Sílabas", "Jogo da Memória", "Rotina da Manhã"]
+EMAIL = "teste@funny.dev"
+SENHA_HASH = hash_password("teste")
+
+
+@dataclass(frozen=True)
+class Escala:
+    """Volume dos dados semeados: responsáveis × turmas × crianças, cada criança jogando todas as atividades."""
+    responsaveis: int
+    turmas_por_responsavel: int
+    criancas_por_turma: int
+    atividades: int
+    tentativas_por_progresso: int = 2
+
+
+PEQUENA = Escala(responsaveis=1, turmas_por_responsavel=1, criancas_por_turma=2, atividades=2)
+GRANDE = Escala(responsaveis=4, turmas_por_responsavel=3, criancas_por_turma=12, atividades=10, tentativas_por_progresso=3)
+# Listagens de turmas/responsáveis numa página cheia (limit=1000)
+MIL_TURMAS = Escala(responsaveis=50, turmas_por_responsavel=20, criancas_por_turma=1, atividades=1, tentativas_por_progresso=1)
+
+
+class ContadorQueries:
+    """Conta os statements executados no engine da aplicação, em qualquer thread.
+
+    O ``track_queries`` de app/query_stats.py depende do contexto da requisição
+    (contextvars), que não chega à thread em que o TestClient roda o app; aqui o
+    listener fica direto no engine.
+    """
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self._ativo = False
+        self._lock = threading.Lock()
+
+    def registrar(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self._ativo:
+            with self._lock:
+                self.statements.append(statement)
+
+    @contextmanager
+    def assert_max_queries(self, limite: int) -> Iterator[List[str]]:
+        """Falha se o bloco executar mais de `limite` statements; produz a lista deles."""
+        self.statements = []
+        self._ativo = True
+        try:
+            yield self.statements
+        finally:
+            self._ativo = False
+        if len(self.statements) > limite:
+            executados = "\n".join(f"  {i}. {fingerprint(s)}" for i, s in enumerate(self.statements, 1))
+            pytest.fail(f"{len(self.statements)} queries executadas (máximo {limite}):\n{executados}", pytrace=False)
+
+
+@pytest.fixture(scope="session")
+def contador_queries():
+    contador = ContadorQueries()
+    event.listen(engine, "before_cursor_execute", contador.registrar)
+    yield contador
+    event.remove(engine, "before_cursor_execute", contador.registrar)
+
+
+@pytest.fixture
+def assert_max_queries(contador_queries):
+    return contador_queries.assert_max_queries
+
+
+def _limpar_caches() -> None:
+    # Os caches do processo sobreviveriam à troca de banco e mudariam a contagem
+    versoes._invalidar(versoes.TABELAS_VERSIONADAS)
+    cache_referencia.limpar()
+    busca.indice_nomes_criancas.invalidar()
+
+
+def semear(escala: Escala) -> None:
+    """Recria o banco com os dados da escala. Os ids 1 (turma, criança, atividade...) existem em todas."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    painel.painel_metadata.drop_all(bind=engine)
+    painel.painel_metadata.create_all(bind=engine)
+    _limpar_caches()
+
+    inicio = datetime.utcnow() - timedelta(days=30)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Usuario.__table__), [{"nome": "Teste", "email": EMAIL, "senha_hash": SENHA_HASH}])
+        conn.execute(insert(models.Diagnostico.__table__), [{"tipo": "TEA"}, {"tipo": "TDAH"}])
+        conn.execute(insert(models.Atividade.__table__), [
+            {"titulo": TITULOS[i % len(TITULOS)] + ("" if i < len(TITULOS) else f" {i}"), "descricao": "Atividade de teste",
+             "categoria": CATEGORIAS[i % 4], "nivel_dificuldade": 1 + i % 3,
+             "tipo_jogo": "memoria" if i % len(TITULOS) == 2 else None}
+            for i in range(escala.atividades)
+        ])
+        conn.execute(insert(models.Responsavel.__table__), [
+            {"nome": f"Responsável {r + 1}", "email": f"r{r + 1}@funny.dev", "telefone": "0"} for r in range(escala.responsaveis)
+        ])
+        conn.execute(insert(models.Turma.__table__), [
+            {"nome": f"Turma {r + 1}-{t + 1}", "responsavel_id": r + 1}
+            for r in range(escala.responsaveis) for t in range(escala.turmas_por_responsavel)
+        ])
+        total_turmas = escala.responsaveis * escala.turmas_por_responsavel
+        conn.execute(insert(models.Crianca.__table__), [
+            {"nome": f"{NOMES[c % len(NOMES)]} {t + 1}-{c + 1}", "idade": 6 + c % 6, "turma_id": t + 1,
+             "diagnostico_id": 1 + c % 2 if c % 3 == 0 else None}
+            for t in range(total_turmas) for c in range(escala.criancas_por_turma)
+        ])
+        total_criancas = total_turmas * escala.criancas_por_turma
+        jogadas = [
+            (crianca_id, atividade_id, (crianca_id + atividade_id + k) % 11, inicio + timedelta(hours=crianca_id + 24 * k, minutes=atividade_id))
+            for crianca_id in range(1, total_criancas + 1)
+            for atividade_id in range(1, escala.atividades + 1)
+            for k in range(escala.tentativas_por_progresso)
+        ]
+        conn.execute(insert(models.ProgressoTentativa.__table__), [
+            {"crianca_id": c, "atividade_id": a, "responsavel_id": 1, "pontuacao": p, "pontuacao_bruta": p,
+             "tempo_segundos": 30 + p, "concluida": True, "created_at": quando}
+            for c, a, p, quando in jogadas
+        ])
+        ultimas = {(c, a): (p, quando) for c, a, p, quando in jogadas}
+        conn.execute(insert(models.Progresso.__table__), [
+            {"crianca_id": c, "atividade_id": a, "responsavel_id": 1, "pontuacao": p, "tempo_segundos": 30 + p,
+             "concluida": True, "observacoes": None, "created_at": quando}
+            for (c, a), (p, quando) in ultimas.items()
+        ])
+        painel.reconstruir(conn)
+
+
+@pytest.fixture(scope="session")
+def client():
+    semear(PEQUENA)
+    with TestClient(app) as client:
+        # Token direto (sem /auth/login): o usuário é recriado com o mesmo id a cada `semear`
+        client.headers["Authorization"] = f"Bearer {create_access_token({'id': 1, 'email': EMAIL})}"
+        yield client
@@ -0,0 +1,131 @@
+"""Relatórios da IA com a OpenAI substituída por respostas prontas."""
+import asyncio
+import json
+import logging
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.ai_service import FALHAS_COM_FALLBACK, AIService, AIServiceUnavailable, OpenAICallStats
+from tests.conftest import GRANDE, semear
+
+RESPOSTA_TURMA = {"resumo": "Turma evoluindo bem."}
+
+
+@pytest.fixture
+def servico():
+    servico = AIService()
+    servico.api_key = "sk-teste"
+    return servico
+
+
+@pytest.fixture
+def db():
+    semear(GRANDE)
+    sessao = SessionLocal()
+    yield sessao
+    sessao.close()
+
+
+def _resposta(conteudo) -> dict:
+    return {"choices": [{"message": {"content": conteudo if isinstance(conteudo, str) else json.dumps(conteudo)}}]}
+
+
+def test_prompt_turma_sem_historico_por_crianca(servico, db, monkeypatch):
+    enviados = []
+
+    async def _openai(messages, stats=None):
+        enviados.append(messages[-1]["content"])
+        return _resposta(RESPOSTA_TURMA)
+
+    monkeypatch.setattr(servico, "_make_openai_request", _openai)
+    relatorio = asyncio.run(servico.gerar_relatorio_turma(db, turma_id=1, modo="ia"))
+
+    assert relatorio.resumo == RESPOSTA_TURMA["resumo"]
+    (prompt,) = enviados
+    assert '"progressos"' not in prompt
+    assert '"atividades_realizadas"' not in prompt
+    assert '"resumo_estatisticas"' in prompt
+    assert prompt.count('"nome"') >= GRANDE.criancas_por_turma
+
+
+def _openai_responde(monkeypatch, status_code: int, corpo):
+    async def _post(self, url, **kwargs):
+        return httpx.Response(status_code, json=corpo, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", _post)
+
+
+FALHAS = {
+    "401": (401, {"error": {"message": "Incorrect API key"}}),
+    "json_invalido": (200, _resposta("isto não é JSON")),
+    "sem_resumo_geral": (200, _resposta({"resumo": "faltou o resumo_geral"})),
+    "sem_choices": (200, {"choices": [{"message": {}}]}),
+}
+
+
+@pytest.mark.parametrize("falha", list(FALHAS))
+def test_auto_cai_no_relatorio_local(servico, db, monkeypatch, caplog, falha):
+    _openai_responde(monkeypatch, *FALHAS[falha])
+    caplog.set_level(logging.WARNING, logger="funny.ai")
+
+    relatorio = asyncio.run(servico.gerar_relatorio_crianca(db, crianca_id=1, modo="auto"))
+    assert relatorio.crianca_id == 1
+    assert relatorio.resumo_geral
+    relatorio_turma = asyncio.run(servico.gerar_relatorio_turma(db, turma_id=1, modo="auto"))
+    assert relatorio_turma.total_criancas == GRANDE.criancas_por_turma
+
+    assert any("gerado localmente" in r.getMessage() for r in caplog.records)
+
+
+@pytest.mark.parametrize("falha", ["401", "json_invalido"])
+def test_modo_ia_propaga_a_falha(servico, db, monkeypatch, falha):
+    _openai_responde(monkeypatch, *FALHAS[falha])
+    with pytest.raises(FALHAS_COM_FALLBACK):
+        asyncio.run(servico.gerar_relatorio_crianca(db, crianca_id=1, modo="ia"))
+
+
+def _openai_em_sequencia(monkeypatch, *respostas):
+    pendentes = list(respostas)
+
+    async def _post(self, url, **kwargs):
+        status_code, corpo, headers = pendentes.pop(0)
+        return httpx.Response(status_code, json=corpo, headers=headers, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", _post)
+
+
+@pytest.fixture
+def esperas(monkeypatch):
+    esperas = []
+
+    async def _sleep(segundos):
+        esperas.append(segundos)
+
+    monkeypatch.setattr(asyncio, "sleep", _sleep)
+    return esperas
+
+
+def test_retry_after_respeitado_acima_do_teto_do_backoff(servico, monkeypatch, esperas):
+    monkeypatch.setattr(settings, "openai_backoff_max_seconds", 8.0)
+    _openai_em_sequencia(
+        monkeypatch,
+        (429, {"error": {"message": "rate limit"}}, {"Retry-After": "30"}),
+        (200, _resposta(RESPOSTA_TURMA), {}),
+    )
+    resposta = asyncio.run(servico._make_openai_request([{"role": "user", "content": "oi"}]))
+    assert resposta["choices"]
+    assert esperas == [30.0]
+
+
+def test_retry_after_alem_do_prazo_desiste_na_hora(servico, monkeypatch, esperas):
+    monkeypatch.setattr(settings, "openai_deadline_seconds", 60.0)
+    _openai_em_sequencia(monkeypatch, (429, {"error": {"message": "rate limit"}}, {"Retry-After": "600"}))
+    stats = OpenAICallStats(modelo=servico.model)
+    with pytest.raises(AIServiceUnavailable) as erro:
+        asyncio.run(servico._make_openai_request([{"role": "user", "content": "oi"}], stats))
+    assert erro.value.retry_after == 600.0
+    assert stats.tentativas == 1
+    assert esperas == []
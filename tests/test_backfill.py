@@ -0,0 +1,85 @@
+"""Backfill ``regras`` no histórico: tentativas, projeção ``progresso`` e painel ficam consistentes."""
+import pytest
+from sqlalchemy import func, select, update
+
+from app import models
+from app.cli import repontuar
+from app.database import engine
+from app.services import backfill, painel
+from tests.conftest import PEQUENA, semear
+
+ATIVIDADE = 1
+
+
+@pytest.fixture
+def notas_0_100():
+    """Atividade 1 vira Jogo da Memória com notas gravadas na escala 0–100 (85 deveria ser 8,5)."""
+    semear(PEQUENA)
+    with engine.begin() as conn:
+        conn.execute(update(models.Atividade.__table__).where(models.Atividade.id == ATIVIDADE).values(tipo_jogo="memoria"))
+        for tabela in (models.ProgressoTentativa.__table__, models.Progresso.__table__):
+            conn.execute(update(tabela).where(tabela.c.atividade_id == ATIVIDADE).values(pontuacao=85.0))
+        conn.execute(
+            update(models.ProgressoTentativa.__table__)
+            .where(models.ProgressoTentativa.atividade_id == ATIVIDADE)
+            .values(pontuacao_bruta=85.0, movimentos=None)
+        )
+        painel.reconstruir(conn)
+
+
+def _pontuacoes(modelo):
+    with engine.connect() as conn:
+        return set(conn.execute(select(modelo.pontuacao).where(modelo.atividade_id == ATIVIDADE)).scalars())
+
+
+def _maior_media_painel() -> float:
+    with engine.connect() as conn:
+        return conn.execute(select(func.max(painel.progresso_resumo.c.media_pontuacao))).scalar()
+
+
+def _conferir_consistente() -> None:
+    assert _pontuacoes(models.ProgressoTentativa) == {8.5}
+    assert _pontuacoes(models.Progresso) == {8.5}
+    assert _maior_media_painel() <= 10
+
+
+def test_backfill_tentativas_sincroniza_projecao(notas_0_100):
+    checkpoint = backfill.Checkpoint(tabela="progresso_tentativas", transformacao="regras")
+    estatisticas = backfill.executar(engine, checkpoint, tamanho_lote=3)
+    painel.refresh_painel(engine)
+
+    assert estatisticas.alteradas == PEQUENA.criancas_por_turma * PEQUENA.tentativas_por_progresso
+    _conferir_consistente()
+
+
+def test_backfill_dry_run_nao_grava(notas_0_100):
+    checkpoint = backfill.Checkpoint(tabela="progresso_tentativas", transformacao="regras")
+    estatisticas = backfill.executar(engine, checkpoint, dry_run=True)
+
+    assert estatisticas.alteradas > 0
+    assert _pontuacoes(models.ProgressoTentativa) == {85.0}
+    assert _pontuacoes(models.Progresso) == {85.0}
+
+
+def test_repontuar_usa_o_backfill(notas_0_100):
+    assert repontuar.main(["--atividade", str(ATIVIDADE), "--lote", "1"]) == 0
+    _conferir_consistente()
+
+
+def test_escala_0_100_so_nos_jogos_com_escala_de_entrada(notas_0_100):
+    outra = ATIVIDADE + 1  # Tipo padrão: 50 é a nota enviada pelo front, não uma nota 0–100
+    with engine.begin() as conn:
+        conn.execute(update(models.Progresso.__table__).where(models.Progresso.atividade_id == outra).values(pontuacao=50.0))
+
+    checkpoint = backfill.Checkpoint(tabela="progresso", transformacao="escala_0_100")
+    backfill.executar(engine, checkpoint)
+
+    assert _pontuacoes(models.Progresso) == {8.5}
+    with engine.connect() as conn:
+        assert set(conn.execute(select(models.Progresso.pontuacao).where(models.Progresso.atividade_id == outra)).scalars()) == {50.0}
+
+
+def test_repontuar_tipo_e_atividade_combinam_com_e(notas_0_100):
+    # A atividade 2 é do tipo padrão: com --tipo memoria não sobra nenhuma (a 1 não pode entrar)
+    assert repontuar.main(["--tipo", "memoria", "--atividade", str(ATIVIDADE + 1)]) == 1
+    assert _pontuacoes(models.ProgressoTentativa) == {85.0}
@@ -0,0 +1,56 @@
+"""Índice de nomes das crianças (SQLite): invalidação só depois do commit."""
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.services import busca
+from tests.conftest import PEQUENA, semear
+
+indice = busca.indice_nomes_criancas
+
+
+@pytest.fixture
+def db():
+    semear(PEQUENA)
+    sessao = SessionLocal()
+    busca.buscar_criancas(sessao, "ana")  # Carrega o índice
+    yield sessao
+    sessao.close()
+
+
+def _valido() -> bool:
+    return indice._expira_em > 0
+
+
+def _renomear(db, nome: str) -> None:
+    db.get(models.Crianca, 1).nome = nome
+    db.flush()
+
+
+def test_flush_nao_invalida_e_commit_invalida(db):
+    _renomear(db, "Zuleica")
+    assert _valido()
+    db.commit()
+    assert not _valido()
+    assert [c.id for c in busca.buscar_criancas(db, "zuleica")] == [1]
+
+
+def test_rollback_nao_invalida(db):
+    _renomear(db, "Zuleica")
+    db.rollback()
+    assert _valido()
+    db.commit()
+    assert _valido()
+
+
+def test_invalidacao_durante_carga_nao_marca_indice_como_valido(db, monkeypatch):
+    normalizar = busca.normalizar
+
+    def _normalizar_com_commit_concorrente(texto):
+        indice.invalidar()  # Outra sessão confirma uma alteração enquanto o índice é lido
+        return normalizar(texto)
+
+    indice.invalidar()
+    monkeypatch.setattr(busca, "normalizar", _normalizar_com_commit_concorrente)
+    busca.buscar_criancas(db, "ana")
+    assert not _valido()
@@ -0,0 +1,33 @@
+"""Cache de referência: limpo no commit, mantido (e sem erro) no rollback."""
+import pytest
+
+from app.database import SessionLocal
+from app.services import cache_referencia
+from tests.conftest import CATEGORIAS, PEQUENA, TITULOS, semear
+
+
+@pytest.fixture
+def db():
+    semear(PEQUENA)
+    sessao = SessionLocal()
+    assert cache_referencia.atividade_ref(sessao, TITULOS[0], CATEGORIAS[0]) is not None
+    yield sessao
+    sessao.close()
+
+
+def _em_cache() -> bool:
+    return cache_referencia._caches["atividades"].get((TITULOS[0], CATEGORIAS[0])) is not None
+
+
+def test_commit_limpa(db):
+    cache_referencia.invalidar(db, "atividades")
+    assert _em_cache()
+    db.commit()
+    assert not _em_cache()
+
+
+def test_rollback_mantem(db):
+    cache_referencia.invalidar(db, "atividades")
+    db.rollback()
+    assert _em_cache()
+    assert "cache_referencia_pendentes" not in db.info
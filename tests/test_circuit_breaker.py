@@ -0,0 +1,132 @@
+"""Transições do CircuitBreaker e liberação da tentativa de teste do meio-aberto."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import circuit_breaker as modulo
+from app.services.ai_service import AIService, AIServiceUnavailable
+from app.services.circuit_breaker import CircuitBreaker
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self) -> float:
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(modulo, "time", relogio)
+    return relogio
+
+
+@pytest.fixture
+def breaker(relogio):
+    return CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+
+
+def _abrir(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow_request()
+        breaker.record_failure("HTTP 503")
+
+
+def test_abre_apos_falhas_consecutivas(breaker):
+    assert breaker.allow_request()
+    breaker.record_failure("HTTP 503")
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure("HTTP 503")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert breaker.snapshot()["last_failure"] == "HTTP 503"
+
+
+def test_sucesso_zera_falhas_no_fechado(breaker):
+    breaker.record_failure("timeout")
+    breaker.record_success()
+    breaker.record_failure("timeout")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_meio_aberto_deixa_passar_uma_tentativa(breaker, relogio):
+    _abrir(breaker)
+    relogio.agora += 29
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_after() == pytest.approx(1.0)
+    relogio.agora += 1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_meio_aberto_fecha_com_sucesso(breaker, relogio):
+    _abrir(breaker)
+    relogio.agora += 30
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_meio_aberto_reabre_com_falha(breaker, relogio):
+    _abrir(breaker)
+    relogio.agora += 30
+    assert breaker.allow_request()
+    breaker.record_failure("HTTP 500")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_after() == pytest.approx(30.0)
+    assert not breaker.allow_request()
+
+
+def test_release_trial_libera_vaga(breaker, relogio):
+    _abrir(breaker)
+    relogio.agora += 30
+    assert breaker.allow_request()
+    breaker.release_trial()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_release_trial_nao_mexe_no_fechado(breaker):
+    breaker.release_trial()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.fixture
+def servico(breaker, relogio):
+    servico = AIService()
+    servico.api_key = "sk-teste"
+    servico.circuit_breaker = breaker
+    _abrir(breaker)
+    relogio.agora += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return servico
+
+
+@pytest.mark.parametrize("erro", [asyncio.CancelledError, RuntimeError], ids=["cancelada", "erro"])
+def test_tentativa_sem_resultado_nao_trava_meio_aberto(servico, monkeypatch, erro):
+    async def _post(self, *args, **kwargs):
+        raise erro("tentativa interrompida")
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", _post)
+    with pytest.raises(erro):
+        asyncio.run(servico._make_openai_request([{"role": "user", "content": "oi"}]))
+
+    assert servico.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    assert servico.circuit_breaker.allow_request()
+
+
+def test_tentativa_com_falha_reabre(servico, monkeypatch):
+    async def _post(self, *args, **kwargs):
+        raise httpx.ConnectError("recusada")
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", _post)
+    with pytest.raises(AIServiceUnavailable):
+        asyncio.run(servico._make_openai_request([{"role": "user", "content": "oi"}]))
+
+    assert servico.circuit_breaker.state == CircuitBreaker.OPEN
+    assert not servico.circuit_breaker.allow_request()
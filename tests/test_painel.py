@@ -0,0 +1,36 @@
+"""Painel sem a tabela ``progresso_resumo`` (migrations não aplicadas)."""
+import logging
+
+import pytest
+
+from app.database import engine
+from app.services import painel
+from tests.conftest import PEQUENA, semear
+
+
+@pytest.fixture
+def sem_resumo():
+    semear(PEQUENA)
+    painel.progresso_resumo.drop(bind=engine)
+    with engine.connect() as conn:
+        conn.info.pop(painel._CHAVE_TABELA_OK, None)  # Esquece a verificação feita pelo `semear`
+    yield
+    semear(PEQUENA)
+
+
+def test_painel_sem_resumo_responde_503(client, sem_resumo):
+    resposta = client.get("/turmas/1/painel")
+    assert resposta.status_code == 503
+    assert "migrations" in resposta.json()["detail"]
+
+
+def test_flush_sem_resumo_avisa_uma_vez(client, sem_resumo, caplog):
+    caplog.set_level(logging.WARNING, logger="funny.painel")
+    for pontuacao in (5, 6, 7):
+        resposta = client.post("/progresso/registrar-minijogo", json={
+            "crianca_id": 1, "titulo": "Soma", "descricao": "Atividade de teste", "categoria": "Matemáticas", "pontuacao": pontuacao,
+        })
+        assert resposta.status_code < 400, resposta.text
+
+    avisos = [r for r in caplog.records if r.name == "funny.painel" and "progresso_resumo" in r.getMessage()]
+    assert len(avisos) == 1
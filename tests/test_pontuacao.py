@@ -0,0 +1,25 @@
+"""`RegraPontuacao.calcular_lote` dá o mesmo resultado que `calcular` linha a linha."""
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from app.services.pontuacao import REGRAS
+
+PONTUACOES = [None, math.nan, 0, 0.5, 5, 8.5, 10, 10.01, 50, 85, 100, 100.5, 150, -0.5, -20]
+MOVIMENTOS = [None, math.nan, 0, 1, 8, 9, 12, 30, 200, -3]
+
+
+@pytest.mark.parametrize("nome", list(REGRAS))
+def test_calcular_lote_igual_a_calcular(nome):
+    regra = REGRAS[nome]
+    grade = list(itertools.product(PONTUACOES, MOVIMENTOS))
+    pontuacoes = np.array([np.nan if p is None else p for p, _ in grade], dtype=np.float64)
+    movimentos = np.array([np.nan if m is None else m for _, m in grade], dtype=np.float64)
+
+    lote = regra.calcular_lote(pontuacoes, movimentos)
+
+    esperado = np.array([regra.calcular(p, m) for p, m in grade], dtype=np.float64)
+    divergentes = [(p, m, e, l) for (p, m), e, l in zip(grade, esperado, lote) if not np.isclose(e, l, rtol=0, atol=1e-12)]
+    assert not divergentes, f"{nome}: (pontuacao, movimentos, calcular, calcular_lote) {divergentes}"
@@ -0,0 +1,111 @@
+"""Número de queries por endpoint não pode crescer com o volume de dados (N+1).
+
+Cada rota é chamada com o banco semeado em duas escalas (``PEQUENA`` e
+``GRANDE``, ver conftest.py): a contagem tem de ser a mesma nas duas e ficar
+dentro do limite declarado. Se um endpoint novo ou alterado passar a fazer uma
+query por linha, o teste mostra a lista de statements executados.
+"""
+from typing import NamedTuple, Optional
+
+import pytest
+
+from tests.conftest import GRANDE, MIL_TURMAS, PEQUENA, semear
+
+CSV_CRIANCAS = "nome,idade,turma_id,diagnostico_id\nBia,7,1,\nCaio,8,1,1\nDuda,6,1,2\n"
+
+
+class Rota(NamedTuple):
+    metodo: str
+    url: str
+    limite: int
+    json: Optional[dict] = None
+    arquivo: Optional[str] = None
+
+
+ROTAS = {
+    # auth
+    "login": Rota("POST", "/auth/login", 2, json={"email": "teste@funny.dev", "senha": "teste"}),
+    "register": Rota("POST", "/auth/register", 3, json={"nome": "Nova", "email": "nova@funny.dev", "senha": "x"}),
+    # responsaveis
+    "list_responsaveis": Rota("GET", "/responsaveis/", 4),
+    "get_responsavel": Rota("GET", "/responsaveis/1", 3),
+    # diagnosticos
+    "list_diagnosticos": Rota("GET", "/diagnosticos/", 3),
+    "get_diagnostico": Rota("GET", "/diagnosticos/1", 2),
+    # criancas
+    "list_criancas": Rota("GET", "/criancas/", 2),
+    "get_crianca": Rota("GET", "/criancas/1", 2),
+    "busca_criancas": Rota("GET", "/criancas/busca?q=ana", 3),
+    "update_crianca": Rota("PUT", "/criancas/1", 5, json={"nome": "Ana Renomeada", "idade": 7, "turma_id": 1}),
+    # atividades
+    "list_atividades": Rota("GET", "/atividades/", 3),
+    "get_atividade": Rota("GET", "/atividades/1", 2),
+    "busca_atividades": Rota("GET", "/atividades/busca?q=soma", 2),
+    # turmas
+    "list_turmas": Rota("GET", "/turmas/", 5),
+    "get_turma": Rota("GET", "/turmas/1", 4),
+    "painel_turma": Rota("GET", "/turmas/1/painel", 3),
+    "create_turma": Rota("POST", "/turmas/", 8, json={"nome": "Nova turma", "responsavel_id": 1}),
+    # progresso
+    "registrar_minijogo": Rota("POST", "/progresso/registrar-minijogo", 10, json={
+        "crianca_id": 1, "titulo": "Soma", "descricao": "Atividade de teste", "categoria": "Matemáticas", "pontuacao": 9,
+    }),
+    "progresso_crianca": Rota("GET", "/progresso/crianca/1", 4),
+    "progresso_atividade": Rota("GET", "/progresso/atividade/1", 4),
+    "progresso_turma": Rota("GET", "/progresso/turma/1", 6),
+    "resumo_crianca": Rota("GET", "/progresso/crianca/1/resumo", 2),
+    "tendencia_crianca": Rota("GET", "/progresso/crianca/1/tendencia", 3),
+    "export_turma": Rota("GET", "/progresso/export?turma_id=1", 2),
+    # relatorios-ia (modo local: sem OpenAI)
+    "preview_crianca": Rota("GET", "/relatorios-ia/crianca/1/preview", 3),
+    "preview_turma": Rota("GET", "/relatorios-ia/turma/preview?turma_id=1", 5),
+    "relatorio_crianca": Rota("POST", "/relatorios-ia/crianca", 3, json={"crianca_id": 1, "modo": "local"}),
+    "relatorio_turma": Rota("POST", "/relatorios-ia/turma", 6, json={"turma_id": 1, "modo": "local"}),
+    # importacao
+    "importar_criancas": Rota("POST", "/importacao/criancas", 4, arquivo=CSV_CRIANCAS),
+}
+
+
+def _chamar(client, rota: Rota):
+    if rota.arquivo is not None:
+        return client.request(rota.metodo, rota.url, files={"arquivo": ("dados.csv", rota.arquivo.encode(), "text/csv")})
+    return client.request(rota.metodo, rota.url, json=rota.json)
+
+
+@pytest.mark.parametrize("nome", list(ROTAS))
+def test_queries_independem_do_volume(client, assert_max_queries, nome):
+    rota = ROTAS[nome]
+    # Aquecimento fora da contagem: verificações feitas uma vez por processo
+    # (ex.: PRAGMA do painel) não são custo por requisição
+    semear(PEQUENA)
+    _chamar(client, rota)
+    contagens = []
+    for escala in (PEQUENA, GRANDE):
+        semear(escala)
+        with assert_max_queries(rota.limite) as queries:
+            resposta = _chamar(client, rota)
+        assert resposta.status_code < 400, resposta.text
+        contagens.append(len(queries))
+    assert contagens[0] == contagens[1], (
+        f"{nome}: {contagens[0]} queries com {PEQUENA} e {contagens[1]} com {GRANDE}"
+    )
+
+
+@pytest.mark.parametrize("nome,itens", [
+    ("list_turmas", MIL_TURMAS.responsaveis * MIL_TURMAS.turmas_por_responsavel),
+    ("list_responsaveis", MIL_TURMAS.responsaveis),
+])
+def test_listagens_com_mil_turmas(client, assert_max_queries, nome, itens):
+    """Página máxima (limit=1000) com 1000 turmas: mesma contagem que no banco pequeno."""
+    rota = ROTAS[nome]
+    contagens = []
+    for escala in (PEQUENA, MIL_TURMAS):
+        semear(escala)
+        with assert_max_queries(rota.limite) as queries:
+            resposta = client.get(f"{rota.url}?limit=1000")
+        assert resposta.status_code == 200, resposta.text
+        contagens.append(len(queries))
+    assert len(resposta.json()) == itens
+    assert contagens[0] == contagens[1], (
+        f"{nome}: {contagens[0]} queries com {PEQUENA} e {contagens[1]} com {MIL_TURMAS}"
+    )
@@ -0,0 +1,15 @@
+"""Normalização de SQL em `fingerprint` (agrupamento das queries lentas)."""
+import pytest
+
+from app.query_stats import fingerprint
+
+
+@pytest.mark.parametrize("statement,esperado", [
+    ("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND nome = 'x'", "SELECT * FROM t WHERE id IN (?+) AND nome = ?"),
+    ("SELECT * FROM t WHERE id = :id_1 LIMIT :param_1", "SELECT * FROM t WHERE id = ? LIMIT ?"),
+    ("SELECT * FROM t WHERE id = ? OFFSET 10", "SELECT * FROM t WHERE id = ? OFFSET ?"),
+    ("SELECT x::text, y :: integer FROM t WHERE z = :z", "SELECT x::text, y :: integer FROM t WHERE z = ?"),
+    ("SELECT CAST(:valor AS TEXT)::jsonb", "SELECT CAST(? AS TEXT)::jsonb"),
+])
+def test_fingerprint(statement, esperado):
+    assert fingerprint(statement) == esperado
@@ -0,0 +1,30 @@
+"""Versões das tabelas: cache invalidado no commit, mantido (e sem erro) no rollback."""
+import pytest
+
+from app.database import SessionLocal
+from app.services import versoes
+from tests.conftest import PEQUENA, semear
+
+
+@pytest.fixture
+def db():
+    semear(PEQUENA)
+    sessao = SessionLocal()
+    versoes.versoes_atuais(sessao, ["atividades"])  # Carrega o cache
+    yield sessao
+    sessao.close()
+
+
+def test_commit_invalida(db):
+    versoes.incrementar_versao(db, "atividades")
+    assert "atividades" in versoes._cache
+    db.commit()
+    assert "atividades" not in versoes._cache
+
+
+def test_rollback_mantem(db):
+    antes = versoes._cache["atividades"]
+    versoes.incrementar_versao(db, "atividades")
+    db.rollback()
+    assert versoes._cache["atividades"] == antes
+    assert "versoes_pendentes" not in db.info